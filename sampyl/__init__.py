@@ -7,6 +7,7 @@
 """
 
 from sampyl.app import App, Node
+from sampyl.pool import SessionPool
 
 __author__ = "John Lane"
 __copyright__ = "Copyright 2016, FanThreeSixty"
@@ -17,4 +18,4 @@ __maintainer__ = "John Lane"
 __email__ = "jlane@fanthreesixty.com"
 __status__ = "Beta"
 
-__all__ = ['App', 'Node']
+__all__ = ['App', 'Node', 'SessionPool']
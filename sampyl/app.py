@@ -8,19 +8,39 @@
 # pylint: disable=line-too-long
 import keyword
 import re
+import threading
+import time
 import warnings
 from urlparse import urlparse
-from sampyl.core.element import SeleniumObject, DEFAULT_NAME_ATTR, DEFAULT_TYPE_ATTR
+from sampyl.core.batch import Batch
+from sampyl.core.commands import serialize
+from sampyl.core.deadline import Deadline, active_deadline
+from sampyl.core.element import ElementCollection, SeleniumObject, DEFAULT_NAME_ATTR, DEFAULT_TYPE_ATTR, IDENTIFIER
+from sampyl.core.remote import PooledRemoteConnection
+from sampyl.core.runtime import MISSING, VISIBLE
+from sampyl.core.state import DEFAULT_ROLE, DEFAULT_TTL, restore_state, save_state
 from sampyl.core.structures import TYPES as T
-from selenium.webdriver.common.by import By
+from sampyl.core.tabs import TabSet
+from sampyl.core.timing import get_timeline
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.support import expected_conditions as ec
-from selenium.common.exceptions import NoSuchElementException
 
 
 __all__ = ['App', 'Node']
 
 DEFAULT_TYPE = 'text'
 
+# Marks the current document, so the next one can be told apart while the driver does not wait for it
+LEAVE_SCRIPT = "window.__sampyl_leaving = true;"
+
+# Seconds the ready predicate of get is given at least, even once the document took the whole timeout
+MIN_PREDICATE_TIMEOUT = 0.1
+
+# Returns [still on the previous document, readyState, [ttfb, DOMContentLoaded, load]] in seconds from navigation
+DOCUMENT_SCRIPT = "var t=window.performance&&performance.timing,f=function(v){return t&&v?(v-t.navigationStart)/1000:null;};" \
+                  "return [window.__sampyl_leaving===true,document.readyState," \
+                  "t?[f(t.responseStart),f(t.domContentLoadedEventEnd),f(t.loadEventEnd)]:[null,null,null]];"
+
 
 def is_legal_variable_name(name):
     """Determines whether the name attribute value is a valid variable name
@@ -58,6 +78,27 @@ def force_legal_variable_name(name):
     return name
 
 
+def _quiet(runtime):
+    """Suppress animations in the current document, recording the time saved
+
+    :param Runtime runtime: Driver runtime
+    :return:
+    """
+
+    with get_timeline(runtime.driver).measure('suppress_animations', category='animation') as details:
+        details['cancelled'], details['saved'] = runtime.call('quiet', True) or (0, 0.0)
+
+
+def _instrument(runtime):
+    """Count the requests and timers of the current document from the moment the helper library is injected
+
+    :param Runtime runtime: Driver runtime
+    :return:
+    """
+
+    runtime.call('instrument')
+
+
 class App(SeleniumObject):
     """The App implementation
 
@@ -67,10 +108,20 @@ class App(SeleniumObject):
     scheme = ""
     hostname = ""
 
-    def __init__(self, web_driver, url=None):
+    # Client-side routing for navigate_to, see use_client_routing
+    router = None
+    route_settle = 0.1
+
+    def __init__(self, web_driver, url=None, pool_size=None, thread_safe=False):
 
         super(App, self).__init__(web_driver)
 
+        if pool_size:
+            self.use_connection_pool(pool_size)
+
+        if thread_safe:
+            self.serialize_commands()
+
         full_url = url if isinstance(url, basestring) else ''
         path = urlparse(full_url)
         self.page = Node(web_driver)
@@ -83,22 +134,152 @@ class App(SeleniumObject):
             if self.hostname != '':
                 self.get('%s://%s' % (self.scheme, self.hostname))
 
-    def get(self, url):
+    def batch(self):
+        """Collect the clicks, inputs and selections made inside a with block and run them in one script
+
+        .. note:: Queued operations return a BatchStep, its result is available once the block exits.
+
+        :return: Batch context manager
+        :rtype: Batch
+        """
+
+        return Batch(self.driver)
+
+    def deadline(self, seconds):
+        """Share a time budget between every wait, retry and polling loop inside a with block
+
+        .. note:: DeadlineExceeded is raised once the budget is spent, its timeline shows what consumed it.
+
+        :param float seconds: Budget in seconds
+        :return: Deadline context manager
+        :rtype: Deadline
+        """
+
+        return Deadline(self.driver, seconds)
+
+    def get(self, url, ready=None, timeout=30):
         """Instruct Selenium to navigate to the following url
 
+        Without a readiness predicate the driver returns according to the session's page load strategy, a full load
+        by default. With one, the call returns as soon as the predicate holds, which pays off for sessions created
+        with the 'eager' or 'none' pageLoadStrategy capability: trackers and ads loading after the application no
+        longer hold up the test. The time spent on the request, the document and the predicate is recorded in the
+        timeline along with the browser's navigation timing.
+
+            **Example Use:**
+
+            .. code-block:: python
+
+                capabilities = DesiredCapabilities.CHROME.copy()
+                capabilities['pageLoadStrategy'] = 'none'
+
+                app = App(webdriver.Remote(url, desired_capabilities=capabilities))
+                app.get('http://someurl.com/reports', ready=['reports', 'filters'])
+
         :param str url: web url
-        :return:
+        :param ready: 'dom' (DOMContentLoaded), 'load', 'idle' (see wait_until_idle), identifiers (matched exactly)
+                      or Nodes that must be present, or a callable taking the app
+        :param float timeout: Seconds to wait for the predicate
+        :return: True, if the predicate holds before the timeout, when one is given
         """
 
-        if isinstance(url, basestring):
-            return self.driver.get(url)
+        if not isinstance(url, basestring):
+            raise TypeError('Incorrect type for \'url\', url must be of type \'str\'')
+
+        if isinstance(ready, basestring) and ready not in ('dom', 'load', 'idle'):
+            raise ValueError('\'ready\' must be \'dom\', \'load\', \'idle\', identifiers or a callable')
+
+        if isinstance(ready, Node):
+            ready = [ready]
+
+        started = time.time()
+        capabilities = getattr(self.driver, 'capabilities', None) or {}
+
+        # The driver may return before the new document replaces the current one
+        if capabilities.get('pageLoadStrategy') == 'none':
+            self.driver.execute_script(LEAVE_SCRIPT)
+
+        self.runtime.invalidate()
+        result = self.driver.get(url)
+
+        if ready is None:
+
+            # Documents need the helper library right away when a hook (animation suppression) is installed
+            if self.runtime.hooks:
+                self.runtime.inject()
+
+            return result
+
+        details = {'url': url, 'ready': ready if isinstance(ready, basestring) else type(ready).__name__,
+                   'request': time.time() - started}
+        ready_states = ('complete',) if ready == 'load' else ('interactive', 'complete')
+        status = [None]
+
+        def loaded():
+            """Returns True, once the new document has reached the state needed by the predicate
+
+            :return: True, if the document is ready
+            :rtype: bool
+            """
 
-        raise TypeError('Incorrect type for \'url\', url must be of type \'str\'')
+            try:
+                status[0] = self.driver.execute_script(DOCUMENT_SCRIPT)
 
-    def navigate_to(self, path):
+            # The document may be unloading
+            except WebDriverException:
+                return False
+
+            return bool(status[0]) and not status[0][0] and status[0][1] in ready_states
+
+        mark = time.time()
+        met = self._wait_for(loaded, timeout, poll_frequency=0.05)
+        details['document'] = time.time() - mark
+
+        if met and self.runtime.hooks:
+            self.runtime.inject()
+
+        mark = time.time()
+
+        # Whatever is left of the timeout, the predicate is checked at least once
+        remaining = max(MIN_PREDICATE_TIMEOUT, timeout - (mark - started))
+
+        if met and ready == 'idle':
+            met = self.wait_until_idle(remaining)
+
+        elif met and hasattr(ready, '__call__'):
+            met = self._wait_for(lambda: ready(self), remaining, poll_frequency=0.1)
+
+        elif met and not isinstance(ready, basestring):
+
+            probes = [['state', [self._name_attr, item._identifier if isinstance(item, Node) else item, False]]
+                      for item in ready]
+
+            met = self._wait_for_probe(['probe', [probes]],
+                                       lambda states: states is not None and all([state > MISSING for state in states]),
+                                       remaining)
+
+        details['predicate'] = time.time() - mark
+
+        if status[0]:
+            details['ttfb'], details['dom_content_loaded'], details['load'] = status[0][2]
+
+        details['ready_met'] = met
+        self.timeline.record('get', time.time() - started, started=started, category='navigation', **details)
+
+        return met
+
+    def navigate_to(self, path, client_side=None, force=False, timeout=30):
         """Instructs Selenium to navigate to a different path under the hostname
 
+        Nothing is done when the browser is already on the url, unless forced. With client-side routing (see
+        use_client_routing) the route changes in-page while the browser is on the hostname, and the call returns
+        once the router reports the route and the page stops changing instead of waiting for a full load. A route
+        change that fails or does not settle within the timeout falls back to loading the url.
+
         :param str path: Path from hostname
+        :param bool client_side: True or False to override use_client_routing for this navigation
+        :param bool force: True, to navigate even if the browser is already on the url
+        :param int timeout: Seconds to wait for a client-side route to be ready
         :return:
         """
 
@@ -112,12 +293,209 @@ class App(SeleniumObject):
                 scheme = self.scheme if self.scheme != '' else 'http'
 
                 if self.hostname != '':
-                    return self.get('%s://%s%s' % (scheme, self.hostname, url_path))
+
+                    url = '%s://%s%s' % (scheme, self.hostname, url_path)
+                    current = self.driver.current_url or ''
+
+                    if not force and current.rstrip('/') == url.rstrip('/'):
+                        self.timeline.record('navigate', 0.0, category='navigation', url=url, mode='skipped')
+                        return None
+
+                    client_side = self.router is not None if client_side is None else client_side
+
+                    if client_side and current.startswith('%s://%s/' % (scheme, self.hostname)):
+
+                        script = self.router if isinstance(self.router, basestring) else None
+
+                        with self.timeline.measure('navigate', category='navigation', url=url,
+                                                   mode='client') as details:
+
+                            status, details['ready'] = self.runtime.call_async('route', timeout, url, script,
+                                                                               int(self.route_settle * 1000))
+                            details['status'] = status
+
+                        # Same document, new content
+                        if status == 'ok':
+                            self.runtime.renew()
+                            return None
+
+                        # The route never settled or could not be changed in-page, load it instead
+                        deadline = active_deadline(self.driver)
+
+                        if deadline is not None:
+                            deadline.check('navigate')
+
+                    with self.timeline.measure('navigate', category='navigation', url=url, mode='load'):
+                        return self.get(url)
 
                 raise NotImplementedError('Action cannot be completed because hostname is not set')
 
         raise TypeError('Incorrect type for \'path\', path must be of type \'str\'')
 
+    def use_client_routing(self, script=None, settle=0.1):
+        """Change routes in-page with navigate_to, rather than loading the whole application again
+
+        By default the route changes through Angular's $location when available, otherwise through
+        history.pushState followed by a popstate event, which the common routers listen to. A script can be given
+        instead, it is called with the arguments url and path.
+
+            **Example Use:**
+
+            .. code-block:: python
+
+                app.use_client_routing()
+                app.use_client_routing("window.appRouter.navigateByUrl(path);")
+
+        :param str script: JavaScript performing the route change, None to use the built-in router hooks
+        :param float settle: Seconds the page must stop changing for the route to be considered ready
+        :return:
+        """
+
+        self.router = script if isinstance(script, basestring) else True
+        self.route_settle = settle
+
+    def use_connection_pool(self, pool_size=4, timeout=None):
+        """Send driver commands over a pool of persistent connections
+
+        .. note:: Every structure shares the driver, so they all use the pooled executor once installed.
+
+        :param int pool_size: Maximum number of open connections
+        :param float timeout: Socket timeout in seconds
+        :return: Pooled command executor
+        :rtype: PooledRemoteConnection
+        """
+
+        executor = self.driver.command_executor
+
+        if isinstance(executor, PooledRemoteConnection):
+            return executor
+
+        pooled = PooledRemoteConnection(executor._url, pool_size=pool_size, timeout=timeout, resolve_ip=False,
+                                        timeline=self.timeline)
+
+        # Keep any commands added by browser specific executors
+        pooled._commands.update(executor._commands)
+
+        if getattr(executor, 'keep_alive', False) and hasattr(executor, '_conn'):
+            executor._conn.close()
+
+        self.driver.command_executor = pooled
+
+        return pooled
+
+    def open_tabs(self, urls):
+        """Start loading several pages at once, each in a new tab
+
+        .. note:: Use TabSet.as_completed to switch to each tab once its page is ready, the App then reads from it.
+
+        :param list urls: Urls, or paths under the hostname
+        :return: Opened tabs
+        :rtype: TabSet
+        """
+
+        full_urls = []
+
+        for url in urls:
+
+            if not isinstance(url, basestring):
+                raise TypeError('Incorrect type for \'url\', url must be of type \'str\'')
+
+            full_urls.append(url if urlparse(url).netloc else '%s/%s' % (self.origin, url.lstrip('/')))
+
+        return TabSet(self.driver, full_urls)
+
+    @property
+    def origin(self):
+        """Returns the scheme and hostname of the app
+
+        :return: scheme://hostname
+        :rtype: str
+        """
+
+        if self.hostname != '':
+            return '%s://%s' % (self.scheme if self.scheme != '' else 'http', self.hostname)
+
+        raise NotImplementedError('Action cannot be completed because hostname is not set')
+
+    def restore_state(self, path, role=DEFAULT_ROLE):
+        """Restore the cookies, localStorage and sessionStorage saved for a user role
+
+        Restore before navigate_to, the page navigated to then loads already authenticated.
+
+            **Example Use:**
+
+            .. code-block:: python
+
+                app = App(driver, 'http://someurl.com')
+
+                if not app.restore_state('.sessions.json', role='admin'):
+                    log_in_as_admin(app)
+                    app.save_state('.sessions.json', role='admin')
+
+                app.navigate_to('/reports')
+
+        :param str path: State file
+        :param str role: User role
+        :return: True, if an unexpired state was restored
+        :rtype: bool
+        """
+
+        return restore_state(self.driver, path, self.origin, role)
+
+    def save_state(self, path, role=DEFAULT_ROLE, ttl=DEFAULT_TTL):
+        """Save the cookies, localStorage and sessionStorage of the current page for a user role
+
+        :param str path: State file, the states of other roles saved in it are kept
+        :param str role: User role
+        :param int ttl: Seconds the state may be restored for
+        :return: Saved state
+        :rtype: dict
+        """
+
+        return save_state(self.driver, path, self.origin, role, ttl)
+
+    def serialize_commands(self):
+        """Serialize every command sent to the driver, so several threads can share the session
+
+        .. note:: Reads (existence, visibility, values, ...) queued by several threads run in a single script.
+
+        :return: Driver command queue
+        :rtype: CommandQueue
+        """
+
+        return serialize(self.driver)
+
+    def suppress_animations(self, enabled=True):
+        """Disable CSS transitions and animations, jQuery and Angular animations and smooth scrolling
+
+        The stylesheet and script are applied to the current document and again to every new document, the time
+        left on the animations cut short is recorded in the timeline (category 'animation', detail 'saved').
+
+        :param bool enabled: False, to allow animations again
+        :return:
+        """
+
+        hooks = self.runtime.hooks
+
+        if enabled:
+
+            if _quiet not in hooks:
+                hooks.append(_quiet)
+
+            # Injecting the helper library runs the hook
+            if self.runtime.injected:
+                _quiet(self.runtime)
+
+            else:
+                self.runtime.inject()
+
+        else:
+
+            if _quiet in hooks:
+                hooks.remove(_quiet)
+
+            self.runtime.call('quiet', False)
+
     def update(self, name_attr=DEFAULT_NAME_ATTR, type_attr=DEFAULT_TYPE_ATTR):
         """
 
@@ -128,15 +506,15 @@ class App(SeleniumObject):
 
         if isinstance(name_attr, basestring) and isinstance(type_attr, basestring):
 
-            identifiers = [e.get_attribute(name_attr) for e in
-                           self.driver.find_elements(By.XPATH, '/descendant-or-self::*[@{0}]'.format(name_attr))]
+            identifiers = self.runtime.call('ids', name_attr) or []
 
             duplicates = set(['"{}"'.format(_id) for _id in identifiers if identifiers.count(_id) > 1])
 
             if len(duplicates) > 0:
 
                 msg = ' '.join(['UniquenessWarning: There appears to be multiple elements with the'
-                                ' same identifier. Please review the following element(s):',
+                                ' same identifier, they will be returned as an ElementCollection.'
+                                ' Please review the following element(s):',
                                 ', '.join(duplicates)])
 
                 warnings.warn(msg)
@@ -144,6 +522,35 @@ class App(SeleniumObject):
             self.page = Node(self.driver, name_attr=name_attr, type_attr=type_attr)
             self.page.add_children(*set(identifiers))
 
+    def wait_until_idle(self, timeout=30, quiet=0.1, max_timer=1):
+        """Wait until the page is quiescent: loaded, no XHR or fetch request in flight, no pending timer and Angular
+        ($http, Angular 2+ testabilities) stable, for the quiet time
+
+        .. note:: Requests and timers are counted once the page is instrumented. After the first call every new
+                  document is instrumented as soon as SAMpyL injects its helper library (right after App.get).
+
+        :param float timeout: Wait timeout in seconds
+        :param float quiet: Seconds the page must stay idle
+        :param float max_timer: Longer timers (polling, keep-alive) are not waited for
+        :return: True, if the wait does not timeout
+        :rtype: bool
+        """
+
+        if _instrument not in self.runtime.hooks:
+            self.runtime.hooks.append(_instrument)
+
+        with self.timeline.measure('wait_until_idle', category='wait', timeout=timeout) as details:
+
+            status, details['idle'], details['busy'] = self.runtime.call_async('idle', timeout, int(quiet * 1000),
+                                                                               int(max_timer * 1000))
+
+        deadline = active_deadline(self.driver)
+
+        if status == 'timeout' and deadline is not None:
+            deadline.check('wait_until_idle')
+
+        return status == 'ok'
+
     def wait_until_present(self, path, _by=None, timeout=30):
         """Wait until element with id is present
 
@@ -154,8 +561,7 @@ class App(SeleniumObject):
         """
 
         if not _by and isinstance(path, basestring):
-            _by = 'xpath'
-            path = '/descendant-or-self::*[contains(@{0}, "{1}")]'.format(self._name_attr, path)
+            return self._wait_for_identifier(path, lambda state: state > MISSING, timeout, partial=True)
 
         return super(App, self).wait_until_present(_by, path, timeout=timeout)
 
@@ -170,8 +576,7 @@ class App(SeleniumObject):
         """
 
         if not _by and isinstance(path, basestring):
-            _by = 'xpath'
-            path = '/descendant-or-self::*[contains(@{0}, "{1}")]'.format(self._name_attr, path)
+            return self._wait_for_identifier(path, lambda state: state == VISIBLE, timeout, partial=True)
 
         return super(App, self).wait_until_appears(_by, path, timeout=timeout)
 
@@ -186,8 +591,7 @@ class App(SeleniumObject):
         """
 
         if not _by and isinstance(path, basestring):
-            _by = 'xpath'
-            path = '/descendant-or-self::*[contains(@{0}, "{1}")]'.format(self._name_attr, path)
+            return self._wait_for_identifier(path, lambda state: state < VISIBLE, timeout, partial=True)
 
         return super(App, self).wait_until_disappears(_by, path, timeout=timeout)
 
@@ -204,6 +608,10 @@ class Node(SeleniumObject):
         super(Node, self).__init__(web_driver, **kwargs)
         self._children = {}
 
+        # Runtime generation, structure and bound methods, replaced as a whole so threads never see a mix
+        self._cache = (None, None, {})
+        self._lock = threading.RLock()
+
         # Sanitize arguments
         identifier = identifier if isinstance(identifier, basestring) else ''
         root = root if isinstance(root, basestring) else ''
@@ -229,49 +637,48 @@ class Node(SeleniumObject):
             child = cur[1].split(self.DELIMITER, 1)[0]
 
             if child != '':
-                self.__setitem__(child, Node(web_driver=web_driver,
-                                             identifier=cur[1], root=self._identifier))
+                self.__setitem__(child, Node(web_driver=web_driver, identifier=cur[1], root=self._identifier,
+                                             name_attr=self._name_attr, type_attr=self._type_attr))
 
     def __getattr__(self, item):
 
-        if item in self.keys():
-            return self.__getitem__(item)
+        if item.startswith('__'):
+            raise AttributeError('%s' % str(item))
 
-        else:
-
-            element = self.this
-
-            if hasattr(element, item):
+        if item in self._children:
+            return self._children[item]
 
-                attr = element.__getattribute__(item)
+        element = self.this
+        bound = self._cache[2]
 
-                # SDA method
-                if hasattr(attr, '__call__'):
+        # SDA method, bound to the cached structure
+        if item in bound:
+            return bound[item]
 
-                    def indirect_call_to_this(*args, **kwargs):
-                        """
+        # Structure methods (click, input, ...) need a single element, a collection would answer with a DOM attribute
+        if isinstance(element, ElementCollection) and not hasattr(ElementCollection, item) and \
+                any([callable(getattr(structure, item, None)) for structure in T.values()]):
+            raise AttributeError('\'{}\' matches {} elements, {}() needs a single element. Use the collection\'s '
+                                 'methods instead (texts, attributes, click_all, filter, ...)'.format(
+                                     self._identifier, len(element), item))
 
-                        :param args:
-                        :param kwargs:
-                        :return:
-                        """
-
-                        return attr(*args, **kwargs)
+        # Falls through to Element.__getattr__, which exposes the element's DOM attributes (href, id, src, ...)
+        try:
+            attr = getattr(element, item)
 
-                    return indirect_call_to_this
+        except AttributeError:
+            raise AttributeError('%s' % str(item))
 
-                # SDA property
-                else:
-                    return attr
+        if hasattr(attr, '__call__') and self._cache[1] is element:
+            bound[item] = attr
 
-            else:
-                raise AttributeError('%s' % str(item))
+        return attr
 
     def __getitem__(self, item):
 
         if isinstance(item, (basestring, int)):
 
-            if str(item) in self.keys():
+            if str(item) in self._children:
 
                 return self._children[str(item)]
 
@@ -311,17 +718,23 @@ class Node(SeleniumObject):
 
         if cur[0] != '':
 
-            # If this Node has not been created
-            if cur[0] not in self.keys():
+            # Threads adding the same child create it once
+            with self._lock:
 
-                self.__setitem__(cur[0], Node(web_driver=self.driver,
-                                              identifier=child, root=self._identifier))
+                # If this Node has not been created
+                if cur[0] not in self.keys():
+
+                    self.__setitem__(cur[0], Node(web_driver=self.driver, identifier=child, root=self._identifier,
+                                                  name_attr=self._name_attr, type_attr=self._type_attr))
+                    return
+
+                existing = self._children[cur[0]]
 
             # If the Node already exists
-            elif len(cur) > 1:
+            if len(cur) > 1:
 
                 try:
-                    self._children[cur[0]].add_child(cur[1])
+                    existing.add_child(cur[1])
 
                 except KeyError:
                     raise KeyError('Id %s contains a reserved word.' % child)
@@ -340,11 +753,40 @@ class Node(SeleniumObject):
     def this(self):
         """Returns the sda structure for this node
 
+        .. note:: The structure is reused until the page navigates, see Runtime.generation, once an element with the
+                  identifier exists. Identifiers shared by several elements return an ElementCollection.
+
         :return: SDA structure
         """
 
         if self._identifier != '':
-            return T.get(self.type(), T[DEFAULT_TYPE])(self.driver, by=By.XPATH, path=self.xpath())
+
+            generation, this = self._cache[:2]
+
+            if this is not None and generation == self.runtime.generation:
+                return this
+
+            # Threads resolving the node together describe it once
+            with self._lock:
+
+                generation, this = self._cache[:2]
+
+                if this is not None and generation == self.runtime.generation:
+                    return this
+
+                generation = self.runtime.generation
+                _type, count = self._describe()
+
+                # Repeated identifiers resolve to every matching element
+                structure = ElementCollection if count > 1 else T.get(_type, T[DEFAULT_TYPE])
+
+                this = structure(self.driver, IDENTIFIER, self._identifier, name_attr=self._name_attr,
+                                 type_attr=self._type_attr)
+
+                # Nothing matched yet, the element may still be rendered in-page: describe it again next time
+                self._cache = (generation if count > 0 else None, this, {})
+
+                return this
 
     def xpath(self):
         """Returns the XPATH selector for this node
@@ -365,19 +807,18 @@ class Node(SeleniumObject):
         :rtype: str
         """
 
-        try:
-            element = self.driver.find_element_by_xpath(self.xpath())
+        return self._describe()[0]
 
-        except NoSuchElementException:
-            element = None
+    def _describe(self):
+        """Returns a node's type and the number of elements sharing its identifier, in one call
 
-        _type = element.get_attribute(self._type_attr) if element else None
+        :return: Node type and element count
+        :rtype: tuple
+        """
 
-        if _type:
-            return _type.lower()
+        _type, count = self.runtime.call('type', self._name_attr, self._type_attr, self._identifier) or (None, 0)
 
-        else:
-            return DEFAULT_TYPE
+        return _type.lower() if _type else DEFAULT_TYPE, count
 
     def wait_until_present(self, _by=None, path=None, timeout=30):
         """Wait until the element is available to the DOM
@@ -389,10 +830,10 @@ class Node(SeleniumObject):
         """
 
         if _by and path:
-            self._wait_until(ec.presence_of_element_located, _by, path, timeout)
+            return self._wait_until(ec.presence_of_element_located, _by, path, timeout)
 
         else:
-            return self._wait_until(ec.presence_of_element_located, 'xpath', self.xpath(), timeout)
+            return self._wait_for_identifier(self._identifier, lambda state: state > MISSING, timeout)
 
     def wait_until_appears(self, _by=None, path=None, timeout=30):
         """Wait until the element appears
@@ -408,7 +849,7 @@ class Node(SeleniumObject):
             return self._wait_until(ec.visibility_of_element_located, _by, path, timeout)
 
         else:
-            return self._wait_until(ec.visibility_of_element_located, 'xpath', self.xpath(), timeout)
+            return self._wait_for_identifier(self._identifier, lambda state: state == VISIBLE, timeout)
 
     def wait_until_disappears(self, _by=None, path=None, timeout=30):
         """Wait until the element disappears
@@ -423,4 +864,4 @@ class Node(SeleniumObject):
             return self._wait_until(ec.invisibility_of_element_located, _by, path, timeout)
 
         else:
-            return self._wait_until(ec.invisibility_of_element_located, 'xpath', self.xpath(), timeout)
+            return self._wait_for_identifier(self._identifier, lambda state: state < VISIBLE, timeout)
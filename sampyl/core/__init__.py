@@ -5,9 +5,18 @@
 
 """
 
+from sampyl.core import batch
+from sampyl.core import commands
+from sampyl.core import deadline
 from sampyl.core import element
 from sampyl.core import mixins
+from sampyl.core import remote
+from sampyl.core import runtime
+from sampyl.core import scheduler
 from sampyl.core import shortcuts
+from sampyl.core import state
 from sampyl.core import structures
+from sampyl.core import tabs
+from sampyl.core import timing
 
-__all__ = ['element', 'mixins', 'shortcuts', 'structures']
+__all__ = ['batch', 'commands', 'deadline', 'element', 'mixins', 'remote', 'runtime', 'scheduler', 'shortcuts', 'state', 'structures', 'tabs', 'timing']
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""sampyl.core.batch
+
+.. codeauthor:: John Lane <jlane@fanthreesixty.com>
+
+"""
+
+# pylint: disable=line-too-long
+import threading
+import weakref
+from functools import wraps
+from sampyl.core.runtime import get_runtime
+from sampyl.core.timing import get_timeline
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+
+__all__ = ['Batch', 'BatchStep', 'active_batch', 'batchable']
+
+_BATCHES = weakref.WeakKeyDictionary()
+
+# Characters selenium uses for special keys (Keys.ENTER, Keys.TAB, ...) can only be typed natively
+NATIVE_KEYS = (u'\ue000', u'\uf8ff')
+
+
+class BatchStep(object):
+    """The BatchStep implementation
+
+    Placeholder returned by a queued operation. The result is filled in once the batch has executed.
+
+    """
+
+    def __init__(self, structure, operation, func, args, kwargs):
+
+        self.structure = structure
+        self.operation = operation
+        self.error = None
+        self.result = None
+        self.status = 'queued'
+
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+
+        self.native = self._needs_native()
+
+    def __nonzero__(self):
+        return bool(self.result)
+
+    def __repr__(self):
+
+        return '<{} operation="{}" status="{}" result="{}">'.format(self.__class__.__name__, self.operation,
+                                                                    self.status, self.result)
+
+    def _needs_native(self):
+        """Returns True, if the step can only be performed with native input events
+
+        :return: True, if the step must be performed natively
+        :rtype: bool
+        """
+
+        for term in self.structure.locator():
+
+            if term[0] == 'element' and not isinstance(term[1], WebElement):
+                return True
+
+        if self.operation == 'input':
+            return any([NATIVE_KEYS[0] <= char <= NATIVE_KEYS[1] for char in self.text()])
+
+        return False
+
+    def payload(self):
+        """Returns the step in the form consumed by the batch script
+
+        :return: Locator, operation and arguments
+        :rtype: list
+        """
+
+        if self.operation == 'input':
+            args = [self.text(), 'clear' in self._kwargs]
+
+        elif self.operation in ('select_by_index', 'deselect_by_index'):
+            args = [self.structure._to_int(self._args[0]) if self._args else None]
+
+        else:
+            args = list(self._args)
+
+        return [self.structure.locator(), self.operation, args]
+
+    def run(self):
+        """Perform the step through its regular, non-batched implementation
+
+        :return: Step result
+        """
+
+        try:
+            self.result = self._func(self.structure, *self._args, **self._kwargs)
+            self.status = 'native'
+
+        except Exception as error:  # pylint: disable=broad-except
+            self.error = error
+            self.status = 'error'
+            self.result = False
+
+        return self.result
+
+    def text(self):
+        """Returns the text an input step types
+
+        :return: Text to send to the input field
+        :rtype: unicode
+        """
+
+        return u''.join([arg if isinstance(arg, basestring) else unicode(arg) for arg in self._args])
+
+
+class Batch(object):
+    """The Batch implementation
+
+    Queues DOM-level operations performed inside the with block and executes them, in order, in as few
+    scripts as possible once the block exits. Queued calls return a BatchStep instead of their usual result.
+    Steps that need native input events (special keys, file inputs, content editables) split the batch and
+    run through the regular Selenium implementation. If the block raises, nothing is executed.
+
+        **Example Use:**
+
+        .. code-block:: python
+
+            with app.batch() as batch:
+                app.page.login.username.input('user')
+                app.page.login.role.select_by_value('2')
+                app.page.login.submit.click()
+
+            # List of each step's result
+            batch.results()
+
+    """
+
+    def __init__(self, web_driver):
+
+        self.driver = web_driver
+        self.scripts = 0
+        self.steps = []
+        self.thread = None
+
+    def __enter__(self):
+
+        batches = _BATCHES.setdefault(self.driver, {})
+        thread = threading.current_thread()
+
+        # A nested batch is folded into the batch already collecting steps on this thread
+        if thread in batches:
+            return batches[thread]
+
+        self.thread = thread
+        batches[thread] = self
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+
+        batches = _BATCHES.get(self.driver, {})
+
+        if batches.get(self.thread) is not self:
+            return False
+
+        del batches[self.thread]
+
+        if exc_type is None:
+            self.execute()
+
+        else:
+            for step in self.steps:
+                step.status = 'cancelled'
+
+        return False
+
+    def __len__(self):
+        return len(self.steps)
+
+    def _abort(self, unanswered, remaining):
+        """Fail the steps the batch script returned no result for and cancel the steps queued after them
+
+        :param list unanswered: Steps without a result
+        :param list remaining: Steps not executed yet
+        :return:
+        :raises WebDriverException: Always
+        """
+
+        error = WebDriverException('The batch script returned no result for {}, the page may have unloaded'.format(
+            ', '.join([step.operation for step in unanswered])))
+
+        for step in unanswered:
+            step.status, step.result, step.error = 'error', False, error
+
+        for step in remaining:
+            step.status, step.result = 'cancelled', False
+
+        raise error
+
+    def queue(self, structure, operation, func, args, kwargs):
+        """Add an operation to the batch
+
+        :param structure: Structure performing the operation
+        :param str operation: Operation name
+        :param func func: Regular implementation of the operation
+        :param tuple args: Operation arguments
+        :param dict kwargs: Operation keyword arguments
+        :return: Queued step
+        :rtype: BatchStep
+        """
+
+        step = BatchStep(structure, operation, func, args, kwargs)
+        self.steps.append(step)
+
+        return step
+
+    def execute(self):
+        """Execute every queued step in order
+
+        :return: List of step results
+        :rtype: list
+        """
+
+        with get_timeline(self.driver).measure('batch', category='batch', steps=len(self.steps)) as details:
+
+            pending = [step for step in self.steps if step.status == 'queued']
+
+            while pending:
+
+                if pending[0].native:
+                    pending.pop(0).run()
+                    continue
+
+                segment = []
+
+                while pending and not pending[0].native:
+                    segment.append(pending.pop(0))
+
+                # No results when the page unloaded during the script
+                results = get_runtime(self.driver).call('batch', [step.payload() for step in segment]) or []
+                self.scripts += 1
+
+                for step, (status, value) in zip(segment, results):
+
+                    # The script stops at the first step that turns out to need native events
+                    if status == 'native':
+                        step.native = True
+                        break
+
+                    step.status = status
+                    step.result = value if status == 'ok' else False
+
+                    if status == 'error':
+                        step.error = value
+
+                else:
+
+                    if len(results) < len(segment):
+                        self._abort(segment[len(results):], pending)
+
+                pending = [step for step in segment if step.status == 'queued'] + pending
+
+            details['scripts'] = self.scripts
+
+        return self.results()
+
+    def results(self):
+        """Returns the result of each step
+
+        :return: List of step results
+        :rtype: list
+        """
+
+        return [step.result for step in self.steps]
+
+
+def active_batch(web_driver):
+    """Returns the batch collecting operations for a driver on the current thread
+
+    :param WebDriver web_driver: Selenium webdriver
+    :return: Active batch
+    :rtype: Batch
+    """
+
+    return _BATCHES.get(web_driver, {}).get(threading.current_thread())
+
+
+def batchable(operation):
+    """Queue the decorated operation when called inside a batch
+
+    :param str operation: Operation name understood by the batch script
+    :return:
+    """
+
+    def batchable_decorator(func):
+        """
+
+        :param func:
+        :return:
+        """
+
+        @wraps(func)
+        def func_wrapper(self, *args, **kwargs):
+            """
+
+            :param args:
+            :param kwargs:
+            :return:
+            """
+
+            batch = active_batch(self.driver)
+
+            if batch is not None:
+                return batch.queue(self, operation, func, args, kwargs)
+
+            return func(self, *args, **kwargs)
+
+        return func_wrapper
+
+    return batchable_decorator
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""sampyl.core.commands
+
+.. codeauthor:: John Lane <jlane@fanthreesixty.com>
+
+"""
+
+# pylint: disable=line-too-long
+import threading
+import weakref
+from sampyl.core.timing import get_timeline
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.command import Command
+
+__all__ = ['CommandQueue', 'get_queue', 'serialize']
+
+# Runtime functions that only read the document, they may be merged into a single script
+READ_FUNCTIONS = frozenset(['all', 'attribute', 'css', 'exists', 'fields', 'find', 'has', 'ids', 'items', 'label',
+                            'labels', 'probe', 'scope', 'state', 'table', 'tag', 'type', 'value', 'visible', 'window'])
+
+_QUEUES = weakref.WeakKeyDictionary()
+
+
+class _Read(object):
+    """A queued runtime read
+    """
+
+    def __init__(self, name, args):
+
+        self.name = name
+        self.args = args
+        self.done = False
+        self.error = None
+        self.result = None
+
+
+class CommandQueue(object):
+    """The CommandQueue implementation
+
+    Serializes every command sent to a driver, so background threads (log drains, screenshots, health checks) can
+    share a session with the test thread. Runtime reads queued while another thread holds the session are merged:
+    the next thread to get the session runs all of them in a single script. The runtime shares the queue's lock, so
+    its injection state only changes while holding the session.
+
+    """
+
+    def __init__(self, web_driver):
+
+        # The queue is registered under its driver, holding the driver weakly lets the session be collected
+        self._driver = weakref.ref(web_driver)
+        self.lock = threading.RLock()
+        self.commands = 0
+        self.merged = 0
+
+        self._mutex = threading.Lock()
+        self._pending = []
+
+    @property
+    def driver(self):
+        """Returns the driver, None once it was collected
+
+        :return: Selenium webdriver
+        :rtype: WebDriver
+        """
+
+        return self._driver()
+
+    @property
+    def installed(self):
+        """Returns whether the driver's commands are routed through the queue
+
+        :return: True, if installed
+        :rtype: bool
+        """
+
+        driver = self.driver
+
+        return driver is not None and getattr(driver.__dict__.get('execute'), 'queue', None) is self
+
+    def _drain(self, runtime):
+        """Run every queued read, the caller holds the session
+
+        .. note:: Every read taken from the queue is completed, an error in the merged script is raised by each of
+                  the reads it carried.
+
+        :param Runtime runtime: Driver runtime
+        :return:
+        """
+
+        with self._mutex:
+            reads, self._pending = self._pending, []
+
+        if len(reads) > 1:
+
+            try:
+
+                results = runtime.send('probe', [[read.name, read.args] for read in reads]) or []
+
+                for index, read in enumerate(reads):
+                    read.result = results[index] if index < len(results) else None
+                    read.done = True
+
+                self.merged += len(reads) - 1
+                get_timeline(self.driver).record('merged_reads', 0.0, category='command', reads=len(reads))
+
+                return
+
+            # A stale element handle fails the whole script, run the reads one by one instead
+            except StaleElementReferenceException:
+                pass
+
+            except Exception as error:  # pylint: disable=broad-except
+
+                for read in reads:
+                    read.error, read.done = error, True
+
+                return
+
+        for read in reads:
+
+            try:
+                read.result = runtime.send(read.name, *read.args)
+
+            except Exception as error:  # pylint: disable=broad-except
+                read.error = error
+
+            read.done = True
+
+    def install(self):
+        """Route the driver's commands through the queue
+
+        .. note:: The queue uninstalls itself once the driver is quit.
+
+        :return:
+        """
+
+        with self.lock:
+
+            if self.installed:
+                return
+
+            queue = self
+            driver = self.driver
+            original = driver.execute
+            replaced = driver.__dict__.get('execute')
+
+            def execute(driver_command, params=None):
+                """Send a command while holding the session
+
+                :param str driver_command: WebDriver command
+                :param dict params: Command parameters
+                :return: Command response
+                """
+
+                with queue.lock:
+
+                    queue.commands += 1
+
+                    try:
+                        return original(driver_command, params)
+
+                    finally:
+
+                        if driver_command == Command.QUIT:
+                            queue.uninstall()
+
+            execute.queue = queue
+            execute.replaced = replaced
+            driver.execute = execute
+
+    def uninstall(self):
+        """Send the driver's commands directly again
+
+        :return:
+        """
+
+        with self.lock:
+
+            driver = self.driver
+
+            if driver is None:
+                return
+
+            if self.installed:
+
+                replaced = driver.__dict__['execute'].replaced
+
+                # Removing the instance attribute restores the driver's own method
+                if replaced is None:
+                    del driver.execute
+
+                else:
+                    driver.execute = replaced
+
+            if _QUEUES.get(driver) is self:
+                del _QUEUES[driver]
+
+    def read(self, runtime, name, args):
+        """Call a runtime function that only reads the document, merged with the reads queued by other threads
+
+        :param Runtime runtime: Driver runtime
+        :param str name: Function name
+        :param tuple args: Function arguments
+        :return: Function result
+        """
+
+        read = _Read(name, list(args))
+
+        with self._mutex:
+            self._pending.append(read)
+
+        with self.lock:
+
+            # Another thread may have run this read along with its own
+            if not read.done:
+                self._drain(runtime)
+
+        if read.error is not None:
+            raise read.error
+
+        return read.result
+
+
+def get_queue(web_driver):
+    """Returns the command queue installed for a driver
+
+    :param WebDriver web_driver: Selenium webdriver
+    :return: Driver command queue, None if commands are not serialized
+    :rtype: CommandQueue
+    """
+
+    return _QUEUES.get(web_driver)
+
+
+def serialize(web_driver):
+    """Serialize every command sent to a driver
+
+    :param WebDriver web_driver: Selenium webdriver
+    :return: Driver command queue
+    :rtype: CommandQueue
+    """
+
+    queue = _QUEUES.get(web_driver)
+
+    if queue is None:
+        queue = _QUEUES.setdefault(web_driver, CommandQueue(web_driver))
+
+    queue.install()
+
+    return queue
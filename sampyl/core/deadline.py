@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""sampyl.core.deadline
+
+.. codeauthor:: John Lane <jlane@fanthreesixty.com>
+
+"""
+
+# pylint: disable=line-too-long
+import threading
+import time
+import weakref
+from sampyl.core.timing import get_timeline
+from selenium.common.exceptions import TimeoutException
+
+__all__ = ['Deadline', 'DeadlineExceeded', 'active_deadline']
+
+_DEADLINES = weakref.WeakKeyDictionary()
+
+
+class DeadlineExceeded(TimeoutException):
+    """The DeadlineExceeded implementation
+
+    Raised when a deadline's budget runs out. The timeline holds every entry recorded since the deadline started,
+    showing what consumed the budget.
+
+    """
+
+    def __init__(self, deadline, operation=None):
+
+        self.deadline = deadline
+        self.operation = operation
+        self.timeline = deadline.timeline.since(deadline.started)
+
+        consumers = {}
+
+        for entry in self.timeline:
+            consumers[entry.name] = consumers.get(entry.name, 0.0) + entry.elapsed
+
+        top = sorted(consumers.items(), key=lambda item: item[1], reverse=True)[:5]
+
+        msg = 'Deadline of {}s exceeded{}'.format(deadline.seconds, ' during {}'.format(operation) if operation else '')
+
+        if top:
+            msg = '{}, time spent on: {}'.format(msg, ', '.join(['{} {:.2f}s'.format(*item) for item in top]))
+
+        super(DeadlineExceeded, self).__init__(msg)
+
+
+class Deadline(object):
+    """The Deadline implementation
+
+    A time budget shared by every wait, retry and polling loop performed with a driver inside the with block, on
+    the current thread. Waits are shortened to fit the remaining budget, and DeadlineExceeded is raised once it is
+    spent. Nested deadlines never extend the deadline they are nested in.
+
+        **Example Use:**
+
+        .. code-block:: python
+
+            with app.deadline(20):
+                app.page.menu.expand()
+                app.page.results.wait_until_appears()
+
+    """
+
+    def __init__(self, web_driver, seconds):
+
+        self.driver = web_driver
+        self.seconds = seconds
+        self.started = None
+        self.expires = None
+        self.thread = None
+
+    def __enter__(self):
+
+        self.thread = threading.current_thread()
+        self.started = time.time()
+        self.expires = self.started + self.seconds
+
+        stack = _DEADLINES.setdefault(self.driver, {}).setdefault(self.thread, [])
+
+        if stack:
+            self.expires = min(self.expires, stack[-1].expires)
+
+        stack.append(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+
+        deadlines = _DEADLINES.get(self.driver, {})
+        stack = deadlines.get(self.thread, [])
+
+        if self in stack:
+            stack.remove(self)
+
+        if not stack:
+            deadlines.pop(self.thread, None)
+
+        self.timeline.record('deadline', time.time() - self.started, started=self.started, category='deadline',
+                             budget=self.seconds, exceeded=isinstance(exc_val, DeadlineExceeded))
+
+        return False
+
+    @property
+    def timeline(self):
+        """Returns the timeline of the deadline's driver
+
+        :return: Driver timeline
+        :rtype: Timeline
+        """
+
+        return get_timeline(self.driver)
+
+    def budget(self, timeout, operation=None):
+        """Returns a timeout shortened to fit the remaining budget
+
+        :param float timeout: Requested timeout in seconds
+        :param str operation: Operation name, used in the error message
+        :return: Timeout in seconds
+        :rtype: float
+        :raises DeadlineExceeded: If the budget is already spent
+        """
+
+        return min(timeout, self.check(operation))
+
+    def check(self, operation=None):
+        """Returns the seconds left, raising once the budget is spent
+
+        :param str operation: Operation name, used in the error message
+        :return: Seconds left
+        :rtype: float
+        :raises DeadlineExceeded: If the budget is spent
+        """
+
+        remaining = self.remaining()
+
+        if remaining <= 0:
+            raise DeadlineExceeded(self, operation)
+
+        return remaining
+
+    def remaining(self):
+        """Returns the seconds left
+
+        :return: Seconds left, 0 once the budget is spent
+        :rtype: float
+        """
+
+        return max(0.0, self.expires - time.time()) if self.expires is not None else float(self.seconds)
+
+
+def active_deadline(web_driver):
+    """Returns the innermost deadline for a driver on the current thread
+
+    :param WebDriver web_driver: Selenium webdriver
+    :return: Active deadline
+    :rtype: Deadline
+    """
+
+    stack = _DEADLINES.get(web_driver, {}).get(threading.current_thread())
+
+    return stack[-1] if stack else None
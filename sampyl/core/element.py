@@ -8,7 +8,11 @@
 # pylint: disable=line-too-long
 import keyword
 from lxml.cssselect import CSSSelector, SelectorError
+from sampyl.core.deadline import DeadlineExceeded, active_deadline
+from sampyl.core.runtime import get_runtime
+from sampyl.core.scheduler import get_scheduler
 from sampyl.core.shortcuts import encode_ascii
+from sampyl.core.timing import get_timeline
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
@@ -16,27 +20,129 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
-from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException, TimeoutException
+from selenium.common.exceptions import InvalidSelectorException, StaleElementReferenceException, TimeoutException
 
-__all__ = ['Element']
+__all__ = ['Element', 'ElementCollection']
 
 DEFAULT_NAME_ATTR = 'data-qa-id'
 DEFAULT_TYPE_ATTR = 'data-qa-model'
 
 
+# Locates elements by their SAMpyL identifier through the browser-side index
+IDENTIFIER = 'identifier'
+
+STRATEGIES = ('class name', 'css selector', 'id', IDENTIFIER, 'link text', 'name', 'partial link text', 'tag name',
+              'xpath')
+
+
+def css_string(value):
+    """Quote a value for use in a CSS attribute selector
+
+    :param str value: Attribute value
+    :return: Quoted CSS string
+    :rtype: str
+    """
+
+    return '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\a ')
+
+
+def xpath_string(value):
+    """Quote a value as a xpath string literal
+
+    :param str value: String value
+    :return: Xpath string literal
+    :rtype: str
+    """
+
+    if '"' not in value:
+        return '"%s"' % value
+
+    elif "'" not in value:
+        return "'%s'" % value
+
+    return 'concat(%s)' % ', \'"\', '.join(['"%s"' % part for part in value.split('"')])
+
+
+def relative_xpath(path):
+    """Make every absolute branch of a xpath (unions included) relative to the context node
+
+    :param str path: Xpath selector
+    :return: Relative xpath selector
+    :rtype: str
+    """
+
+    branches, depth, quote, start = [], 0, None, 0
+
+    # Split on the union operators outside of predicates, function calls and string literals
+    for index, char in enumerate(path):
+
+        if quote:
+            quote = None if char == quote else quote
+
+        elif char in '"\'':
+            quote = char
+
+        elif char in '[(':
+            depth += 1
+
+        elif char in '])':
+            depth -= 1
+
+        elif char == '|' and depth == 0:
+            branches.append(path[start:index])
+            start = index + 1
+
+    branches.append(path[start:])
+    relative = []
+
+    for branch in branches:
+
+        # Grouped branches, e.g. (//li)[1], start with parentheses
+        branch = branch.strip()
+        step = len(branch) - len(branch.lstrip('('))
+
+        relative.append('%s.%s' % (branch[:step], branch[step:]) if branch[step:].startswith('/') else branch)
+
+    return '|'.join(relative)
+
+
 def normalize(_by, path, *args, **kwargs):
-    """Convert all paths into a xpath selector
+    """Validate a locator, keeping its native selector strategy
 
     :param str _by: Selenium selector
     :param str path: Selector value
     :param args:
     :param kwargs:
-    :return:
+    :return: Locator path tuple (by, path)
+    :rtype: tuple
     """
 
     if args or kwargs:
         pass
 
+    if _by == 'element':
+
+        if isinstance(path, Element):
+            return path.search_term
+
+        elif isinstance(path, WebElement):
+            return 'element', path
+
+    elif _by in STRATEGIES:
+        return _by, str(path)
+
+    return By.XPATH, ''
+
+
+def to_xpath(_by, path):
+    """Convert a locator into a xpath selector
+
+    :param str _by: Selenium selector
+    :param str path: Selector value
+    :return: Locator path tuple (by, path)
+    :rtype: tuple
+    """
+
     normalizers = dict([('class name', lambda x: '/descendant-or-self::*[contains(@class, "%s")]' % x),
                         ('id', lambda x: '/descendant-or-self::*[@id="%s"]' % x),
                         ('link text', lambda x: '/descendant-or-self::*[contains("input a button", name()) '
@@ -55,23 +161,20 @@ def normalize(_by, path, *args, **kwargs):
         except SelectorError:
             return By.XPATH, ''
 
-    elif _by == 'element':
-        if isinstance(path, Element):
-            return path.search_term
-
-    else:
-        return By.XPATH, normalizers.get(_by, lambda x: '')(str(path))
+    return By.XPATH, normalizers.get(_by, lambda x: '')(str(path))
 
 
 def join(*args):
     """Join 'x' locator paths into a single path
 
+    .. note:: Prefer resolving sub-elements with 'within', joined paths are searched from the document root.
+
     :param args: Locator path tuples (by, path)
     :return: Locator path
     :rtype: str
     """
 
-    return By.XPATH, ''.join([normalize(*item)[1] for item in args if isinstance(item, (list, tuple))])
+    return By.XPATH, ''.join([to_xpath(*item)[1] for item in args if isinstance(item, (list, tuple))])
 
 
 class SeleniumObject(object):
@@ -92,11 +195,104 @@ class SeleniumObject(object):
             self._name_attr = DEFAULT_NAME_ATTR
 
         if 'type_attr' in kwargs.keys():
-            self._name_attr = kwargs['type_attr'] if isinstance(kwargs['type_attr'], basestring) else DEFAULT_TYPE_ATTR
+            self._type_attr = kwargs['type_attr'] if isinstance(kwargs['type_attr'], basestring) else DEFAULT_TYPE_ATTR
 
         else:
             self._type_attr = DEFAULT_TYPE_ATTR
 
+    @property
+    def timeline(self):
+        """Returns the timing data recorded for this object's driver
+
+        :return: Driver timeline
+        :rtype: Timeline
+        """
+
+        return get_timeline(self.driver)
+
+    @property
+    def runtime(self):
+        """Returns the browser-side helper library for this object's driver
+
+        :return: Driver runtime
+        :rtype: Runtime
+        """
+
+        return get_runtime(self.driver)
+
+    def _wait_for(self, condition, timeout=30, poll_frequency=0.5):
+        """Wait until a condition returns True
+
+        :param func condition: Callable taking no arguments
+        :param float timeout: Wait timeout in seconds
+        :param float poll_frequency: Seconds to sleep between checks
+        :return: True, if the wait does not timeout
+        :rtype: bool
+        """
+
+        timeout = timeout if isinstance(timeout, (int, float)) else 30
+        deadline = active_deadline(self.driver)
+        budget = deadline.budget(timeout, 'wait') if deadline is not None else timeout
+
+        wait = WebDriverWait(self.driver, budget, poll_frequency=poll_frequency,
+                             ignored_exceptions=(StaleElementReferenceException,))
+
+        try:
+
+            with self.timeline.measure('wait', category='wait', timeout=budget):
+                wait.until(lambda driver: condition())
+
+            return True
+
+        except DeadlineExceeded:
+            raise
+
+        except TimeoutException:
+
+            # The wait was cut short by the deadline rather than its own timeout
+            if budget < timeout:
+                raise DeadlineExceeded(deadline, 'wait')
+
+        return False
+
+    def _wait_for_identifier(self, identifier, condition, timeout=30, partial=False):
+        """Wait until the state of the element with an identifier fulfills a condition
+
+        :param str identifier: Element identifier
+        :param func condition: Callable taking the element state (MISSING, PRESENT or VISIBLE)
+        :param int timeout: Wait timeout in seconds
+        :param bool partial: True, to match the first identifier containing the value
+        :return: True, if the wait does not timeout
+        :rtype: bool
+        """
+
+        return self._wait_for_probe(['state', [self._name_attr, identifier, partial]], condition, timeout)
+
+    def _wait_for_probe(self, probe, condition, timeout=30):
+        """Wait until the result of a runtime function fulfills a condition
+
+        .. note:: Waits pending on the same driver are evaluated together, in one script per poll.
+
+        :param list probe: Runtime function name and argument list
+        :param func condition: Callable taking the function result
+        :param float timeout: Wait timeout in seconds
+        :return: True, if the wait does not timeout
+        :rtype: bool
+        """
+
+        timeout = timeout if isinstance(timeout, (int, float)) else 30
+        deadline = active_deadline(self.driver)
+        budget = deadline.budget(timeout, 'wait') if deadline is not None else timeout
+
+        with self.timeline.measure('wait', category='wait', timeout=budget):
+            met = get_scheduler(self.driver).wait(probe, condition, budget)
+
+        # The wait was cut short by the deadline rather than its own timeout
+        if not met and budget < timeout:
+            raise DeadlineExceeded(deadline, 'wait')
+
+        return met
+
     def _wait_until(self, expected_condition, _by, path, timeout=30):
         """Wait until expected condition is fulfilled
 
@@ -107,17 +303,25 @@ class SeleniumObject(object):
         :return:
         """
 
-        wait = WebDriverWait(self.driver, timeout) if isinstance(timeout, int) else WebDriverWait(self.driver, 30)
+        timeout = timeout if isinstance(timeout, int) else 30
+        deadline = active_deadline(self.driver)
+        budget = deadline.budget(timeout, 'wait') if deadline is not None else timeout
+
+        wait = WebDriverWait(self.driver, budget)
 
         try:
 
             if _by != 'element':
 
-                wait.until(expected_condition((_by, path)))
+                with self.timeline.measure('wait', category='wait', timeout=budget):
+                    wait.until(expected_condition((_by, path)))
+
                 return True
 
         except TimeoutException:
-            pass
+
+            if budget < timeout:
+                raise DeadlineExceeded(deadline, 'wait')
 
         return False
 
@@ -159,12 +363,18 @@ class SeleniumObject(object):
     def wait_implicitly(self, s):
         """Wait a set amount of time in seconds
 
+        .. note:: SAMpyL manages the implicit wait itself. The driver's implicit wait is set to 0 so existence checks
+                  return immediately, elements about to be clicked, typed into or selected are waited for up to s
+                  seconds.
+
         :param int s: Seconds to wait
         :return:
         """
 
         if isinstance(s, int):
-            self.driver.implicitly_wait(s)
+
+            self.runtime.implicit_wait = s
+            self.driver.implicitly_wait(0)
             return True
 
         return False
@@ -177,19 +387,25 @@ class Element(SeleniumObject):
 
     """
 
-    def __init__(self, web_driver, _by=By.XPATH, path=None, **kwargs):
+    def __init__(self, web_driver, _by=By.XPATH, path=None, within=None, **kwargs):
         """Basic Selenium element
 
         :param WebDriver web_driver: Selenium webdriver
         :param str _by: By selector
         :param str path: selection value
+        :param Element within: Parent element, the selector is resolved relative to it
         :return:
         """
 
         super(Element, self).__init__(web_driver, **kwargs)
 
+        if within is None and _by == 'element' and isinstance(path, Element):
+            within = path.within
+
         # Instantiate selector
         self.search_term = normalize(_by=_by, path=path)
+        self.within = within if isinstance(within, Element) else None
+        self._handle = None
 
         # Add any additional attributes
         for extra in kwargs:
@@ -203,13 +419,12 @@ class Element(SeleniumObject):
         :rtype: bool
         """
 
-        if self.exists() and isinstance(attribute, basestring):
+        if isinstance(attribute, basestring):
 
             try:
-                self.driver.find_element(*join(self.search_term, ('xpath', '/self::*[boolean(@{})]'.format(attribute))))
-                return True
+                return bool(self.runtime.call('has', self.locator(), attribute))
 
-            except NoSuchElementException:
+            except StaleElementReferenceException:
                 pass
 
         return False
@@ -225,17 +440,19 @@ class Element(SeleniumObject):
         :rtype: str
         """
 
-        if self.exists():
+        if keyword.iskeyword(attribute.replace('_', '')):
+            attribute = attribute.replace('_', '')
 
-            if keyword.iskeyword(attribute.replace('_', '')):
-                attribute = attribute.replace('_', '')
+        else:
+            attribute = attribute.replace('_', '-')
 
-            else:
-                attribute = attribute.replace('_', '-')
+        try:
+            found, value = self.runtime.call('attribute', self.locator(), attribute) or (False, None)
 
-            return self.element().get_attribute(attribute)
+        except StaleElementReferenceException:
+            return ''
 
-        return ''
+        return value if found else ''
 
     @encode_ascii()
     def __str__(self):
@@ -245,12 +462,37 @@ class Element(SeleniumObject):
         :rtype: str
         """
 
-        return self.outerHTML if self.exists() else ''
+        return self.outerHTML
 
     def __repr__(self):
 
         return '<{} name="{}" type="{}">'.format(self.__class__.__name__, *self.search_term)
 
+    def _acquire(self):
+        """Returns the Selenium WebElement to act upon, waiting for it up to the implicit wait
+
+        :return: Selenium WebElement
+        :rtype: WebElement
+        """
+
+        element = self.element()
+        timeout = self.runtime.implicit_wait
+
+        if element is None and timeout > 0 and self._wait_for_probe(['exists', [self.locator()]], bool, timeout):
+            element = self.element()
+
+        return element
+
+    def all(self):
+        """Returns every element matching this element's selector
+
+        :return: Collection of matching elements
+        :rtype: ElementCollection
+        """
+
+        return ElementCollection(self.driver, *self.search_term, within=self.within, name_attr=self._name_attr,
+                                 type_attr=self._type_attr)
+
     def angular_scope(self, attribute):
         """Returns an attribute from the angular scope
 
@@ -258,15 +500,11 @@ class Element(SeleniumObject):
         :return:
         """
 
-        if self.exists():
-
-            try:
-
-                return self.driver.execute_script('return angular.element(arguments[0]).scope().'
-                                                  '{}'.format(str(attribute)), self.element())
+        try:
+            return self.runtime.call('scope', self.locator(), str(attribute))
 
-            except (TypeError, WebDriverException):
-                pass
+        except WebDriverException:
+            pass
 
     def blur(self):
         """Simulate moving the cursor out of focus of this element.
@@ -274,20 +512,24 @@ class Element(SeleniumObject):
         :return:
         """
 
-        return self.driver.execute_script('arguments[0].blur();', self.element()) if self.is_displayed() else None
+        return self.runtime.call('blur', self.locator())
 
     @encode_ascii()
     def css_property(self, prop):
         """Return the value of a CSS property for the element
 
-        .. warning:: value_of_css_property does not work with Firefox
+        .. note:: The value is read from the element's computed style by script.
 
         :param str prop: CSS Property
         :return: Value of a CSS property
         :rtype: str
         """
 
-        return self.element().value_of_css_property(str(prop)) if self.exists() else None
+        try:
+            return self.runtime.call('css', self.locator(), str(prop))
+
+        except StaleElementReferenceException:
+            return None
 
     def drag(self, x_offset=0, y_offset=0):
         """Drag element x,y pixels from its center
@@ -297,10 +539,12 @@ class Element(SeleniumObject):
         :return:
         """
 
-        if self.exists() and isinstance(x_offset, int) and isinstance(y_offset, int):
+        element = self._acquire() if isinstance(x_offset, int) and isinstance(y_offset, int) else None
+
+        if element is not None:
 
             action = ActionChains(self.driver)
-            action.click_and_hold(self.element()).move_by_offset(x_offset, y_offset).release().perform()
+            action.click_and_hold(element).move_by_offset(x_offset, y_offset).release().perform()
             return True
 
         return False
@@ -317,13 +561,12 @@ class Element(SeleniumObject):
             return self.search_term[1]
 
         # If the search term is a valid term
-        elif self.search_term[0] in ('class name', 'css selector', 'id', 'link text',
-                                     'name', 'partial link text', 'tag name', 'xpath'):
+        elif self.search_term[0] in STRATEGIES:
 
             try:
 
                 # Locate element
-                element = self.driver.find_elements(*self.search_term)
+                element = self.find_elements()
 
             except InvalidSelectorException:
                 element = []
@@ -333,14 +576,87 @@ class Element(SeleniumObject):
 
         return None
 
+    def find_elements(self):
+        """Returns every Selenium WebElement matching the selector
+
+        .. note:: Absolute XPath selectors (each branch of a union) are made relative when resolved within a parent
+                  element.
+
+        :return: List of Selenium WebElements
+        :rtype: list
+        """
+
+        _by, path = self.search_term
+
+        if _by == IDENTIFIER:
+
+            if self.within is None:
+                return self.runtime.call('all', self._name_attr, path) or []
+
+            _by, path = 'css selector', '[{0}={1}]'.format(self._name_attr, css_string(path))
+
+        if self.within is None:
+            return self.driver.find_elements(_by, path)
+
+        if _by == 'xpath':
+            path = relative_xpath(path)
+
+        for attempt in (0, 1):
+
+            scope = self.within.handle(refresh=attempt > 0)
+
+            if not scope:
+                return []
+
+            try:
+                return scope.find_elements(_by, path)
+
+            except StaleElementReferenceException:
+                pass
+
+        return []
+
+    def handle(self, refresh=False):
+        """Returns the cached Selenium WebElement that child elements are resolved against
+
+        :param bool refresh: True, to locate the element again
+        :return: Selenium WebElement
+        :rtype: WebElement
+        """
+
+        if refresh or self._handle is None:
+            self._handle = self.element()
+
+        return self._handle
+
+    def locator(self):
+        """Returns the chain of selectors leading from the document to this element
+
+        :return: List of locator path lists [by, path]
+        :rtype: list
+        """
+
+        chain = self.within.locator() if self.within is not None else []
+
+        if self.search_term[0] == IDENTIFIER:
+            return chain + [[IDENTIFIER, [self._name_attr, self.search_term[1]]]]
+
+        return chain + [list(self.search_term)]
+
     def exists(self):
         """Returns True if element can be located by selenium
 
+        .. note:: The check is made by script, it never waits for the element to appear.
+
         :return: Returns True, if the element can be located
         :rtype: bool
         """
 
-        return True if self.element() else False
+        try:
+            return bool(self.runtime.call('exists', self.locator()))
+
+        except StaleElementReferenceException:
+            return False
 
     def focus(self):
         """Simulate element being in focus
@@ -348,7 +664,7 @@ class Element(SeleniumObject):
         :return:
         """
 
-        return self.driver.execute_script('arguments[0].focus();', self.element()) if self.is_displayed() else None
+        return self.runtime.call('focus', self.locator())
 
     def is_displayed(self):
         """Return True, if the element is visible
@@ -357,7 +673,11 @@ class Element(SeleniumObject):
         :rtype: bool
         """
 
-        return self.element().is_displayed() if self.exists() else False
+        try:
+            return bool(self.runtime.call('visible', self.locator()))
+
+        except StaleElementReferenceException:
+            return False
 
     def parent(self):
         """Returns the Selenium element for the current element
@@ -365,25 +685,16 @@ class Element(SeleniumObject):
         :return:
         """
 
-        xpath = join(self.search_term, ('xpath', '/parent::*'))
-        return Element(self.driver, xpath[0], xpath[1])
+        return Element(self.driver, By.XPATH, '/parent::*', within=self)
 
     def scroll_to(self):
         """Scroll to the location of the element
 
-        :return:
+        :return: True, if the element was found
+        :rtype: bool
         """
 
-        if self.exists():
-
-            element = self.element()
-
-            script = "var vHeight = Math.max(document.documentElement.clientHeight, window.innerHeight || 0);" \
-                     "var eTop = arguments[0].getBoundingClientRect().top;" \
-                     "window.scrollBy(0, eTop-(vHeight/2));"
-
-            # Scroll to Element
-            self.driver.execute_script(script, element)
+        return self.runtime.call('scroll', self.locator())
 
     @property
     @encode_ascii()
@@ -394,7 +705,11 @@ class Element(SeleniumObject):
         :rtype: str
         """
 
-        return self.element().tag_name if self.exists() else ''
+        try:
+            return self.runtime.call('tag', self.locator()) or ''
+
+        except StaleElementReferenceException:
+            return ''
 
     def wait_until_present(self, _by=None, path=None, timeout=30):
         """Wait until the element is present
@@ -409,8 +724,8 @@ class Element(SeleniumObject):
         if _by and path:
             return super(Element, self).wait_until_present(_by, path, timeout=timeout)
 
-        else:
-            return super(Element, self).wait_until_present(self.search_term[0], self.search_term[1], timeout=timeout)
+        # Waits on this element are evaluated by script, together with the driver's other pending waits
+        return self._wait_for_probe(['exists', [self.locator()]], bool, timeout)
 
     def wait_until_appears(self, _by=None, path=None, timeout=30):
         """Wait until the element appears
@@ -425,8 +740,8 @@ class Element(SeleniumObject):
         if _by and path:
             return super(Element, self).wait_until_appears(_by, path, timeout=timeout)
 
-        else:
-            return super(Element, self).wait_until_appears(self.search_term[0], self.search_term[1], timeout=timeout)
+        # Waits on this element are evaluated by script, together with the driver's other pending waits
+        return self._wait_for_probe(['visible', [self.locator()]], bool, timeout)
 
     def wait_until_disappears(self, _by=None, path=None, timeout=30):
         """Wait until the element disappears
@@ -441,5 +756,150 @@ class Element(SeleniumObject):
         if _by and path:
             return super(Element, self).wait_until_disappears(_by, path, timeout=timeout)
 
-        else:
-            return super(Element, self).wait_until_disappears(self.search_term[0], self.search_term[1], timeout=timeout)
+        # Waits on this element are evaluated by script, together with the driver's other pending waits
+        return self._wait_for_probe(['visible', [self.locator()]], lambda visible: not visible, timeout)
+
+
+class ElementCollection(Element):
+    """The ElementCollection implementation
+
+    Every element matching a selector. Each operation runs over all members in a single browser call.
+
+        **Example Use:**
+
+        .. code-block:: python
+
+            from selenium.webdriver import Chrome
+            from sampyl import App
+            from sampyl.core.element import ElementCollection
+
+            wd = webdriver.Chrome('/path/to/chromedriver')
+            app = App(wd, "http://someurl.com/path")
+
+            links = ElementCollection(wd, 'css selector', 'nav a')
+
+            # Returns the text of every visible link
+            links.filter(visible=True).texts()
+
+    """
+
+    def __init__(self, web_driver, _by=By.XPATH, path=None, within=None, filters=None, **kwargs):
+        """Collection of Selenium elements
+
+        :param WebDriver web_driver: Selenium webdriver
+        :param str _by: By selector
+        :param str path: selection value
+        :param Element within: Parent element, the selector is resolved relative to it
+        :param list filters: Filters applied to the matching elements
+        :return:
+        """
+
+        super(ElementCollection, self).__init__(web_driver, _by, path, within=within, **kwargs)
+
+        self.filters = list(filters) if isinstance(filters, (list, tuple)) else []
+
+    def __getitem__(self, index):
+
+        return Element(self.driver, 'element', self.elements()[index])
+
+    def __iter__(self):
+
+        for element in self.elements():
+            yield Element(self.driver, 'element', element)
+
+    def __len__(self):
+
+        return self._collect('count') or 0
+
+    def __repr__(self):
+
+        return '<{} name="{}" type="{}" filters="{}">'.format(self.__class__.__name__, self.search_term[0],
+                                                             self.search_term[1], self.filters)
+
+    def _collect(self, operation, argument=None):
+        """Run an operation over every member
+
+        :param str operation: Collection operation
+        :param argument: Operation argument
+        :return: Operation result
+        """
+
+        return self.runtime.call('collect', self.locator(), self.filters, operation, argument)
+
+    def attributes(self, attribute):
+        """Returns an attribute of every member
+
+        :param str attribute: Element attribute
+        :return: List of attribute values, None where the attribute is missing
+        :rtype: list
+        """
+
+        return [value.encode('ascii', 'ignore') if isinstance(value, basestring) else value
+                for value in self._collect('attributes', str(attribute)) or []]
+
+    def click_all(self):
+        """Click every member
+
+        .. note:: Members are clicked through the DOM rather than with native input events.
+
+        :return: Number of elements clicked
+        :rtype: int
+        """
+
+        return self._collect('click') or 0
+
+    def elements(self):
+        """Returns every member
+
+        :return: List of Selenium WebElements
+        :rtype: list
+        """
+
+        return self._collect('elements') or []
+
+    def filter(self, visible=None, text=None, contains=None, attribute=None, value=None):
+        """Returns a collection narrowed down to the members matching every criteria given
+
+        :param bool visible: True, to keep visible members, False to keep hidden members
+        :param str text: Exact text content
+        :param str contains: Partial text content
+        :param str attribute: Attribute the members must have
+        :param str value: Value the attribute must have
+        :return: Filtered collection
+        :rtype: ElementCollection
+        """
+
+        filters = list(self.filters)
+
+        if visible is not None:
+            filters.append(['visible', bool(visible)])
+
+        if text is not None:
+            filters.append(['text', text])
+
+        if contains is not None:
+            filters.append(['contains', contains])
+
+        if attribute is not None:
+            filters.append(['attribute', attribute, value])
+
+        return ElementCollection(self.driver, *self.search_term, within=self.within, filters=filters,
+                                 name_attr=self._name_attr, type_attr=self._type_attr)
+
+    def texts(self):
+        """Returns the text within every member
+
+        :return: List of text
+        :rtype: list
+        """
+
+        return [text.encode('ascii', 'ignore') for text in self._collect('texts') or []]
+
+    def visible(self):
+        """Returns whether each member is visible
+
+        :return: List of booleans
+        :rtype: list
+        """
+
+        return self._collect('visible') or []
@@ -6,14 +6,42 @@
 """
 
 # pylint: disable=line-too-long
+from sampyl.core.batch import batchable
+from sampyl.core.deadline import active_deadline
 from sampyl.core.shortcuts import encode_ascii
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support.ui import Select as SeleniumSelect
-from selenium.common.exceptions import ElementNotVisibleException, WebDriverException, NoSuchElementException
+from selenium.common.exceptions import WebDriverException, NoSuchElementException
 from selenium.webdriver.common.action_chains import ActionChains
 
-__all__ = ['ClickMixin', 'InputMixin', 'SelectMixin', 'SelectiveMixin', 'TextMixin']
+__all__ = ['ClickMixin', 'InteractionError', 'InputMixin', 'SelectMixin', 'SelectiveMixin', 'TextMixin', 'ToggleMixin']
+
+
+class InteractionError(WebDriverException):
+    """The InteractionError implementation
+
+    Raised when an element cannot receive a pointer action. The reason is one of missing, hidden, disabled,
+    offscreen, obscured or intercepted.
+
+    """
+
+    def __init__(self, action, element, reason, detail=None):
+
+        self.action = action
+        self.element = element
+        self.reason = reason
+        self.detail = detail
+
+        msg = '{} failed on {}: element is {}'.format(action, repr(element), reason)
+
+        if reason == 'obscured' and detail:
+            msg = '{} by <{}>'.format(msg, detail)
+
+        elif detail:
+            msg = '{} ({})'.format(msg, detail)
+
+        super(InteractionError, self).__init__(msg)
 
 
 class ElementMixin(object):
@@ -26,6 +54,15 @@ class ElementMixin(object):
     def __getattr__(self, item):
         return item
 
+    # This function will be overridden by the base class this extends
+    def _acquire(self):
+        """Returns the element to act upon
+
+        :return:
+        """
+
+        return self.element()
+
     # This function will be overridden by the base class this extends
     def blur(self):
         """Simulate moving out of focus
@@ -79,82 +116,97 @@ class ClickMixin(ElementMixin):
     """The ClickMixin Implementation
     """
 
-    def click(self):
-        """Click element
+    def _pointer(self, action, enabled=True):
+        """Returns the element once it is ready to receive pointer events
 
-        :return:
+        Visibility, scrolling (only when the element is outside the viewport) and the hit test are performed in a
+        single script.
+
+        :param str action: Action name, used in the error message
+        :param bool enabled: True, if the element must also be enabled
+        :return: Selenium WebElement
+        :rtype: WebElement
+        :raises InteractionError: If the element cannot receive pointer events
         """
 
-        if self.exists():
+        status, element, detail = self.runtime.call('pointer', self.locator(), enabled)
 
-            element = self.element()
+        # Only a missing element is waited for, up to the implicit wait
+        if status == 'missing' and self.runtime.implicit_wait > 0 and \
+                self._wait_for_probe(['exists', [self.locator()]], bool, self.runtime.implicit_wait):
+            status, element, detail = self.runtime.call('pointer', self.locator(), enabled)
 
-            try:
+        if status != 'ok':
+            raise InteractionError(action, self, status, detail)
 
-                if not element.is_displayed():
-                    self.scroll_to()
+        return element
 
-                element.click()
-                return True
+    def _perform(self, action, perform, enabled=True):
+        """Perform a native pointer action, checking the element once more if the driver rejects it
 
-            except (ElementNotVisibleException, WebDriverException):
+        :param str action: Action name, used in the error message
+        :param func perform: Function performing the action on a Selenium WebElement
+        :param bool enabled: True, if the element must also be enabled
+        :return: True, if the action was performed
+        :rtype: bool
+        :raises InteractionError: If the element cannot receive pointer events
+        """
 
-                self.scroll_to()
+        try:
+            perform(self._pointer(action, enabled))
 
-                try:
-                    element.click()
+        except InteractionError:
+            raise
 
-                except (ElementNotVisibleException, WebDriverException):
-                    pass
+        except WebDriverException:
 
-        return False
+            deadline = active_deadline(self.driver)
 
-    def double_click(self):
-        """Double-click element
+            if deadline is not None:
+                deadline.check(action)
 
-        :return:
-        """
+            # The page may have moved between the check and the action (animations, sticky headers)
+            element = self._pointer(action, enabled)
 
-        if self.exists():
+            try:
+                perform(element)
 
-            element = self.element()
+            except WebDriverException as error:
+                raise InteractionError(action, self, 'intercepted', error.msg)
 
-            try:
+        return True
 
-                if not element.is_displayed():
-                    self.scroll_to()
+    @batchable('click')
+    def click(self):
+        """Click element
 
-                return ActionChains(self.driver).double_click(element).perform()
+        :return: True, if the element was clicked
+        :rtype: bool
+        :raises InteractionError: If the element is missing, hidden, disabled or covered by another element
+        """
 
-            except (ElementNotVisibleException, WebDriverException):
+        return self._perform('click', lambda element: element.click())
 
-                self.scroll_to()
+    def double_click(self):
+        """Double-click element
 
-                try:
-                    element.click()
+        :return: True, if the element was double-clicked
+        :rtype: bool
+        :raises InteractionError: If the element is missing, hidden, disabled or covered by another element
+        """
 
-                except (ElementNotVisibleException, WebDriverException):
-                    pass
+        return self._perform('double_click', lambda element: ActionChains(self.driver).double_click(element).perform())
 
     def hover(self):
         """Simulate hovering over element
 
-        :return:
+        :return: True, if the pointer was moved over the element
+        :rtype: bool
+        :raises InteractionError: If the element is missing, hidden or covered by another element
         """
 
-        if self.exists():
-
-            element = self.element()
-
-            try:
-
-                if not element.is_displayed():
-                    self.scroll_to()
-
-                return ActionChains(self.driver).move_to_element(element).perform()
-
-            except (ElementNotVisibleException, WebDriverException):
-                pass
+        return self._perform('hover', lambda element: ActionChains(self.driver).move_to_element(element).perform(),
+                             enabled=False)
 
 
 class InputMixin(ElementMixin):
@@ -164,6 +216,7 @@ class InputMixin(ElementMixin):
     def __str__(self):
         return self.value
 
+    @batchable('input')
     def input(self, *args, **kwargs):
         """
 
@@ -173,9 +226,9 @@ class InputMixin(ElementMixin):
         :rtype: bool
         """
 
-        if self.exists():
+        element = self._acquire()
 
-            element = self.element()
+        if element:
 
             if 'clear' in kwargs:
                 element.clear()
@@ -195,13 +248,14 @@ class InputMixin(ElementMixin):
         :rtype: str
         """
 
-        return self.element().get_attribute('value') if self.exists() else ''
+        value = self.runtime.call('value', self.locator())
+
+        return value if value is not None else ''
 
     @value.setter
     def value(self, value):
 
-        if self.exists():
-            self.driver.execute_script('arguments[0].value = arguments[1]', self.element(), str(value))
+        self.runtime.call('setValue', self.locator(), str(value))
 
 
 class SelectMixin(ElementMixin):
@@ -232,13 +286,12 @@ class SelectMixin(ElementMixin):
         :rtype: SeleniumSelect
         """
 
-        if self.exists():
-
-            element = self.element()
+        element = self._acquire()
 
-            if element.tag_name == u'select':
-                return SeleniumSelect(element)
+        if element and element.tag_name == u'select':
+            return SeleniumSelect(element)
 
+    @batchable('deselect_all')
     def deselect_all(self):
         """Deselect all selected options
 
@@ -255,6 +308,7 @@ class SelectMixin(ElementMixin):
 
         return False
 
+    @batchable('deselect_by_index')
     def deselect_by_index(self, option):
         """Deselect option by index [i]
 
@@ -278,6 +332,7 @@ class SelectMixin(ElementMixin):
 
         return False
 
+    @batchable('deselect_by_text')
     def deselect_by_text(self, option):
         """Deselect option by display text
 
@@ -300,6 +355,7 @@ class SelectMixin(ElementMixin):
 
         return False
 
+    @batchable('deselect_by_value')
     def deselect_by_value(self, option):
         """Deselect option by option value
 
@@ -372,6 +428,7 @@ class SelectMixin(ElementMixin):
 
         return options
 
+    @batchable('select_by_index')
     def select_by_index(self, option):
         """Select option at index [i]
 
@@ -395,6 +452,7 @@ class SelectMixin(ElementMixin):
 
         return False
 
+    @batchable('select_by_text')
     def select_by_text(self, option):
         """Select option by display text
 
@@ -417,6 +475,7 @@ class SelectMixin(ElementMixin):
 
         return False
 
+    @batchable('select_by_value')
     def select_by_value(self, option):
         """Select option by option value
 
@@ -444,21 +503,33 @@ class SelectiveMixin(ClickMixin):
     """The SelectiveMixin implementation
     """
 
+    @batchable('deselect')
     def deselect(self):
         """Deselect this element
 
-        :return:
+        :return: True, once the element is deselected (it may have been already)
+        :rtype: bool
+        :raises InteractionError: If the element cannot be clicked
         """
 
-        return self.click() if self.selected() else None
+        if self.selected():
+            self.click()
+
+        return True
 
+    @batchable('select')
     def select(self):
         """Select this element
 
-        :return:
+        :return: True, once the element is selected (it may have been already)
+        :rtype: bool
+        :raises InteractionError: If the element cannot be clicked
         """
 
-        return self.click() if not self.selected() else None
+        if not self.selected():
+            self.click()
+
+        return True
 
     def selected(self):
         """Return True if element is selected
@@ -485,7 +556,7 @@ class TextMixin(ElementMixin):
         :rtype: str
         """
 
-        return self.element().get_attribute('textContent') if self.exists() else ''
+        return self.textContent
 
     @encode_ascii(clean=True)
     def visible_text(self):
@@ -496,3 +567,73 @@ class TextMixin(ElementMixin):
         """
 
         return self.element().text if self.exists() else ''
+
+
+class ToggleMixin(ElementMixin):
+    """The ToggleMixin implementation
+
+    For structures showing and hiding a container with a toggle, both provided by the base class as _toggle and
+    _container.
+
+    """
+
+    def _transition(self, show, hover=False, timeout=30):
+        """Trigger the toggle and wait in the browser for the container to settle
+
+        The wait ends on the transitionend/animationend event or visibility change that leaves the container in the
+        requested state, once no transition is running on it anymore.
+
+        .. note:: The toggle is clicked or hovered natively, as a user would, the script only waits.
+
+        :param bool show: True, to show the container, False to hide it
+        :param bool hover: True, to hover over the toggle instead of clicking it
+        :param int timeout: Wait timeout in seconds
+        :return: True, if the container ended up in the requested state
+        :rtype: bool
+        :raises InteractionError: If the toggle cannot be clicked or hovered
+        """
+
+        container = self._container.locator()
+
+        # Already shown or hidden, only let a running transition finish
+        if self.runtime.call('visible', container) != show:
+
+            if hover:
+                self._toggle.hover()
+
+            else:
+                self._toggle.click()
+
+        status, settled = self.runtime.call_async('transition', timeout, container, show)
+
+        deadline = active_deadline(self.driver)
+
+        # A transition cut short by the deadline raises rather than reporting the container's state
+        if status == 'timeout' and deadline is not None:
+            deadline.check('expand' if show else 'collapse')
+
+        return settled
+
+    def collapse(self, hover=False, timeout=30):
+        """Hide the container
+
+        :param bool hover: True, to hover over the toggle instead of clicking it
+        :param int timeout: Wait timeout in seconds
+        :return: True, if the container is hidden
+        :rtype: bool
+        :raises InteractionError: If the toggle cannot be clicked or hovered
+        """
+
+        return self._transition(False, hover=hover, timeout=timeout)
+
+    def expand(self, hover=False, timeout=30):
+        """Show the container
+
+        :param bool hover: True, to hover over the toggle instead of clicking it
+        :param int timeout: Wait timeout in seconds
+        :return: True, if the container is shown
+        :rtype: bool
+        :raises InteractionError: If the toggle cannot be clicked or hovered
+        """
+
+        return self._transition(True, hover=hover, timeout=timeout)
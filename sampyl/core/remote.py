@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""sampyl.core.remote
+
+.. codeauthor:: John Lane <jlane@fanthreesixty.com>
+
+"""
+
+# pylint: disable=line-too-long
+import base64
+import httplib
+import select
+import socket
+import threading
+import time
+from Queue import Queue, Empty, Full
+from urlparse import urlparse
+from sampyl.core.timing import Timeline
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote import utils
+from selenium.webdriver.remote.errorhandler import ErrorCode
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+__all__ = ['PooledRemoteConnection']
+
+DEFAULT_POOL_SIZE = 4
+
+# Seconds to wait for a pooled connection when every connection is busy and no socket timeout is set
+ACQUIRE_TIMEOUT = 60
+
+
+class PooledRemoteConnection(RemoteConnection):
+    """The PooledRemoteConnection implementation
+
+    A command executor that keeps a pool of persistent HTTP connections open to the WebDriver endpoint,
+    so commands are not paying for a new TCP (and TLS) handshake each time. Every command is timed.
+
+        **Example Use:**
+
+        .. code-block:: python
+
+            from selenium.webdriver import Remote
+            from sampyl.core.remote import PooledRemoteConnection
+
+            executor = PooledRemoteConnection('http://grid:4444/wd/hub', pool_size=8)
+            wd = Remote(command_executor=executor, desired_capabilities={'browserName': 'chrome'})
+
+    """
+
+    def __init__(self, remote_server_addr, pool_size=DEFAULT_POOL_SIZE, timeout=None, resolve_ip=True,
+                 timeline=None):
+        """Pooled WebDriver command executor
+
+        :param str remote_server_addr: WebDriver endpoint url
+        :param int pool_size: Maximum number of open connections
+        :param float timeout: Socket timeout in seconds
+        :param bool resolve_ip: True, to resolve the endpoint hostname once up front
+        :param Timeline timeline: Timeline to record command timings on
+        :return:
+        """
+
+        super(PooledRemoteConnection, self).__init__(remote_server_addr, keep_alive=False, resolve_ip=resolve_ip)
+
+        self.keep_alive = True
+        self.pool_size = pool_size if isinstance(pool_size, int) and pool_size > 0 else DEFAULT_POOL_SIZE
+        self.timeout = timeout if isinstance(timeout, (int, float)) else self.get_timeout()
+        self.timeline = timeline if isinstance(timeline, Timeline) else Timeline()
+
+        parsed_url = urlparse(self._url)
+
+        self._connection_class = httplib.HTTPSConnection if parsed_url.scheme == 'https' else httplib.HTTPConnection
+        self._host = parsed_url.hostname
+        self._port = parsed_url.port
+        self._auth = None
+
+        if parsed_url.username:
+            self._auth = 'Basic %s' % base64.standard_b64encode('%s:%s' % (parsed_url.username,
+                                                                           parsed_url.password or '')).strip()
+
+        self._pool = Queue(maxsize=self.pool_size)
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def _acquire(self):
+        """Returns an idle pooled connection, opening a new one while under the pool size
+
+        .. note:: Idle connections the server or a proxy closed in the meantime are discarded rather than reused.
+
+        :return: Connection and True, if the connection has been used before
+        :rtype: tuple
+        :raises WebDriverException: If every connection stays busy for too long
+        """
+
+        started = time.time()
+        timeout = self.timeout if self.timeout is not None else ACQUIRE_TIMEOUT
+
+        while True:
+
+            try:
+                connection = self._pool.get_nowait()
+
+            except Empty:
+                connection = None
+
+            if connection is None:
+
+                with self._lock:
+
+                    opening = self.created < self.pool_size
+
+                    if opening:
+                        self.created += 1
+
+                if opening:
+                    return self._connect(), False
+
+                try:
+                    connection = self._pool.get(timeout=max(timeout - (time.time() - started), 0))
+
+                except Empty:
+                    raise WebDriverException('No connection to {} became available within {}s, {} in use'.format(
+                        self._url, timeout, self.pool_size))
+
+            if self._alive(connection):
+                return connection, True
+
+            self._discard(connection)
+
+    def _alive(self, connection):
+        """Returns True, if an idle connection is still open: the server sends nothing unrequested, a readable socket
+        was closed
+
+        :param httplib.HTTPConnection connection: Connection
+        :return: True, if the connection can be reused
+        :rtype: bool
+        """
+
+        if connection.sock is None:
+            return False
+
+        try:
+            return not select.select([connection.sock], [], [], 0)[0]
+
+        except (select.error, socket.error, ValueError):
+            return False
+
+    def _connect(self):
+        """Open a new connection to the endpoint, the caller has already counted it against the pool size
+
+        :return:
+        :rtype: httplib.HTTPConnection
+        """
+
+        if self.timeout is None:
+            connection = self._connection_class(self._host, self._port)
+
+        else:
+            connection = self._connection_class(self._host, self._port, timeout=self.timeout)
+
+        try:
+
+            # Headers and body are written separately, disable Nagle so the body is not held back
+            connection.connect()
+            connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        except (httplib.HTTPException, socket.error):
+            self._discard(connection)
+            raise
+
+        return connection
+
+    def _discard(self, connection):
+        """Close a connection and free its slot in the pool
+
+        :param httplib.HTTPConnection connection: Connection
+        :return:
+        """
+
+        connection.close()
+
+        with self._lock:
+            self.created -= 1
+
+    def _release(self, connection):
+        """Return a connection to the pool
+
+        :param httplib.HTTPConnection connection: Connection
+        :return:
+        """
+
+        try:
+            self._pool.put_nowait(connection)
+
+        except Full:
+            self._discard(connection)
+
+    def _send(self, method, path, body, headers):
+        """Send a request over a pooled connection
+
+        A reused connection may have been closed by the server or a proxy while idle. When sending the request fails
+        on one, the request never reached the server and is sent once more over a fresh connection. Failures after
+        the request was written are raised, commands such as clicks must not run twice.
+
+        :param str method: HTTP method
+        :param str path: Request path
+        :param str body: Request body
+        :param dict headers: Request headers
+        :return: Status code, response headers and response body
+        :rtype: tuple
+        """
+
+        connection, reused = self._acquire()
+
+        try:
+            connection.request(method, path, body, headers)
+
+        except (httplib.HTTPException, socket.error):
+
+            self._discard(connection)
+
+            if not reused:
+                raise
+
+            with self._lock:
+                self.created += 1
+
+            connection = self._connect()
+
+            try:
+                connection.request(method, path, body, headers)
+
+            except (httplib.HTTPException, socket.error):
+                self._discard(connection)
+                raise
+
+        try:
+            response = connection.getresponse()
+            data = response.read()
+
+        except (httplib.HTTPException, socket.error):
+            self._discard(connection)
+            raise
+
+        if response.will_close:
+            self._discard(connection)
+
+        else:
+            self._release(connection)
+
+        return response.status, response.getheader, data
+
+    def _request(self, method, url, body=None):
+        """Send an HTTP request to the remote server
+
+        :param str method: HTTP method
+        :param str url: Request url
+        :param str body: Request body, ignored unless method is POST or PUT
+        :return: Parsed JSON response
+        :rtype: dict
+        """
+
+        parsed_url = urlparse(url)
+        path = '%s?%s' % (parsed_url.path, parsed_url.query) if parsed_url.query else parsed_url.path
+
+        headers = {'Connection': 'keep-alive',
+                   'User-Agent': 'Python http auth',
+                   'Content-type': 'application/json;charset="UTF-8"',
+                   'Accept': 'application/json'}
+
+        if self._auth:
+            headers['Authorization'] = self._auth
+
+        if body and method not in ('POST', 'PUT'):
+            body = None
+
+        status, header, data = self._send(method, path, body, headers)
+
+        if 300 <= status < 304:
+            return self._request('GET', header('location'))
+
+        body = data.decode('utf-8').replace('\x00', '').strip()
+
+        if 399 < status <= 500:
+            return {'status': status, 'value': body}
+
+        if any([part.strip().startswith('image/png') for part in (header('Content-Type') or '').split(';')]):
+            return {'status': 0, 'value': body}
+
+        try:
+            data = utils.load_json(body)
+
+        except ValueError:
+            return {'status': ErrorCode.SUCCESS if 199 < status < 300 else ErrorCode.UNKNOWN_ERROR, 'value': body}
+
+        if not isinstance(data, dict):
+            raise ValueError('Invalid server response body: %s' % body)
+
+        if 'value' not in data:
+            data['value'] = None
+
+        return data
+
+    def close(self):
+        """Close every idle connection in the pool
+
+        :return:
+        """
+
+        while True:
+
+            try:
+                self._discard(self._pool.get_nowait())
+
+            except Empty:
+                break
+
+    def execute(self, command, params):
+        """Send a command to the remote server and record how long it took
+
+        :param str command: WebDriver command
+        :param dict params: Command parameters
+        :return: Parsed JSON response
+        :rtype: dict
+        """
+
+        with self.timeline.measure(command, category='command'):
+            return super(PooledRemoteConnection, self).execute(command, params)
@@ -0,0 +1,947 @@
+# -*- coding: utf-8 -*-
+"""sampyl.core.runtime
+
+.. codeauthor:: John Lane <jlane@fanthreesixty.com>
+
+"""
+
+# pylint: disable=line-too-long
+import threading
+import weakref
+from sampyl.core.commands import READ_FUNCTIONS, get_queue
+from sampyl.core.deadline import active_deadline
+
+__all__ = ['Runtime', 'get_runtime']
+
+RUNTIME_VERSION = 23
+
+NOT_INJECTED = '__sampyl_missing__'
+
+# Element states reported by the browser-side index
+MISSING, PRESENT, VISIBLE = 0, 1, 2
+
+# Functions take compact array arguments, elements are passed as locator chains: [[by, path], ...]
+RUNTIME_SCRIPT = """
+(function (version) {
+    if (window.__sampyl && window.__sampyl.version === version) { return; }
+    var indexes = {}, observe = !!window.MutationObserver, has = Object.prototype.hasOwnProperty;
+    function build(attr, idx) {
+        var nodes = document.querySelectorAll('[' + attr + ']'), map = {}, order = [];
+        for (var i = 0; i < nodes.length; i++) {
+            var id = nodes[i].getAttribute(attr);
+            if (!has.call(map, id)) { map[id] = []; }
+            map[id].push(nodes[i]);
+            order.push(id);
+        }
+        idx.map = map;
+        idx.order = order;
+    }
+    // True when one of the nodes carries the attribute or contains an element that does
+    function carries(attr, nodes) {
+        for (var i = 0; i < nodes.length; i++) {
+            if (nodes[i].nodeType === 1 && (nodes[i].hasAttribute(attr) || nodes[i].querySelector('[' + attr + ']'))) {
+                return true;
+            }
+        }
+        return false;
+    }
+    function index(attr) {
+        var idx = indexes[attr];
+        if (!idx) {
+            idx = indexes[attr] = {map: null, order: null};
+            if (observe) {
+                // Only changes to identified elements drop the index, pages updating other content keep it
+                new MutationObserver(function (mutations) {
+                    for (var i = 0; i < mutations.length && idx.map; i++) {
+                        var m = mutations[i];
+                        if (m.type === 'attributes' || carries(attr, m.addedNodes) || carries(attr, m.removedNodes)) {
+                            idx.map = null;
+                        }
+                    }
+                }).observe(document, {childList: true, subtree: true, attributes: true, attributeFilter: [attr]});
+            }
+        }
+        if (!idx.map || !observe) { build(attr, idx); }
+        return idx;
+    }
+    function all(attr, id) {
+        var idx = index(attr), found = has.call(idx.map, id) ? idx.map[id] : [];
+        for (var i = 0; i < found.length; i++) {
+            if (!document.documentElement.contains(found[i]) || found[i].getAttribute(attr) !== id) {
+                idx.map = null;
+                idx = index(attr);
+                return has.call(idx.map, id) ? idx.map[id].slice() : [];
+            }
+        }
+        return found.slice();
+    }
+    function first(attr, id, partial) {
+        if (!partial) { return all(attr, id)[0] || null; }
+        var idx = index(attr);
+        for (var i = 0; i < idx.order.length; i++) {
+            if (idx.order[i].indexOf(id) !== -1) { return all(attr, idx.order[i])[0] || null; }
+        }
+        return null;
+    }
+    function quote(value) { return '"' + String(value).replace(/(["\\\\])/g, '\\\\$1').replace(/\\n/g, '\\\\a ') + '"'; }
+    // Every absolute branch of a union is made relative to the element searched within
+    function relative(path) {
+        var branches = [], depth = 0, quoting = null, start = 0, i, c;
+        for (i = 0; i < path.length; i++) {
+            c = path.charAt(i);
+            if (quoting) { if (c === quoting) { quoting = null; } }
+            else if (c === '"' || c === "'") { quoting = c; }
+            else if (c === '[' || c === '(') { depth++; }
+            else if (c === ']' || c === ')') { depth--; }
+            else if (c === '|' && !depth) { branches.push(path.slice(start, i)); start = i + 1; }
+        }
+        branches.push(path.slice(start));
+        for (i = 0; i < branches.length; i++) {
+            var branch = branches[i].replace(/^\\s+|\\s+$/g, ''), step = branch.match(/^\\(*/)[0].length;
+            branches[i] = branch.charAt(step) === '/' ? branch.slice(0, step) + '.' + branch.slice(step) : branch;
+        }
+        return branches.join('|');
+    }
+    function find(root, term) {
+        var by = term[0], value = term[1], found = [], i;
+        if (by === 'element') { return value ? [value] : []; }
+        if (by === 'identifier') {
+            if (root === document) { return all(value[0], value[1]); }
+            return Array.prototype.slice.call(root.querySelectorAll('[' + value[0] + '=' + quote(value[1]) + ']'));
+        }
+        if (by === 'xpath') {
+            if (root !== document) { value = relative(value); }
+            var snapshot = document.evaluate(value, root, null, 7, null);
+            for (i = 0; i < snapshot.snapshotLength; i++) { found.push(snapshot.snapshotItem(i)); }
+            return found;
+        }
+        if (by === 'link text' || by === 'partial link text') {
+            var links = root.querySelectorAll('a');
+            for (i = 0; i < links.length; i++) {
+                var text = (links[i].innerText || links[i].textContent || '').replace(/^\\s+|\\s+$/g, '');
+                if (by === 'link text' ? text === value : text.indexOf(value) !== -1) { found.push(links[i]); }
+            }
+            return found;
+        }
+        var quoted = '"' + String(value).replace(/(["\\\\])/g, '\\\\$1') + '"';
+        var css = {'css selector': value, 'tag name': value, 'id': '[id=' + quoted + ']',
+                   'name': '[name=' + quoted + ']', 'class name': '.' + value}[by];
+        return css ? Array.prototype.slice.call(root.querySelectorAll(css)) : [];
+    }
+    function locateAll(chain) {
+        var root = document;
+        for (var i = 0; i < chain.length - 1; i++) {
+            root = find(root, chain[i])[0];
+            if (!root) { return []; }
+        }
+        return chain.length ? find(root, chain[chain.length - 1]) : [];
+    }
+    function locate(chain) { return locateAll(chain)[0] || null; }
+    function visible(el) {
+        if (!el || !document.documentElement.contains(el)) { return false; }
+        var style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.visibility === 'collapse') { return false; }
+        for (var node = el; node && node.nodeType === 1; node = node.parentNode) {
+            style = window.getComputedStyle(node);
+            if (style.display === 'none' || parseFloat(style.opacity) === 0) { return false; }
+        }
+        var rects = el.getClientRects();
+        for (var i = 0; i < rects.length; i++) {
+            if (rects[i].width > 0 || rects[i].height > 0) { return true; }
+        }
+        return false;
+    }
+    function fire(el, name) {
+        var evt = document.createEvent('HTMLEvents');
+        evt.initEvent(name, true, true);
+        el.dispatchEvent(evt);
+    }
+    function setValue(el, value) {
+        var desc = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+        if (desc && desc.set) { desc.set.call(el, value); } else { el.value = value; }
+    }
+    function optionText(option) { return option.text.replace(/\\s+/g, ' ').replace(/^\\s+|\\s+$/g, ''); }
+    function choose(el, match, selected) {
+        if (!el.options) { return false; }
+        var found = false;
+        for (var i = 0; i < el.options.length; i++) {
+            if (match(el.options[i])) {
+                el.options[i].selected = selected;
+                found = true;
+                if (!el.multiple) { break; }
+            }
+        }
+        if (found) { fire(el, 'input'); fire(el, 'change'); }
+        return found;
+    }
+    function matcher(kind, value) {
+        if (kind === 'index') { return function (o) { return o.index === value; }; }
+        if (kind === 'text') { return function (o) { return optionText(o) === value; }; }
+        if (kind === 'value') { return function (o) { return o.value === value; }; }
+        return function () { return true; };
+    }
+    var ops = {
+        click: function (el) { el.click(); return true; },
+        input: function (el, args) {
+            if (el.isContentEditable || (el.type || '').toLowerCase() === 'file') { throw 'native'; }
+            if (el.focus) { el.focus(); }
+            setValue(el, args[1] ? args[0] : (el.value || '') + args[0]);
+            fire(el, 'input'); fire(el, 'change');
+            return true;
+        },
+        select: function (el) { if (el.checked || el.selected) { return null; } el.click(); return true; },
+        deselect: function (el) { if (!(el.checked || el.selected)) { return null; } el.click(); return true; },
+        deselect_all: function (el) {
+            if (!el.multiple) { return false; }
+            choose(el, matcher(), false);
+            return true;
+        }
+    };
+    function cellValue(cell) {
+        var control = cell.querySelector('input, select, textarea');
+        if (control) {
+            var type = (control.type || '').toLowerCase();
+            if (type === 'checkbox' || type === 'radio') { return String(control.checked); }
+            if (control.tagName === 'SELECT') {
+                return control.selectedIndex < 0 ? '' : optionText(control.options[control.selectedIndex]);
+            }
+            return control.value;
+        }
+        return (cell.textContent || '').replace(/\s+/g, ' ').replace(/^\s+|\s+$/g, '');
+    }
+    function rowValues(row) {
+        var values = [];
+        for (var i = 0; row && i < row.cells.length; i++) { values.push(cellValue(row.cells[i])); }
+        return values;
+    }
+    function rowKey(row, values) {
+        var attrs = ['data-qa-key', 'aria-rowindex', 'data-index', 'data-row-index', 'data-id', 'data-key'];
+        for (var i = 0; i < attrs.length; i++) {
+            if (row.hasAttribute(attrs[i])) { return attrs[i] + ':' + row.getAttribute(attrs[i]); }
+        }
+        return values.join('\u0001');
+    }
+    // Looked up within the list and its container only, never elsewhere on the page
+    function nextButton(el, next) {
+        var button = el.querySelector(next) || (el.parentElement && el.parentElement.querySelector(next));
+        if (!button || button.disabled || button.getAttribute('aria-disabled') === 'true' ||
+                (button.closest && button.closest('.disabled'))) { return null; }
+        return button;
+    }
+    function scrollBox(el) {
+        return el.scrollHeight > el.clientHeight ? el : (document.scrollingElement || document.documentElement);
+    }
+    function viewport(el, box) { return box === el ? el.clientHeight : window.innerHeight; }
+    function atEnd(el, paginate, next) {
+        if (paginate) { return !nextButton(el, next); }
+        var box = scrollBox(el);
+        return box.scrollTop + viewport(el, box) >= box.scrollHeight - 1;
+    }
+    function advance(el, paginate, next) {
+        if (paginate) {
+            var button = nextButton(el, next);
+            if (button) { button.click(); }
+            return !!button;
+        }
+        var box = scrollBox(el), before = box.scrollTop;
+        box.scrollTop = before + viewport(el, box);
+        return box.scrollTop > before;
+    }
+    function describe(el) {
+        var name = el.tagName.toLowerCase(), cls = trim(typeof el.className === 'string' ? el.className : '');
+        return name + (el.id ? '#' + el.id : '') + (cls ? '.' + cls.split(/\s+/).join('.') : '');
+    }
+    function trim(text) { return (text || '').replace(/^\s+|\s+$/g, ''); }
+    function animating(el) {
+        if (!el || !el.getAnimations) { return false; }
+        var running = el.getAnimations({subtree: true});
+        for (var i = 0; i < running.length; i++) {
+            var timing = running[i].effect ? running[i].effect.getComputedTiming() : {};
+            if (running[i].playState === 'running' && timing.endTime !== Infinity) { return true; }
+        }
+        return false;
+    }
+    // Counts in-flight XHR and fetch requests and pending timers, kept on window so it is only installed once
+    function instrument() {
+        if (window.__sampyl_activity) { return window.__sampyl_activity; }
+        var state = {requests: 0, timers: {}, setTimeout: window.setTimeout, clearTimeout: window.clearTimeout};
+        window.__sampyl_activity = state;
+        function settle() { state.requests = Math.max(0, state.requests - 1); }
+        if (window.XMLHttpRequest) {
+            var send = XMLHttpRequest.prototype.send;
+            XMLHttpRequest.prototype.send = function () {
+                var xhr = this, counted = true;
+                state.requests++;
+                xhr.addEventListener('loadend', function () { if (counted) { counted = false; settle(); } });
+                try { return send.apply(xhr, arguments); } catch (e) { counted = false; settle(); throw e; }
+            };
+        }
+        if (window.fetch) {
+            var fetch = window.fetch;
+            window.fetch = function () {
+                state.requests++;
+                try {
+                    return fetch.apply(this, arguments).then(function (r) { settle(); return r; },
+                        function (e) { settle(); throw e; });
+                } catch (e) { settle(); throw e; }
+            };
+        }
+        window.setTimeout = function (callback, delay) {
+            var args = Array.prototype.slice.call(arguments), id = null;
+            if (typeof callback === 'function') {
+                args[0] = function () { delete state.timers[id]; return callback.apply(this, arguments); };
+            }
+            id = state.setTimeout.apply(window, args);
+            state.timers[id] = delay || 0;
+            return id;
+        };
+        window.clearTimeout = function (id) { delete state.timers[id]; return state.clearTimeout.apply(window, arguments); };
+        return state;
+    }
+    // Reasons the page is busy, timers longer than maxTimer (polling, session keep-alive) are ignored
+    function activity(maxTimer) {
+        var state = instrument(), busy = [], timers = 0, id;
+        if (document.readyState !== 'complete') { busy.push('document'); }
+        if (state.requests) { busy.push('requests:' + state.requests); }
+        for (id in state.timers) { if (has.call(state.timers, id) && state.timers[id] <= maxTimer) { timers++; } }
+        if (timers) { busy.push('timers:' + timers); }
+        try {
+            var injector = window.angular && window.angular.element(document.body).injector();
+            if (injector && injector.has('$http') && injector.get('$http').pendingRequests.length) {
+                busy.push('angular:$http');
+            }
+        } catch (e) {}
+        if (window.getAllAngularTestabilities) {
+            var testabilities = window.getAllAngularTestabilities();
+            for (var i = 0; i < testabilities.length; i++) {
+                if (!testabilities[i].isStable()) { busy.push('angular:unstable'); break; }
+            }
+        }
+        return busy;
+    }
+    function matches(el, selector) {
+        var match = el.matches || el.msMatchesSelector || el.webkitMatchesSelector;
+        return !!match && match.call(el, selector);
+    }
+    function menu(root) {
+        var toggles = '.dropdown-toggle, [ng-mouseover], [ng-click]',
+            menus = 'div.dropdown-menu, ul.dropdown-menu, div.tree, ul.tree, div[ng-show], ul[ng-show]';
+        var toggle = root && (matches(root, toggles) ? root : root.querySelector(toggles)), container = null;
+        if (!toggle) { return null; }
+        for (var node = toggle.nextElementSibling; node && !container; node = node.nextElementSibling) {
+            if (matches(node, menus)) { container = node; }
+        }
+        container = container || (matches(toggle, menus) ? toggle : toggle.querySelector(menus));
+        return container ? {toggle: toggle, container: container} : null;
+    }
+    function menuItems(container) {
+        var items = container.querySelectorAll('a, [role="menuitem"], [role="option"]');
+        return Array.prototype.slice.call(items.length ? items : container.querySelectorAll('li'));
+    }
+    function labelText(control) {
+        var labels = control.labels ? Array.prototype.slice.call(control.labels) : [], texts = [], i;
+        if (!control.labels) {
+            if (control.id) {
+                labels = Array.prototype.slice.call(document.querySelectorAll('label[for="' + control.id + '"]'));
+            }
+            for (var node = control.parentNode; node && node.nodeType === 1; node = node.parentNode) {
+                if (node.tagName === 'LABEL' && labels.indexOf(node) === -1) { labels.push(node); break; }
+            }
+        }
+        for (i = 0; i < labels.length; i++) {
+            if (!visible(labels[i])) { continue; }
+            var copy = labels[i].cloneNode(true), nested = copy.querySelectorAll('input, select, textarea, button');
+            for (var j = 0; j < nested.length; j++) { nested[j].parentNode.removeChild(nested[j]); }
+            texts.push(trim(copy.textContent.replace(/\s+/g, ' ')));
+        }
+        return texts.join(' ');
+    }
+    function keep(el, filters) {
+        for (var i = 0; i < filters.length; i++) {
+            var f = filters[i], text = trim(el.textContent);
+            if ((f[0] === 'visible' && visible(el) !== f[1]) || (f[0] === 'text' && text !== f[1]) ||
+                    (f[0] === 'contains' && text.indexOf(f[1]) === -1) ||
+                    (f[0] === 'attribute' && (f[2] === null ? !el.hasAttribute(f[1]) : el.getAttribute(f[1]) !== f[2]))) {
+                return false;
+            }
+        }
+        return true;
+    }
+    var kinds = ['index', 'text', 'value'];
+    for (var k = 0; k < kinds.length; k++) {
+        (function (kind) {
+            ops['select_by_' + kind] = function (el, args) { return choose(el, matcher(kind, args[0]), true); };
+            ops['deselect_by_' + kind] = function (el, args) {
+                return el.multiple ? choose(el, matcher(kind, args[0]), false) : false;
+            };
+        })(kinds[k]);
+    }
+    var fn = {
+        advance: function (chain, next, paginate) {
+            var el = locate(chain);
+            return el ? advance(el, paginate, el.getAttribute('data-qa-next') || next) : false;
+        },
+        all: all,
+        // Reads like WebElement.get_attribute: the property when it holds a value, the attribute otherwise
+        attribute: function (chain, name) {
+            var el = locate(chain);
+            if (!el) { return [false, null]; }
+            var prop = name === 'class' ? el.className : el[name];
+            if (prop === true || prop === false) { return [true, prop ? 'true' : null]; }
+            if (prop !== undefined && prop !== null && typeof prop !== 'object' && typeof prop !== 'function') {
+                return [true, String(prop)];
+            }
+            return [true, el.getAttribute(name)];
+        },
+        batch: function (steps) {
+            var results = [];
+            for (var i = 0; i < steps.length; i++) {
+                var el = locate(steps[i][0]);
+                if (!el) { results.push(['missing', false]); continue; }
+                try {
+                    results.push(['ok', ops[steps[i][1]](el, steps[i][2])]);
+                } catch (e) {
+                    if (e === 'native') { results.push(['native', null]); break; }
+                    results.push(['error', String(e)]);
+                }
+            }
+            return results;
+        },
+        blur: function (chain) { var el = locate(chain); if (visible(el)) { el.blur(); } },
+        collect: function (chain, filters, op, arg) {
+            var found = locateAll(chain), members = [], values = [], i;
+            for (i = 0; i < found.length; i++) { if (keep(found[i], filters)) { members.push(found[i]); } }
+            if (op === 'count') { return members.length; }
+            if (op === 'elements') { return members; }
+            for (i = 0; i < members.length; i++) {
+                if (op === 'texts') { values.push(trim(members[i].textContent)); }
+                if (op === 'attributes') { values.push(members[i].getAttribute(arg)); }
+                if (op === 'visible') { values.push(visible(members[i])); }
+                if (op === 'click') { members[i].click(); }
+            }
+            return op === 'click' ? members.length : values;
+        },
+        css: function (chain, prop) {
+            var el = locate(chain);
+            return el ? window.getComputedStyle(el).getPropertyValue(prop) : null;
+        },
+        exists: function (chain) { return !!locate(chain); },
+        fields: function (chain, only) {
+            var el = locate(chain), fields = [], skip = ['hidden', 'submit', 'button', 'reset', 'image'], seen = {};
+            if (!el) { return null; }
+            var controls = el.querySelectorAll('input, select, textarea');
+            for (var i = 0; i < controls.length; i++) {
+                var control = controls[i], tag = control.tagName.toLowerCase(),
+                    type = (control.type || tag).toLowerCase(), name = control.getAttribute('name');
+                // Position among the controls sharing the name, hidden ones included, as located by xpath
+                var position = seen[name] = (seen[name] || 0) + 1;
+                if (!name || skip.indexOf(type) !== -1 || (only !== undefined && only !== null && name !== only)) {
+                    continue;
+                }
+                var value = control.value, options = null,
+                    checked = type === 'checkbox' || type === 'radio' ? control.checked : null;
+                if (tag === 'select') {
+                    options = [];
+                    value = [];
+                    for (var j = 0; j < control.options.length; j++) {
+                        options.push([control.options[j].value, optionText(control.options[j])]);
+                        if (control.options[j].selected) { value.push(control.options[j].value); }
+                    }
+                    if (!control.multiple) { value = value.length ? value[0] : null; }
+                }
+                fields.push([name, tag, type, value, checked, options, control.disabled, control.required, position]);
+            }
+            return fields;
+        },
+        find: function (attr, id) { return first(attr, id, false); },
+        focus: function (chain) { var el = locate(chain); if (visible(el)) { el.focus(); } },
+        has: function (chain, attr) { var el = locate(chain); return el ? el.hasAttribute(attr) : null; },
+        idle: function (quiet, maxTimer, timeout, done) {
+            var state = instrument(), started = new Date().getTime(), since = null;
+            function check() {
+                var now = new Date().getTime(), busy = activity(maxTimer);
+                if (busy.length) { since = null; } else if (since === null) { since = now; }
+                if (since !== null && now - since >= quiet) { return done(['ok', (now - started) / 1000, []]); }
+                if (now - started >= timeout) { return done(['timeout', (now - started) / 1000, busy]); }
+                state.setTimeout.call(window, check, 25);
+            }
+            check();
+        },
+        ids: function (attr) { return index(attr).order.slice(); },
+        instrument: function () { instrument(); return true; },
+        items: function (chain) {
+            var parts = menu(locate(chain)), texts = [];
+            if (!parts) { return null; }
+            var items = menuItems(parts.container);
+            for (var i = 0; i < items.length; i++) { texts.push(trim(items[i].textContent.replace(/\s+/g, ' '))); }
+            return texts;
+        },
+        label: function (chain) { var el = locate(chain); return el ? labelText(el) : null; },
+        labels: function (chain) {
+            var el = locate(chain), labels = [];
+            if (!el) { return labels; }
+            var controls = el.querySelectorAll('input, select, textarea');
+            for (var i = 0; i < controls.length; i++) {
+                var name = controls[i].getAttribute('name') || controls[i].id;
+                if (name && (controls[i].type || '').toLowerCase() !== 'hidden') {
+                    labels.push([name, labelText(controls[i])]);
+                }
+            }
+            return labels;
+        },
+        pick: function (chain, text) {
+            var parts = menu(locate(chain));
+            if (!parts) { return false; }
+            var items = menuItems(parts.container);
+            for (var i = 0; i < items.length; i++) {
+                if (trim(items[i].textContent.replace(/\s+/g, ' ')) === text) { items[i].click(); return true; }
+            }
+            return false;
+        },
+        pointer: function (chain, enabled) {
+            var el = locate(chain);
+            if (!el) { return ['missing', null, null]; }
+            if (!visible(el)) { return ['hidden', el, null]; }
+            if (enabled && (el.disabled || el.getAttribute('aria-disabled') === 'true')) { return ['disabled', el, null]; }
+            var rect = el.getBoundingClientRect(),
+                width = window.innerWidth || document.documentElement.clientWidth,
+                height = window.innerHeight || document.documentElement.clientHeight;
+            if (rect.top < 0 || rect.left < 0 || rect.bottom > height || rect.right > width) {
+                try { el.scrollIntoView({block: 'center', inline: 'center'}); } catch (e) { el.scrollIntoView(false); }
+                rect = el.getBoundingClientRect();
+            }
+            var x = rect.left + rect.width / 2, y = rect.top + rect.height / 2;
+            if (x < 0 || y < 0 || x >= width || y >= height) { return ['offscreen', el, null]; }
+            var hit = document.elementFromPoint(x, y);
+            if (hit && hit !== el && !el.contains(hit) && hit.control !== el) { return ['obscured', el, describe(hit)]; }
+            return ['ok', el, null];
+        },
+        probe: function (probes) {
+            var results = [];
+            for (var i = 0; i < probes.length; i++) {
+                try { results.push(fn[probes[i][0]].apply(null, probes[i][1])); } catch (e) { results.push(null); }
+            }
+            return results;
+        },
+        quiet: function (enable) {
+            var style = document.getElementById('__sampyl_quiet'), cut = 0, saved = 0, i;
+            if (enable && !style && document.getAnimations) {
+                var running = document.getAnimations();
+                for (i = 0; i < running.length; i++) {
+                    var timing = running[i].effect ? running[i].effect.getComputedTiming() : {};
+                    if (running[i].playState === 'running' && timing.endTime !== Infinity) {
+                        saved += Math.max(0, timing.endTime - (running[i].currentTime || 0));
+                        cut++;
+                    }
+                }
+            }
+            if (enable && !style) {
+                style = document.createElement('style');
+                style.id = '__sampyl_quiet';
+                style.textContent = '*, *::before, *::after { transition: none !important; ' +
+                    'animation-duration: 0s !important; animation-delay: 0s !important; ' +
+                    'scroll-behavior: auto !important; }';
+                (document.head || document.documentElement).appendChild(style);
+            } else if (!enable && style) {
+                style.parentNode.removeChild(style);
+            }
+            var animate = null, fx = window.jQuery && window.jQuery.fx, previous = window.__sampyl_quiet_saved;
+            try {
+                var injector = window.angular && window.angular.element(document.body).injector();
+                if (injector && injector.has('$animate')) { animate = injector.get('$animate'); }
+            } catch (e) {}
+            // The page's own settings are kept while suppressed and put back afterwards
+            if (enable && !previous) {
+                window.__sampyl_quiet_saved = {fx: fx ? fx.off : null, animate: animate ? animate.enabled() : null};
+                if (fx) { fx.off = true; }
+                if (animate) { animate.enabled(false); }
+            } else if (!enable && previous) {
+                if (fx && previous.fx !== null) { fx.off = previous.fx; }
+                if (animate && previous.animate !== null) { animate.enabled(previous.animate); }
+                delete window.__sampyl_quiet_saved;
+            }
+            return [cut, saved / 1000];
+        },
+        route: function (url, script, settle, timeout, done) {
+            var started = new Date().getTime(), finished = false, observer = null, quietTimer = null, injector = null;
+            var path = url.replace(/^[a-z]+:\/\/[^\/]+/i, '');
+            try { injector = window.angular && window.angular.element(document.body).injector(); } catch (e) {}
+            var router = injector && injector.has('$location') ? injector.get('$location') : null;
+            // Asks the router when there is one, AngularJS keeps the route after a hashbang (#!/path)
+            function arrived() {
+                if (router) { return router.url() === path; }
+                var here = location.pathname + location.search + location.hash;
+                return here === path || location.href === url || location.href === url + '/';
+            }
+            function finish(status) {
+                if (finished) { return; }
+                finished = true;
+                clearTimeout(quietTimer);
+                clearTimeout(timer);
+                if (observer) { observer.disconnect(); }
+                done([status, (new Date().getTime() - started) / 1000]);
+            }
+            // The route is ready once the location matches and the document stops changing for the settle time
+            function quiet() {
+                clearTimeout(quietTimer);
+                quietTimer = setTimeout(function () {
+                    if (arrived() && document.readyState !== 'loading') { finish('ok'); } else { quiet(); }
+                }, settle);
+            }
+            var timer = setTimeout(function () { finish('timeout'); }, timeout);
+            if (observe) {
+                observer = new MutationObserver(quiet);
+                observer.observe(document.documentElement, {attributes: true, childList: true, subtree: true});
+            }
+            try {
+                if (script) {
+                    new Function('url', 'path', script)(url, path);
+                } else if (router) {
+                    injector.get('$rootScope').$apply(function () { router.url(path); });
+                } else {
+                    history.pushState(history.state, '', url);
+                    var event;
+                    try { event = new PopStateEvent('popstate', {state: history.state}); } catch (e) {
+                        event = document.createEvent('Event');
+                        event.initEvent('popstate', true, true);
+                    }
+                    window.dispatchEvent(event);
+                }
+            } catch (e) {
+                return finish('failed');
+            }
+            quiet();
+        },
+        scope: function (chain, expression) {
+            var el = locate(chain);
+            if (!el || !window.angular) { return null; }
+            try {
+                var scope = window.angular.element(el).scope();
+                return scope ? scope.$eval(expression) : null;
+            } catch (e) {
+                return null;
+            }
+        },
+        scroll: function (chain) {
+            var el = locate(chain);
+            if (!el) { return false; }
+            var height = Math.max(document.documentElement.clientHeight, window.innerHeight || 0);
+            window.scrollBy(0, el.getBoundingClientRect().top - (height / 2));
+            return true;
+        },
+        setValue: function (chain, value) { var el = locate(chain); if (el) { el.value = value; } return !!el; },
+        table: function (chain) {
+            var el = locate(chain), head = null, foot = null, body = [], width = 0, columns = [], i, j;
+            if (el && el.tagName !== 'TABLE') { el = el.querySelector('table'); }
+            if (!el) { return null; }
+            if (el.tHead && el.tHead.rows.length) { head = el.tHead.rows[el.tHead.rows.length - 1]; }
+            if (el.tFoot && el.tFoot.rows.length) { foot = el.tFoot.rows[el.tFoot.rows.length - 1]; }
+            for (i = 0; i < el.rows.length; i++) {
+                var row = el.rows[i], section = row.parentNode;
+                if (section === el.tHead || section === el.tFoot) { continue; }
+                if (!head && !body.length && row.querySelector('th') && !row.querySelector('td')) {
+                    head = row;
+                    continue;
+                }
+                body.push(rowValues(row));
+                width = Math.max(width, row.cells.length);
+            }
+            var headers = rowValues(head);
+            width = Math.max(width, headers.length);
+            for (j = 0; j < width; j++) {
+                columns.push([]);
+                for (i = 0; i < body.length; i++) { columns[j].push(j < body[i].length ? body[i][j] : null); }
+            }
+            return [headers, columns, rowValues(foot)];
+        },
+        tag: function (chain) { var el = locate(chain); return el ? el.tagName.toLowerCase() : null; },
+        window: function (chain, rows, next, paginate, previous) {
+            var el = locate(chain), seen = {}, data = [], changed = previous === null, i;
+            if (!el) { return null; }
+            for (i = 0; previous && i < previous.length; i++) { seen[previous[i]] = true; }
+            var list = el.querySelectorAll(el.getAttribute('data-qa-rows') || rows);
+            for (i = 0; i < list.length; i++) {
+                var cells = list[i].querySelectorAll('td, th, [role="gridcell"], [role="cell"]'), values = [];
+                for (var j = 0; j < cells.length; j++) { values.push(cellValue(cells[j])); }
+                if (!cells.length) { values.push(cellValue(list[i])); }
+                var key = rowKey(list[i], values);
+                changed = changed || !has.call(seen, key);
+                data.push([key, values]);
+            }
+            return [data, changed, atEnd(el, paginate, el.getAttribute('data-qa-next') || next)];
+        },
+        state: function (attr, id, partial) {
+            var el = first(attr, id, partial);
+            return el ? (visible(el) ? 2 : 1) : 0;
+        },
+        transition: function (containerChain, show, timeout, done) {
+            var container = locate(containerChain), finished = false, observer = null;
+            if (visible(container) === show && !animating(container)) { return done(['ok', true]); }
+            function settled() {
+                if (!container || !document.documentElement.contains(container)) { container = locate(containerChain); }
+                return visible(container) === show && !animating(container);
+            }
+            function finish(status) {
+                if (finished) { return; }
+                finished = true;
+                clearInterval(fallback);
+                clearTimeout(timer);
+                if (observer) { observer.disconnect(); }
+                document.removeEventListener('transitionend', check, true);
+                document.removeEventListener('animationend', check, true);
+                done([status, status === 'ok']);
+            }
+            function check() { if (!finished && settled()) { finish('ok'); } }
+            document.addEventListener('transitionend', check, true);
+            document.addEventListener('animationend', check, true);
+            if (observe) {
+                observer = new MutationObserver(check);
+                observer.observe(document.documentElement, {attributes: true, childList: true, subtree: true});
+            }
+            // Safety net for style changes that neither fire an event nor mutate the DOM
+            var fallback = setInterval(check, 100), timer = setTimeout(function () { finish('timeout'); }, timeout);
+            check();
+        },
+        type: function (attr, typeAttr, id) {
+            var found = all(attr, id);
+            return found.length ? [(found[0].getAttribute(typeAttr) || '').toLowerCase(), found.length] : [null, 0];
+        },
+        visible: function (chain) { return visible(locate(chain)); },
+        value: function (chain) { var el = locate(chain); return el ? el.value : null; }
+    };
+    window.__sampyl = {
+        version: version,
+        fn: fn,
+        locate: locate,
+        locateAll: locateAll,
+        visible: visible,
+        call: function (name, args) { return fn[name].apply(null, args); }
+    };
+})(%d);
+""" % RUNTIME_VERSION
+
+CALL_SCRIPT = "var s=window.__sampyl;return s&&s.version===%d?s.call(arguments[0],arguments[1]):'%s';" % (
+    RUNTIME_VERSION, NOT_INJECTED)
+
+# Asynchronous functions receive the completion callback as their last argument
+CALL_ASYNC_SCRIPT = "var s=window.__sampyl,d=arguments[arguments.length-1];" \
+                    "if(s&&s.version===%d){s.call(arguments[0],arguments[1].concat([d]));}else{d('%s');}" % (
+                        RUNTIME_VERSION, NOT_INJECTED)
+
+# Seconds added to an asynchronous call's own timeout for the driver's script timeout
+SCRIPT_TIMEOUT_MARGIN = 5
+
+# WebDriver's default script timeout in seconds, assumed while it was not set through the runtime
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+_RUNTIMES = weakref.WeakKeyDictionary()
+
+
+class Runtime(object):
+    """The Runtime implementation
+
+    SAMpyL's helper library (window.__sampyl) is injected into each document the first time it is needed.
+    Calls send only the function name and its arguments. When the page has navigated away and the library
+    is gone, it is injected again along with the call.
+
+    The generation counter increases every time a new document is detected, anything cached on the Python
+    side about the current document is only valid for the generation it was built in.
+
+    """
+
+    def __init__(self, web_driver):
+
+        # The runtime is registered under its driver, holding the driver weakly lets the session be collected
+        self._driver = weakref.ref(web_driver)
+        self._lock = threading.RLock()
+        self.generation = 0
+        self.injected = False
+
+        # The driver's script timeout in seconds between calls, None for WebDriver's default
+        self.script_timeout = None
+
+        # Seconds SAMpyL waits for an element it is asked to act upon, the driver's own implicit wait stays at 0
+        self.implicit_wait = 0
+
+        # Functions called with the runtime every time the helper library is injected into a new document, before
+        # the call that needed the injection
+        self.hooks = []
+
+    @property
+    def driver(self):
+        """Returns the driver, None once it was collected
+
+        :return: Selenium webdriver
+        :rtype: WebDriver
+        """
+
+        return self._driver()
+
+    @property
+    def lock(self):
+        """Returns the lock guarding the injection state, the command queue's once the driver's commands are serialized
+
+        .. note:: Sharing the queue's lock keeps a single lock order: a thread holding the session never waits for
+                  the runtime, or the other way around.
+
+        :return: Reentrant lock
+        :rtype: RLock
+        """
+
+        queue = get_queue(self.driver)
+
+        return queue.lock if queue is not None else self._lock
+
+    def _execute(self, execute, script, name, args):
+        """Run a call script, injecting the helper library along with it when the document does not have it
+
+        .. note:: With injection hooks installed, the library is injected and the hooks run before the call, so the
+                  call already sees their effect (animations suppressed, activity counted).
+
+        :param func execute: Driver method executing the script
+        :param str script: Call script
+        :param str name: Function name
+        :param tuple args: Function arguments
+        :return: Function result
+        """
+
+        with self.lock:
+
+            if self.injected:
+
+                result = execute(script, name, list(args))
+
+                if not isinstance(result, basestring) or result != NOT_INJECTED:
+                    return result
+
+                self.generation += 1
+                self.injected = False
+
+            if self.hooks:
+                self.inject()
+                return execute(script, name, list(args))
+
+            result = execute(RUNTIME_SCRIPT + script, name, list(args))
+            self.injected = True
+
+            return result
+
+    def _run_hooks(self):
+        """Call every injection hook
+
+        :return:
+        """
+
+        for hook in list(self.hooks):
+            hook(self)
+
+    def call(self, name, *args):
+        """Call a helper library function in the browser
+
+        .. note:: When the driver's commands are serialized, reads queued by several threads are merged.
+
+        :param str name: Function name
+        :param args: Function arguments
+        :return: Function result
+        """
+
+        queue = get_queue(self.driver)
+
+        if queue is not None and name in READ_FUNCTIONS:
+            return queue.read(self, name, args)
+
+        return self.send(name, *args)
+
+    def call_async(self, name, timeout, *args):
+        """Call an asynchronous helper library function in the browser
+
+        .. note:: The driver's script timeout is raised for the call when it is shorter than the call's own timeout,
+                  and restored afterwards. The call's timeout is shortened to fit an active deadline.
+
+        :param str name: Function name
+        :param float timeout: Seconds the function may take, passed in milliseconds after the other arguments
+        :param args: Function arguments
+        :return: Function result
+        """
+
+        deadline = active_deadline(self.driver)
+
+        if deadline is not None:
+            timeout = deadline.budget(timeout, name)
+
+        with self.lock:
+
+            previous = DEFAULT_SCRIPT_TIMEOUT if self.script_timeout is None else self.script_timeout
+            raised = previous < timeout + SCRIPT_TIMEOUT_MARGIN
+
+            if raised:
+                self.driver.set_script_timeout(timeout + SCRIPT_TIMEOUT_MARGIN)
+
+            try:
+                return self._execute(self.driver.execute_async_script, CALL_ASYNC_SCRIPT, name,
+                                     args + (int(timeout * 1000),))
+
+            finally:
+
+                if raised:
+                    self.driver.set_script_timeout(previous)
+
+    def renew(self):
+        """Start a new generation in the same document, after its content was replaced in-page (client-side routing)
+
+        :return:
+        """
+
+        with self.lock:
+            self.generation += 1
+
+    def send(self, name, *args):
+        """Call a helper library function in the browser, on its own
+
+        :param str name: Function name
+        :param args: Function arguments
+        :return: Function result
+        """
+
+        return self._execute(self.driver.execute_script, CALL_SCRIPT, name, args)
+
+    def inject(self):
+        """Inject the helper library now, unless it is known to be in the current document already
+
+        :return:
+        """
+
+        with self.lock:
+
+            if not self.injected:
+
+                self.driver.execute_script(RUNTIME_SCRIPT)
+                self.injected = True
+
+                self._run_hooks()
+
+    def invalidate(self):
+        """Mark the helper library as missing, the next call injects it again
+
+        :return:
+        """
+
+        with self.lock:
+            self.generation += 1
+            self.injected = False
+
+
+def get_runtime(web_driver):
+    """Returns the helper library runtime for a driver
+
+    :param WebDriver web_driver: Selenium webdriver
+    :return: Driver runtime
+    :rtype: Runtime
+    """
+
+    runtime = _RUNTIMES.get(web_driver)
+
+    if runtime is None:
+        runtime = _RUNTIMES.setdefault(web_driver, Runtime(web_driver))
+
+    return runtime
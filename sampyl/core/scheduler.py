@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""sampyl.core.scheduler
+
+.. codeauthor:: John Lane <jlane@fanthreesixty.com>
+
+"""
+
+# pylint: disable=line-too-long
+import threading
+import time
+import weakref
+from sampyl.core.runtime import get_runtime
+from selenium.common.exceptions import StaleElementReferenceException
+
+__all__ = ['WaitScheduler', 'get_scheduler']
+
+# Seconds between evaluations, growing while no wait completes
+MIN_INTERVAL = 0.05
+MAX_INTERVAL = 0.5
+BACKOFF = 1.5
+
+_SCHEDULERS = weakref.WeakKeyDictionary()
+
+
+class _Waiter(object):
+    """A pending wait, its probe is a runtime function call [name, args]
+    """
+
+    def __init__(self, probe, condition):
+
+        self.probe = probe
+        self.condition = condition
+        self.done = False
+
+
+class WaitScheduler(object):
+    """The WaitScheduler implementation
+
+    Coalesces the waits pending on one driver. Every tick, the probes of all waiters are evaluated together in a
+    single script and each waiter whose condition is met is woken up. There is no background thread, one of the
+    waiting threads performs each tick. The interval between ticks backs off while nothing completes and is reset
+    when a wait completes or a new one starts.
+
+    """
+
+    def __init__(self, web_driver):
+
+        # The scheduler is registered under its driver, holding the driver weakly lets the session be collected
+        self._driver = weakref.ref(web_driver)
+        self.interval = MIN_INTERVAL
+        self.ticks = 0
+        self.probes = 0
+
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._polling = False
+        self._next_tick = 0.0
+
+    @property
+    def driver(self):
+        """Returns the driver, None once it was collected
+
+        :return: Selenium webdriver
+        :rtype: WebDriver
+        """
+
+        return self._driver()
+
+    def _evaluate(self, waiters):
+        """Evaluate the probes of every waiter in one script
+
+        :param list waiters: Pending waiters
+        :return: Probe results, in the same order
+        :rtype: list
+        """
+
+        runtime = get_runtime(self.driver)
+
+        try:
+            return runtime.call('probe', [waiter.probe for waiter in waiters]) or [None] * len(waiters)
+
+        except StaleElementReferenceException:
+            pass
+
+        # A stale element handle fails the whole script, evaluate the probes one by one instead
+        results = []
+
+        for waiter in waiters:
+
+            try:
+                results.append(runtime.call(waiter.probe[0], *waiter.probe[1]))
+
+            except StaleElementReferenceException:
+                results.append(None)
+
+        return results
+
+    def _tick(self):
+        """Evaluate every pending wait and wake the waiters whose condition is met
+
+        :return:
+        """
+
+        with self._condition:
+            waiters = [waiter for waiter in self._waiters if not waiter.done]
+
+        results = []
+
+        try:
+            results = self._evaluate(waiters) if waiters else []
+
+        finally:
+
+            with self._condition:
+
+                try:
+
+                    completed = False
+
+                    for waiter, result in zip(waiters, results):
+
+                        if waiter.condition(result):
+                            waiter.done = completed = True
+
+                    self.ticks += 1
+                    self.probes += len(waiters)
+                    self.interval = MIN_INTERVAL if completed else min(self.interval * BACKOFF, MAX_INTERVAL)
+                    self._next_tick = time.time() + self.interval
+
+                finally:
+                    self._polling = False
+                    self._condition.notify_all()
+
+    def wait(self, probe, condition, timeout=30):
+        """Wait until a condition on a probe's result is met
+
+        :param list probe: Runtime function name and argument list
+        :param func condition: Callable taking the probe result
+        :param float timeout: Wait timeout in seconds
+        :return: True, if the wait does not timeout
+        :rtype: bool
+        """
+
+        waiter = _Waiter(list(probe), condition)
+        expires = time.time() + timeout
+
+        with self._condition:
+
+            self._waiters.append(waiter)
+
+            # A new wait is evaluated on the next tick rather than after the backed off interval
+            self.interval = MIN_INTERVAL
+            self._next_tick = min(self._next_tick, time.time())
+
+        try:
+
+            while True:
+
+                with self._condition:
+
+                    while True:
+
+                        now = time.time()
+
+                        if waiter.done:
+                            return True
+
+                        if now >= expires:
+                            return False
+
+                        if not self._polling and now >= self._next_tick:
+                            break
+
+                        # Woken up by the thread performing a tick, or once the next tick is due
+                        until = expires if self._polling else min(self._next_tick, expires)
+                        self._condition.wait(max(until - now, 0.001))
+
+                    self._polling = True
+
+                self._tick()
+
+        finally:
+
+            with self._condition:
+                self._waiters.remove(waiter)
+
+
+def get_scheduler(web_driver):
+    """Returns the wait scheduler for a driver
+
+    :param WebDriver web_driver: Selenium webdriver
+    :return: Driver wait scheduler
+    :rtype: WaitScheduler
+    """
+
+    scheduler = _SCHEDULERS.get(web_driver)
+
+    if scheduler is None:
+        scheduler = _SCHEDULERS.setdefault(web_driver, WaitScheduler(web_driver))
+
+    return scheduler
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""sampyl.core.state
+
+.. codeauthor:: John Lane <jlane@fanthreesixty.com>
+
+"""
+
+# pylint: disable=line-too-long
+import ctypes
+import json
+import os
+import tempfile
+import time
+import warnings
+from contextlib import contextmanager
+from sampyl.core.runtime import get_runtime
+from sampyl.core.timing import get_timeline
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+__all__ = ['load_state', 'restore_state', 'save_state']
+
+DEFAULT_ROLE = 'default'
+DEFAULT_TTL = 3600
+
+# MoveFileEx flags, replacing the target the way os.rename does on POSIX
+MOVEFILE_REPLACE_EXISTING = 0x1
+MOVEFILE_WRITE_THROUGH = 0x8
+
+# Returns [localStorage, sessionStorage] of the current document as plain objects
+READ_STORAGE_SCRIPT = """
+var read = function (name) {
+    var items = {};
+    try {
+        var storage = window[name];
+        for (var i = 0; i < storage.length; i++) {
+            var key = storage.key(i);
+            items[key] = storage.getItem(key);
+        }
+    } catch (e) {}
+    return items;
+};
+return [read('localStorage'), read('sessionStorage')];
+"""
+
+# Replaces localStorage and sessionStorage of the current document, returns the number of items written
+WRITE_STORAGE_SCRIPT = """
+var write = function (name, items) {
+    var count = 0;
+    try {
+        var storage = window[name];
+        storage.clear();
+        for (var key in items) {
+            if (items.hasOwnProperty(key)) {
+                storage.setItem(key, items[key]);
+                count++;
+            }
+        }
+    } catch (e) {}
+    return count;
+};
+return write('localStorage', arguments[0]) + write('sessionStorage', arguments[1]);
+"""
+
+
+def _origin(web_driver):
+    """Returns the scheme://host of the driver's current document
+
+    :param WebDriver web_driver: Selenium webdriver
+    :return: Current origin
+    :rtype: str
+    """
+
+    url = web_driver.current_url or ''
+    parts = url.split('/')
+
+    return '/'.join(parts[:3]) if len(parts) > 2 and parts[0].endswith(':') else ''
+
+
+@contextmanager
+def _locked(path):
+    """Hold an exclusive lock on a state file, across processes, for the duration of the with block
+
+    .. note:: The lock is taken on a separate '.lock' file, the state file itself is replaced on every save.
+
+    :param str path: State file
+    :return:
+    """
+
+    with open('{}.lock'.format(path), 'a+') as lock_file:
+
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+        elif msvcrt is not None:
+
+            lock_file.seek(0)
+
+            # LK_LOCK gives up after 10 attempts, keep trying
+            while True:
+
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+
+                except IOError:
+                    pass
+
+        try:
+            yield
+
+        finally:
+
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _replace(source, target):
+    """Move a file over another in one step, os.rename fails on Windows when the target exists
+
+    :param str source: File to move
+    :param str target: File replaced
+    :return:
+    """
+
+    if os.name != 'nt':
+        return os.rename(source, target)
+
+    if not ctypes.windll.kernel32.MoveFileExW(unicode(source), unicode(target),
+                                              MOVEFILE_REPLACE_EXISTING | MOVEFILE_WRITE_THROUGH):
+        raise ctypes.WinError()
+
+
+def _read(path):
+    """Returns the states stored in a file, keyed by role
+
+    :param str path: State file
+    :return: States by role
+    :rtype: dict
+    """
+
+    try:
+
+        with open(path) as state_file:
+            states = json.load(state_file)
+
+    except (IOError, ValueError):
+        return {}
+
+    return states if isinstance(states, dict) else {}
+
+
+def load_state(path, origin, role=DEFAULT_ROLE):
+    """Returns the unexpired state saved for a role and origin
+
+    :param str path: State file
+    :param str origin: scheme://host the state belongs to
+    :param str role: User role
+    :return: Saved state, None if missing or expired
+    :rtype: dict
+    """
+
+    state = _read(path).get(role)
+
+    if not isinstance(state, dict) or state.get('origin') != origin:
+        return None
+
+    if state.get('expires', 0) <= time.time():
+        return None
+
+    return state
+
+
+def save_state(web_driver, path, origin, role=DEFAULT_ROLE, ttl=DEFAULT_TTL):
+    """Save the cookies, localStorage and sessionStorage of the driver's current document for a role
+
+    :param WebDriver web_driver: Selenium webdriver
+    :param str path: State file, other roles saved in it are kept
+    :param str origin: scheme://host the driver is on
+    :param str role: User role
+    :param int ttl: Seconds the state may be restored for
+    :return: Saved state
+    :rtype: dict
+    :raises ValueError: If the driver is not on the origin
+    """
+
+    if _origin(web_driver) != origin:
+        raise ValueError('The state of \'{}\' cannot be saved while on \'{}\''.format(origin, web_driver.current_url))
+
+    with get_timeline(web_driver).measure('save_state', category='state', role=role) as details:
+
+        local, session = web_driver.execute_script(READ_STORAGE_SCRIPT) or ({}, {})
+        saved = time.time()
+
+        state = {'origin': origin, 'saved': saved, 'expires': saved + ttl, 'cookies': web_driver.get_cookies(),
+                 'localStorage': local, 'sessionStorage': session}
+
+        # Read, update and write under the lock, so concurrent saves of other roles are kept
+        with _locked(path):
+
+            states = _read(path)
+            states[role] = state
+
+            # Write the whole file at once, so a concurrent restore never reads a partial state
+            directory = os.path.dirname(os.path.abspath(path))
+            handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+
+            try:
+
+                with os.fdopen(handle, 'w') as state_file:
+                    json.dump(states, state_file)
+
+                _replace(temp_path, path)
+
+            except (IOError, OSError):
+
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+                raise
+
+        details['cookies'] = len(state['cookies'])
+
+    return state
+
+
+def restore_state(web_driver, path, origin, role=DEFAULT_ROLE):
+    """Restore the state saved for a role into the driver
+
+    .. note:: The driver is sent to the origin first if it is elsewhere, cookies and storage can only be set for
+              the current document. Navigate afterwards for the application to load with the restored state.
+
+    :param WebDriver web_driver: Selenium webdriver
+    :param str path: State file
+    :param str origin: scheme://host to restore the state for
+    :param str role: User role
+    :return: True, if an unexpired state was restored, False if none was or a cookie was rejected
+    :rtype: bool
+    """
+
+    state = load_state(path, origin, role)
+
+    if state is None:
+        return False
+
+    with get_timeline(web_driver).measure('restore_state', category='state', role=role) as details:
+
+        if _origin(web_driver) != origin:
+            get_runtime(web_driver).invalidate()
+            web_driver.get(origin)
+
+        now = time.time()
+        restored = 0
+        failed = []
+
+        web_driver.delete_all_cookies()
+
+        for cookie in state.get('cookies', []):
+
+            if cookie.get('expiry') and cookie['expiry'] <= now:
+                continue
+
+            try:
+                web_driver.add_cookie(cookie)
+
+            # Some drivers reject a domain cookie set from the host itself, set it as a host cookie instead
+            except WebDriverException:
+
+                try:
+                    web_driver.add_cookie(dict([(key, value) for key, value in cookie.items() if key != 'domain']))
+
+                except WebDriverException as error:
+                    failed.append('{} ({})'.format(cookie.get('name'), getattr(error, 'msg', None) or error))
+                    continue
+
+            restored += 1
+
+        details['cookies'] = restored
+        details['failed'] = len(failed)
+
+        # A partial session is worse than none, leave the driver logged out for the caller to log in again
+        if failed:
+
+            web_driver.delete_all_cookies()
+            warnings.warn('The state of \'{}\' was not restored, cookies rejected: {}'.format(role, ', '.join(failed)))
+
+            return False
+
+        web_driver.execute_script(WRITE_STORAGE_SCRIPT, state.get('localStorage', {}), state.get('sessionStorage', {}))
+
+    return True
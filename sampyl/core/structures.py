@@ -7,14 +7,29 @@
 
 # pylint: disable=line-too-long
 import inspect
+import re
 import sys
-import warnings
+import time
+from collections import OrderedDict, namedtuple
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
-from sampyl.core.element import Element, join
-from sampyl.core.mixins import ClickMixin, InputMixin, SelectMixin, SelectiveMixin, TextMixin
+from sampyl.core.element import Element, xpath_string
+from sampyl.core.mixins import ClickMixin, InputMixin, SelectMixin, SelectiveMixin, TextMixin, ToggleMixin
+from sampyl.core.shortcuts import encode_ascii
 
-__all__ = ['Button', 'Div', 'Image', 'InputCheckbox', 'InputRadio', 'InputText', 'Link',
-           'MultiSelect', 'Select', 'Text']
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FormField = namedtuple('FormField', ['name', 'tag', 'type', 'value', 'checked', 'options', 'disabled', 'required',
+                                     'structure'])
+
+__all__ = ['Button', 'Div', 'Form', 'FormField', 'Image', 'InputCheckbox', 'InputRadio', 'InputText', 'Link',
+           'MultiSelect', 'Select', 'Table', 'TableData', 'Text', 'VirtualList']
+
+# A number, with its exponent and accounting parentheses
+_NUMBER = re.compile(r'(\()?\s*([+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)\s*(\))?')
 
 
 class Button(Element, ClickMixin, TextMixin):
@@ -106,7 +121,7 @@ class Div(Element):
     pass
 
 
-class Dropdown(Element, ClickMixin, TextMixin):
+class Dropdown(Element, ClickMixin, TextMixin, ToggleMixin):
     """The Dropdown implementation
 
     .. note:: This structure is specifically for a Bootstrap dropdown
@@ -158,61 +173,49 @@ class Dropdown(Element, ClickMixin, TextMixin):
     _toggle_xpath = (By.XPATH, '/descendant-or-self::*[(contains(@class, "dropdown-toggle") or '
                                '@ng-mouseover or @ng-click)]')
 
-    @property
-    def _container(self):
-        """Dropdown container
-
-        :return:
-        """
-
-        xpath = '/following-sibling::*[(contains(@class, "dropdown-menu") or contains(@class, "tree") or @ng-show) ' \
-                'and (self::div or self::ul)]'
-        child = '/descendant-or-self::*[(contains(@class, "dropdown-menu") or contains(@class, "tree") or @ng-show) ' \
-                'and (self::div or self::ul)]'
+    # Container is either a sibling following the toggle or nested within the dropdown
+    _container_xpath = (By.XPATH, '|'.join(['{}/following-sibling::*[(contains(@class, "dropdown-menu") or '
+                                            'contains(@class, "tree") or @ng-show) and (self::div or self::ul)]',
+                                            '/descendant-or-self::*[(contains(@class, "dropdown-menu") or '
+                                            'contains(@class, "tree") or @ng-show) and (self::div or self::ul)]'])
+                        .format(_toggle_xpath[1]))
 
-        xpath_term = join(self.search_term, self._toggle, (By.XPATH, xpath))
-        child_term = join(self.search_term, self._toggle, (By.XPATH, child))
-
-        return Div(self.driver, By.XPATH, '|'.join([xpath_term[1], child_term[1]]))
-
-    @property
-    def _toggle(self):
-        """Show/hide toggle button
+    def __init__(self, web_driver, _by=By.XPATH, path=None, within=None, **kwargs):
+        """Dropdown, the toggle and container are resolved within it once and reused
 
+        :param WebDriver web_driver: Selenium webdriver
+        :param str _by: By selector
+        :param str path: selection value
+        :param Element within: Parent element, the selector is resolved relative to it
         :return:
         """
 
-        return Button(self.driver, *join(self.search_term, self._toggle_xpath))
+        super(Dropdown, self).__init__(web_driver, _by, path, within=within, **kwargs)
 
-    def expand(self, hover=False):
-        """Show dropdown
+        # Show/hide toggle button and dropdown container
+        self._toggle = Button(self.driver, *self._toggle_xpath, within=self)
+        self._container = Div(self.driver, *self._container_xpath, within=self)
 
-        :return:
-        """
+    def items(self):
+        """Returns the text of every menu item, read in one call
 
-        if not self._container.is_displayed():
+        :return: List of menu item text
+        :rtype: list
+        """
 
-            if hover:
-                self._toggle.hover()
-            else:
-                self._toggle.click()
+        return [item.encode('ascii', 'ignore') for item in self.runtime.call('items', self.locator()) or []]
 
-            return self._container.wait_until_appears()
+    def pick(self, text):
+        """Click the menu item with the given text
 
-    def collapse(self, hover=False):
-        """Hide dropdown
+        .. note:: The item is clicked through the DOM, the dropdown does not need to be expanded first.
 
-        :return:
+        :param str text: Menu item text
+        :return: True, if a menu item was clicked
+        :rtype: bool
         """
 
-        if self._container.is_displayed():
-
-            if hover:
-                self._toggle.hover()
-            else:
-                self._toggle.click()
-
-            return self._container.wait_until_disappears()
+        return bool(self.runtime.call('pick', self.locator(), text))
 
 
 class BadgeDropdown(Dropdown):
@@ -238,36 +241,164 @@ class BadgeDropdown(Dropdown):
 
 
 class Form(Element):
+    """The Form implementation
+
+        **Example Use:**
+
+
+        Let's take the following example:
+
+        .. code-block:: html
+
+            <form data-qa-id="some.identifier" data-qa-model="form">
+                <input type="text" name="username">
+                <input type="checkbox" name="remember" value="yes">
+                <select name="role"><option value="1">User</option><option value="2">Admin</option></select>
+            </form>
+
+
+        An example on how to interact with the element:
+
+        .. code-block:: python
+
+            from selenium.webdriver import Chrome
+            from sampyl import App
+
+            wd = webdriver.Chrome('/path/to/chromedriver')
+            app = App(wd, "http://someurl.com/path")
+
+            # Returns {'username': '', 'remember': False, 'role': '1'}
+            app.page.some.identifier.values()
+
+            app.page.some.identifier.get_field('username').input('Hello World')
+
+    """
+
+    def controls(self, name=None):
+        """Returns the named controls in the form, read in one call
+
+        .. note:: Hidden inputs and buttons are left out.
+
+        :param str name: Control name, None for every control
+        :return: List of form fields in document order
+        :rtype: list
+        """
+
+        controls = []
+
+        for control_name, tag, _type, value, checked, options, disabled, required, position in \
+                self.runtime.call('fields', self.locator(), name) or []:
+
+            if isinstance(value, basestring):
+                value = value.encode('ascii', 'ignore')
+
+            elif isinstance(value, list):
+                value = [item.encode('ascii', 'ignore') for item in value]
 
-    def _get_field(self, field_name):
+            if options is not None:
+                options = [(val.encode('ascii', 'ignore'), text.encode('ascii', 'ignore')) for val, text in options]
+
+            control_name = control_name.encode('ascii', 'ignore')
+            structure = FIELD_TYPES.get(_type, FIELD_TYPES.get(tag, InputText))
+
+            # Located again on every use, by name and position among the controls sharing it
+            xpath = '/descendant::*[(self::input or self::select or self::textarea) and @name={}]'.format(
+                xpath_string(control_name))
+
+            if position > 1:
+                xpath = '({})[{}]'.format(xpath, position)
+
+            controls.append(FormField(control_name, str(tag), str(_type), value, checked, options, bool(disabled),
+                                      bool(required), structure(self.driver, By.XPATH, xpath, within=self,
+                                                                name_attr=self._name_attr,
+                                                                type_attr=self._type_attr)))
+
+        return controls
+
+    @staticmethod
+    def _group(controls):
+        """Returns the structures of controls by name
+
+        :param list controls: Form fields
+        :return: Dictionary of control name to structure, controls sharing a name (radio groups) map to a list
+        :rtype: OrderedDict
+        """
+
+        fields = OrderedDict()
+
+        for field in controls:
+
+            if field.name not in fields:
+                fields[field.name] = field.structure
+
+            elif isinstance(fields[field.name], list):
+                fields[field.name].append(field.structure)
+
+            else:
+                fields[field.name] = [fields[field.name], field.structure]
+
+        return fields
+
+    def fields(self):
+        """Returns the sda structure of every named control in the form
+
+        :return: Dictionary of control name to structure, controls sharing a name (radio groups) map to a list
+        :rtype: OrderedDict
+        """
+
+        return self._group(self.controls())
+
+    def get_field(self, field_name):
+        """Returns the sda structure of a control in the form
+
+        :param str field_name: Control name
+        :return: Field structure, or a list of structures for controls sharing the name
+        """
 
         if not isinstance(field_name, basestring):
             raise TypeError
 
-        xpath = '/descendant-or-self::*[((self::input and @type="text") or ' \
-                'self::textarea or self::select) and @name="{}"]'
-        elements = self.driver.find_elements(*join(self.search_term, (By.XPATH, xpath.format(field_name))))
+        return self._group(self.controls(field_name)).get(field_name)
 
-        if elements:
-            return elements[0]
+    def labels(self):
+        """Returns the label of every control in the form, read in one call
 
-    def get_field(self, field_name):
+        :return: Dictionary of control name (or id, when unnamed) to label text
+        :rtype: dict
+        """
+
+        return dict([(name.encode('ascii', 'ignore'), text.encode('ascii', 'ignore').strip())
+                     for name, text in self.runtime.call('labels', self.locator()) or []])
+
+    def values(self):
+        """Returns the current value of every named control in the form
 
-        field = self._get_field(field_name)
+        Radio groups return the value of the checked button, a single checkbox returns whether it is checked,
+        checkboxes sharing a name return the checked values and multiple selects return the selected values.
 
-        if field:
+        :return: Dictionary of control name to value
+        :rtype: OrderedDict
+        """
+
+        values = OrderedDict()
+        groups = OrderedDict()
+
+        for field in self.controls():
+            groups.setdefault(field.name, []).append(field)
 
-            input_xpath = '/descendant-or-self::*[((self::input and @type="text") or self::textarea) and @name="{}"]'
-            select_xpath = '/descendant-or-self::*[self::select and @name="{}"]'
+        for name, group in groups.items():
 
-            if field.tag_name == u'input' or field.tag_name == u'textarea':
-                return InputText(self.driver, *join(self.search_term, (By.XPATH, input_xpath.format(field_name))))
+            if group[0].type == 'radio':
+                checked = [field.value for field in group if field.checked]
+                values[name] = checked[0] if checked else None
 
-            elif field.tag_name == u'select':
-                return Select(self.driver, *join(self.search_term, (By.XPATH, select_xpath.format(field_name))))
+            elif group[0].type == 'checkbox':
+                values[name] = group[0].checked if len(group) == 1 else [field.value for field in group if field.checked]
 
             else:
-                warnings.warn('{} type not currently supported within form'.format(str(field.tag_name)))
+                values[name] = group[0].value
+
+        return values
 
 
 class Image(Element):
@@ -356,17 +487,17 @@ class InputCheckbox(Element, SelectiveMixin):
     """
 
     @property
+    @encode_ascii(clean=True)
     def label(self):
         """Returns the label for the input item
 
-        :return: Returns Text object for label
-        :rtype: Text
+        .. note:: Labels pointing at the input with a for attribute and labels wrapping it are both resolved.
+
+        :return: Label text
+        :rtype: str
         """
 
-        if self.exists():
-            return Text(self.driver, By.XPATH,
-                        '/descendant-or-self::label[@for="{0}"]'.format(str(self.id))).visible_text() \
-                if len(self.id) > 0 else ''
+        return self.runtime.call('label', self.locator())
 
 
 class InputRadio(InputCheckbox, SelectiveMixin):
@@ -446,17 +577,17 @@ class InputText(Element, InputMixin, ClickMixin):
     """
 
     @property
+    @encode_ascii(clean=True)
     def label(self):
         """Returns the label for the input item
 
-        :return: Text object for label
-        :rtype: Text
+        .. note:: Labels pointing at the input with a for attribute and labels wrapping it are both resolved.
+
+        :return: Label text
+        :rtype: str
         """
 
-        if self.exists():
-            return Text(self.driver, By.XPATH,
-                        '/descendant-or-self::label[@for="{0}"]'.format(str(self.id))).visible_text() \
-                if len(self.id) > 0 else ''
+        return self.runtime.call('label', self.locator())
 
 
 class Link(Element, ClickMixin, TextMixin):
@@ -499,7 +630,7 @@ class Link(Element, ClickMixin, TextMixin):
     pass
 
 
-class MultiSelect(Element):
+class MultiSelect(Element, ToggleMixin):
     """The MultiSelect implementation
 
         **Example Use:**
@@ -550,7 +681,7 @@ class MultiSelect(Element):
 
         xpath = '/descendant-or-self::div[contains(@class, "checkboxLayer")]'
 
-        return Div(self.driver, *join(self.search_term, (By.XPATH, xpath)))
+        return Div(self.driver, By.XPATH, xpath, within=self)
 
     @property
     def _toggle(self):
@@ -561,7 +692,7 @@ class MultiSelect(Element):
 
         xpath = '/descendant-or-self::button[contains(@ng-click, "toggle")]'
 
-        return Button(self.driver, *join(self.search_term, (By.XPATH, xpath)))
+        return Button(self.driver, By.XPATH, xpath, within=self)
 
     @property
     def _select_all(self):
@@ -572,7 +703,7 @@ class MultiSelect(Element):
 
         xpath = '/descendant-or-self::button[contains(@ng-click, "all")]'
 
-        return Button(self.driver, *join(self.search_term, (By.XPATH, xpath)))
+        return Button(self.driver, By.XPATH, xpath, within=self)
 
     @property
     def _select_none(self):
@@ -583,7 +714,7 @@ class MultiSelect(Element):
 
         xpath = '/descendant-or-self::button[contains(@ng-click, "none")]'
 
-        return Button(self.driver, *join(self.search_term, (By.XPATH, xpath)))
+        return Button(self.driver, By.XPATH, xpath, within=self)
 
     @property
     def _reset(self):
@@ -594,7 +725,7 @@ class MultiSelect(Element):
 
         xpath = '/descendant-or-self::button[contains(@ng-click, "reset")]'
 
-        return Button(self.driver, *join(self.search_term, (By.XPATH, xpath)))
+        return Button(self.driver, By.XPATH, xpath, within=self)
 
     @property
     def _filter(self):
@@ -605,7 +736,7 @@ class MultiSelect(Element):
 
         xpath = '/descendant-or-self::input[contains(@ng-click, "filter")]'
 
-        return InputText(self.driver, *join(self.search_term, (By.XPATH, xpath)))
+        return InputText(self.driver, By.XPATH, xpath, within=self)
 
     @property
     def _clear(self):
@@ -616,7 +747,7 @@ class MultiSelect(Element):
 
         xpath = '/descendant-or-self::button[contains(@ng-click, "clear")]'
 
-        return Button(self.driver, *join(self.search_term, (By.XPATH, xpath)))
+        return Button(self.driver, By.XPATH, xpath, within=self)
 
     def _get_index(self, idx):
         """Return item at index 'i'
@@ -637,9 +768,8 @@ class MultiSelect(Element):
                     raise TypeError('Error: Index must be of type int')
 
             if idx in range(0, len(self.options())):
-                return Button(self.driver, *join(self.search_term,
-                                                 (By.XPATH, '/descendant-or-self::div[contains(@ng-repeat, '
-                                                            '"filteredModel")][{}]'.format(idx))))
+                return Button(self.driver, By.XPATH, '/descendant-or-self::div[contains(@ng-repeat, '
+                                                     '"filteredModel")][{}]'.format(idx), within=self)
 
     def _get_text(self, text):
         """Return selection that contains text criteria
@@ -650,34 +780,14 @@ class MultiSelect(Element):
 
         if isinstance(text, basestring):
 
-            return Button(self.driver, *join(self.search_term,
-                                             (By.XPATH, '/descendant-or-self::label[contains(., "{}")]/ancestor::div'
-                                                        '[contains(@ng-repeat, "filteredModel")]'.format(text))))
-
-    def expand(self):
-        """Show iSteven dropdown
-
-        :return:
-        """
-
-        if not self._container.is_displayed():
-            self._toggle.click()
-            self._container.wait_until_appears()
-
-    def collapse(self):
-        """Hide iSteven dropdown
-
-        :return:
-        """
-
-        if self._container.is_displayed():
-            self._toggle.click()
-            self._container.wait_until_disappears()
+            return Button(self.driver, By.XPATH, '/descendant-or-self::label[contains(., "{}")]/ancestor::div'
+                                                 '[contains(@ng-repeat, "filteredModel")]'.format(text), within=self)
 
     def select_all(self):
         """Select all possible selections
 
         :return:
+        :raises InteractionError: If the button or option cannot be clicked
         """
 
         self.expand()
@@ -687,6 +797,7 @@ class MultiSelect(Element):
         """Deselect all selections
 
         :return:
+        :raises InteractionError: If the button or option cannot be clicked
         """
 
         self.expand()
@@ -696,6 +807,7 @@ class MultiSelect(Element):
         """Reset selection to default state
 
         :return:
+        :raises InteractionError: If the button or option cannot be clicked
         """
 
         self.expand()
@@ -716,6 +828,7 @@ class MultiSelect(Element):
         """Click clear search button
 
         :return:
+        :raises InteractionError: If the button or option cannot be clicked
         """
 
         self.expand()
@@ -726,6 +839,7 @@ class MultiSelect(Element):
 
         :param str index: Index
         :return:
+        :raises InteractionError: If the button or option cannot be clicked
         """
 
         self.expand()
@@ -741,6 +855,7 @@ class MultiSelect(Element):
 
         :param str text: Text criteria
         :return:
+        :raises InteractionError: If the button or option cannot be clicked
         """
 
         self.expand()
@@ -755,6 +870,7 @@ class MultiSelect(Element):
 
         :param str index: Index
         :return:
+        :raises InteractionError: If the button or option cannot be clicked
         """
 
         self.expand()
@@ -770,6 +886,7 @@ class MultiSelect(Element):
 
         :param str text: Text criteria
         :return:
+        :raises InteractionError: If the button or option cannot be clicked
         """
 
         self.expand()
@@ -794,10 +911,8 @@ class MultiSelect(Element):
             xpath = '/descendant-or-self::div[contains(@ng-repeat, "filteredModel") and ' \
                     'not(contains(@class, "multiSelectGroup"))]//label'
 
-        search_term = join(self.search_term, (By.XPATH, xpath))
-
         return [element.get_attribute('textContent').encode('ascii', 'ignore')
-                for element in self.driver.find_elements(*search_term)]
+                for element in Element(self.driver, By.XPATH, xpath, within=self).find_elements()]
 
     def selected_options(self):
         """Return all selected options
@@ -806,11 +921,10 @@ class MultiSelect(Element):
         :rtype: list
         """
 
-        search_term = join(self.search_term, (By.XPATH, '/descendant-or-self::div[contains(@ng-repeat, '
-                                                        '"filteredModel") and contains(@class, "selected")]//label'))
+        xpath = '/descendant-or-self::div[contains(@ng-repeat, "filteredModel") and contains(@class, "selected")]//label'
 
         return [element.get_attribute('textContent').encode('ascii', 'ignore')
-                for element in self.driver.find_elements(*search_term)]
+                for element in Element(self.driver, By.XPATH, xpath, within=self).find_elements()]
 
 
 class Select(Element, SelectMixin):
@@ -863,6 +977,268 @@ class Select(Element, SelectMixin):
     pass
 
 
+def to_number(value):
+    """Parse a table cell into a float
+
+    .. note:: Thousands separators, currency signs, percent signs, units and accounting parentheses are ignored. Cells
+              holding more than one number ('Page 3 of 10', '12-15') are not numeric.
+
+    :param str value: Cell value
+    :return: Number, NaN if the cell is not numeric
+    :rtype: float
+    """
+
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    if not isinstance(value, basestring):
+        return float('nan')
+
+    # Symbols between a sign and its digits ('-$5') and separators between groups of digits are dropped
+    text = re.sub(r'[^\w\s.,()+-]|(?<=\d),(?=\d{3}(?!\d))', '', value)
+    numbers = _NUMBER.findall(text)
+
+    if len(numbers) != 1:
+        return float('nan')
+
+    opening, number, closing = numbers[0]
+
+    return -float(number) if opening and closing else float(number)
+
+
+class TableData(object):
+    """The TableData implementation
+
+    Column-oriented snapshot of a table. Every check runs locally against the snapshot, returning NumPy arrays
+    and using vectorized operations when NumPy is installed.
+
+    """
+
+    def __init__(self, headers, columns, footer=None):
+
+        self.headers = [header.encode('ascii', 'ignore') for header in headers]
+        self.columns = [[cell.encode('ascii', 'ignore') if isinstance(cell, basestring) else cell for cell in column]
+                        for column in columns]
+        self.footer = [cell.encode('ascii', 'ignore') for cell in footer or []]
+
+        # Tables without a header row are addressed by column index
+        while len(self.headers) < len(self.columns):
+            self.headers.append(str(len(self.headers)))
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def _index(self, column):
+        """Returns the index of a column
+
+        :param column: Column header or index
+        :return: Column index
+        :rtype: int
+        """
+
+        if isinstance(column, int) and 0 <= column < len(self.columns):
+            return column
+
+        if column in self.headers:
+            return self.headers.index(column)
+
+        raise KeyError('%s' % str(column))
+
+    def column(self, column, numeric=False, as_array=False):
+        """Returns the values of a column
+
+        :param column: Column header or index
+        :param bool numeric: True, to parse the values into floats
+        :param bool as_array: True, to return a NumPy array
+        :return: Column values
+        :rtype: list
+        """
+
+        values = self.columns[self._index(column)]
+
+        if numeric:
+            values = [to_number(value) for value in values]
+
+        if as_array:
+
+            if numpy is None:
+                raise ImportError('NumPy is required to return columns as arrays')
+
+            return numpy.array(values, dtype=float if numeric else object)
+
+        return list(values)
+
+    def footer_value(self, column, numeric=False):
+        """Returns the footer (totals) cell of a column
+
+        :param column: Column header or index
+        :param bool numeric: True, to parse the value into a float
+        :return: Footer value
+        """
+
+        index = self._index(column)
+        value = self.footer[index] if index < len(self.footer) else None
+
+        return to_number(value) if numeric else value
+
+    def rows(self):
+        """Returns the table as a list of rows
+
+        :return: List of rows
+        :rtype: list
+        """
+
+        return [list(row) for row in zip(*self.columns)]
+
+    def is_sorted(self, column, reverse=False, numeric=False):
+        """Returns True, if a column is sorted
+
+        :param column: Column header or index
+        :param bool reverse: True, to check for descending order
+        :param bool numeric: True, to compare the values as numbers, non-numeric cells are skipped
+        :return: True, if the column is sorted
+        :rtype: bool
+        """
+
+        if numpy is not None and numeric:
+
+            values = self.column(column, numeric=True, as_array=True)
+            steps = numpy.diff(values[~numpy.isnan(values)])
+
+            return bool(numpy.all(steps <= 0) if reverse else numpy.all(steps >= 0))
+
+        values = self.column(column, numeric=numeric)
+
+        if numeric:
+            values = [value for value in values if value == value]
+
+        return values == sorted(values, reverse=reverse)
+
+    def total(self, column):
+        """Returns the sum of a numeric column, non-numeric cells are skipped
+
+        :param column: Column header or index
+        :return: Column total
+        :rtype: float
+        """
+
+        if numpy is not None:
+            return float(numpy.nansum(self.column(column, numeric=True, as_array=True)))
+
+        return sum([value for value in self.column(column, numeric=True) if value == value])
+
+    def where(self, column, condition):
+        """Returns the rows where a column matches a condition
+
+        :param column: Column header or index
+        :param condition: Value to compare cells to, or callable taking a cell and returning True to keep the row
+        :return: Filtered table
+        :rtype: TableData
+        """
+
+        values = self.column(column)
+
+        if numpy is not None and not hasattr(condition, '__call__'):
+            mask = list(numpy.array(values, dtype=object) == condition)
+
+        else:
+            mask = [bool(condition(value)) if hasattr(condition, '__call__') else value == condition
+                    for value in values]
+
+        columns = [[cell for cell, keep in zip(cells, mask) if keep] for cells in self.columns]
+
+        return TableData(self.headers, columns, self.footer)
+
+
+class Table(Element):
+    """The Table implementation
+
+        **Example Use:**
+
+
+        Let's take the following example:
+
+        .. code-block:: html
+
+            <table id="someClassId" class="someClass">
+                <thead><tr><th>Name</th><th>Amount</th></tr></thead>
+                <tbody><tr><td>Item</td><td>1,000</td></tr></tbody>
+                <tfoot><tr><td>Total</td><td>1,000</td></tr></tfoot>
+            </table>
+
+
+        If the user wants to make the code above recognizable to the testing framework, they
+        would add the attribute "data-qa-id" with a unique value as well as "data-qa-model"
+        with a type.
+
+        .. code-block:: html
+
+            <table data-qa-id="some.identifier" data-qa-model="table" id="someClassId"
+            class="someClass">
+                ...
+            </table>
+
+
+        An example on how to interact with the element:
+
+        .. code-block:: python
+
+            from selenium.webdriver import Chrome
+            from sampyl import App
+
+            wd = webdriver.Chrome('/path/to/chromedriver')
+            app = App(wd, "http://someurl.com/path")
+
+            # Reads the whole table in one call
+            data = app.page.some.identifier.snapshot()
+
+            # Returns True
+            data.total('Amount') == data.footer_value('Amount', numeric=True)
+
+    """
+
+    def snapshot(self):
+        """Returns the headers, cell values and footer of the table, read in one call
+
+        :return: Table snapshot
+        :rtype: TableData
+        """
+
+        grid = self.runtime.call('table', self.locator())
+
+        return TableData(*grid) if grid else TableData([], [])
+
+    def headers(self):
+        """Returns the table headers
+
+        :return: List of headers
+        :rtype: list
+        """
+
+        return self.snapshot().headers
+
+    def column(self, column, numeric=False, as_array=False):
+        """Returns the values of a column
+
+        :param column: Column header or index
+        :param bool numeric: True, to parse the values into floats
+        :param bool as_array: True, to return a NumPy array
+        :return: Column values
+        :rtype: list
+        """
+
+        return self.snapshot().column(column, numeric=numeric, as_array=as_array)
+
+    def rows(self):
+        """Returns the table as a list of rows
+
+        :return: List of rows
+        :rtype: list
+        """
+
+        return self.snapshot().rows()
+
+
 class Text(Element, TextMixin, ClickMixin):
     """The Text implementation
 
@@ -907,5 +1283,130 @@ class Text(Element, TextMixin, ClickMixin):
     pass
 
 
+class VirtualList(Element):
+    """The VirtualList implementation
+
+    Streams the rows of a virtually scrolled or paginated list. Only the rows currently rendered are read, one
+    call per window, once they have stopped changing. Then the list is scrolled (or the next page button within
+    the list's container clicked) and the next window is read once it has rendered. Rows already seen in the
+    previous window are skipped, so memory stays bounded by the window size.
+
+    .. note:: Rows are identified by data-qa-key, aria-rowindex, data-index, data-row-index, data-id or data-key,
+              falling back to the row text.
+
+        **Example Use:**
+
+
+        Let's take the following example:
+
+        .. code-block:: html
+
+            <div id="someClassId" class="someClass" style="overflow: auto; height: 400px">
+                <div role="row" aria-rowindex="1">...</div>
+                <div role="row" aria-rowindex="2">...</div>
+                ...
+            </div>
+
+
+        If the user wants to make the code above recognizable to the testing framework, they
+        would add the attribute "data-qa-id" with a unique value as well as "data-qa-model"
+        with a type. The row selector and next page button selector may be set with "data-qa-rows"
+        and "data-qa-next".
+
+        .. code-block:: html
+
+            <div data-qa-id="some.identifier" data-qa-model="virtuallist" data-qa-rows="[role=row]"
+            id="someClassId" class="someClass" style="overflow: auto; height: 400px">
+                ...
+            </div>
+
+
+        An example on how to interact with the element:
+
+        .. code-block:: python
+
+            from selenium.webdriver import Chrome
+            from sampyl import App
+
+            wd = webdriver.Chrome('/path/to/chromedriver')
+            app = App(wd, "http://someurl.com/path")
+
+            # Prints each row as it is read
+            for row in app.page.some.identifier:
+                print row
+
+    """
+
+    rows_selector = 'tbody > tr, [role="row"], li'
+    next_selector = '[rel="next"], [aria-label="Next"], .next'
+
+    def __iter__(self):
+
+        for chunk in self.chunks():
+            for row in chunk:
+                yield row
+
+    def chunks(self, paginate=False, timeout=10, settle=0.25):
+        """Yield the rows of each window as it is read
+
+        :param bool paginate: True, to click the next page button instead of scrolling
+        :param int timeout: Seconds to wait for the next window to render
+        :param float settle: Seconds the rendered rows must stay unchanged before the window is read
+        :return: Generator of lists of rows, each row is a list of cell values
+        :raises TimeoutException: If the next window does not render and settle within the timeout
+        """
+
+        previous = None
+
+        while True:
+
+            window = [None]
+            stable = []
+
+            def read():
+                """Read the current window, until it holds new rows (or the list's end) and has stopped changing
+
+                :return: True, once the window can be yielded
+                :rtype: bool
+                """
+
+                window[0] = self.runtime.call('window', self.locator(), self.rows_selector, self.next_selector,
+                                              paginate, previous)
+
+                if window[0] is None:
+                    return True
+
+                keys = [key for key, values in window[0][0]]
+
+                # Rows are still rendering, start settling again
+                if not stable or stable[0] != keys:
+                    stable[:] = [keys, time.time()]
+
+                return (window[0][1] or window[0][2]) and time.time() - stable[1] >= settle
+
+            if not self._wait_for(read, timeout, poll_frequency=0.05):
+                raise TimeoutException('The next window of {} did not render within {}s'.format(self.search_term,
+                                                                                               timeout))
+
+            if window[0] is None:
+                return
+
+            data, changed, end = window[0]
+            seen = set(previous or [])
+            fresh = [[value.encode('ascii', 'ignore') if isinstance(value, basestring) else value for value in values]
+                     for key, values in data if key not in seen]
+
+            if fresh:
+                yield fresh
+
+            previous = [key for key, values in data]
+
+            if end or not self.runtime.call('advance', self.locator(), self.next_selector, paginate):
+                return
+
+
 MEMBERS = inspect.getmembers(sys.modules[__name__], predicate=lambda o: inspect.isclass(o) and issubclass(o, Element))
 TYPES = {_type[0].lower(): _type[1] for _type in MEMBERS}
+
+# Structures built for form controls, keyed by input type or tag name
+FIELD_TYPES = {'checkbox': InputCheckbox, 'radio': InputRadio, 'select': Select, 'textarea': InputText}
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""sampyl.core.tabs
+
+.. codeauthor:: John Lane <jlane@fanthreesixty.com>
+
+"""
+
+# pylint: disable=line-too-long
+import time
+import uuid
+from sampyl.core.deadline import DeadlineExceeded, active_deadline
+from sampyl.core.runtime import get_runtime
+from sampyl.core.timing import get_timeline
+from selenium.common.exceptions import NoSuchWindowException, TimeoutException, WebDriverException
+
+__all__ = ['Tab', 'TabSet']
+
+# Opens a tab per [url, name] without waiting for any of them, the opener keeps the windows to poll them later
+OPEN_SCRIPT = "var t=window.__sampyl_tabs=window.__sampyl_tabs||[],u=arguments[0],s=t.length;" \
+              "for(var i=0;i<u.length;i++){t.push(window.open(u[i][0],u[i][1]));}return s;"
+
+# Returns the readyState of each tab opened from this window, null when it cannot be read (cross-origin)
+POLL_SCRIPT = "var t=window.__sampyl_tabs||[],r=[];for(var i=0;i<t.length;i++){try{var w=t[i];" \
+              "r.push(!w||w.closed?'closed':w.location.href==='about:blank'?'loading':w.document.readyState);}" \
+              "catch(e){r.push(null);}}return r;"
+
+# Seconds between polls of the tabs still loading
+POLL_INTERVAL = 0.1
+
+# Seconds to wait for an opened tab to be listed among the window handles
+HANDLE_TIMEOUT = 5
+
+
+class Tab(object):
+    """A browser tab opened by a TabSet
+    """
+
+    def __init__(self, url, index, name):
+
+        self.url = url
+        self.index = index
+        self.name = name
+        self.handle = None
+        self.ready = False
+        self.opened = time.time()
+        self.elapsed = None
+
+    def __repr__(self):
+        return '<{} url="{}" ready="{}">'.format(self.__class__.__name__, self.url, self.ready)
+
+
+class TabSet(object):
+    """The TabSet implementation
+
+    Loads several pages at once, one per tab, so their loads overlap. The tabs are polled together from the window
+    that opened them, in one script, and the driver only switches to a tab once its page is ready. Each tab is
+    opened under a unique window name, its handle is found by that name the first time the driver switches to it.
+
+        **Example Use:**
+
+        .. code-block:: python
+
+            with app.open_tabs(['/reports/1', '/reports/2', '/reports/3']) as tabs:
+
+                for tab in tabs.as_completed():
+                    app.update()
+                    totals[tab.url] = app.page.total.text
+
+    .. note:: Tabs opened on another origin cannot be polled from the opener, the driver switches to them to check.
+
+    """
+
+    def __init__(self, web_driver, urls):
+
+        self.driver = web_driver
+        self.opener = web_driver.current_window_handle
+        self.current = self.opener
+        self.switches = 0
+
+        prefix = '__sampyl_tab_{}_'.format(uuid.uuid4().hex)
+        self._before = frozenset(web_driver.window_handles)
+        self._known = set(self._before)
+
+        with self.timeline.measure('open_tabs', category='navigation', tabs=len(urls)):
+
+            start = web_driver.execute_script(OPEN_SCRIPT, [[url, '{}{}'.format(prefix, i)]
+                                                            for i, url in enumerate(urls)]) or 0
+
+        self.tabs = [Tab(url, start + i, '{}{}'.format(prefix, i)) for i, url in enumerate(urls)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+
+        self.close()
+
+        return False
+
+    def __iter__(self):
+        return iter(self.tabs)
+
+    def __len__(self):
+        return len(self.tabs)
+
+    @property
+    def timeline(self):
+        """Returns the timeline of the driver
+
+        :return: Driver timeline
+        :rtype: Timeline
+        """
+
+        return get_timeline(self.driver)
+
+    def _poll(self, states):
+        """Returns the tabs that became ready, switching to the opener if needed
+
+        :param tuple states: Document states counted as ready
+        :return: Ready tabs
+        :rtype: list
+        :raises NoSuchWindowException: If a tab was closed or blocked from opening
+        """
+
+        self.switch(self.opener)
+
+        ready = []
+        results = self.driver.execute_script(POLL_SCRIPT) or []
+
+        for tab in self.pending():
+
+            result = results[tab.index] if tab.index < len(results) else None
+
+            if result == 'closed':
+                raise NoSuchWindowException('The tab for \'{}\' was closed or blocked from opening'.format(tab.url))
+
+            # Cross-origin, the tab has to be checked from the inside
+            if result is None:
+
+                self.switch(self.resolve(tab))
+
+                try:
+                    result = self.driver.execute_script('return document.readyState;')
+
+                except WebDriverException:
+                    result = None
+
+            if result in states:
+                ready.append(tab)
+
+        return ready
+
+    def as_completed(self, ready='dom', timeout=30):
+        """Switch to each tab as soon as its page is ready, yielding the tab
+
+        .. note:: Each new document gets a new runtime generation, anything read from the page is read from the tab.
+
+        :param str ready: 'dom' (DOMContentLoaded) or 'load'
+        :param int timeout: Seconds to wait for all of the tabs
+        :return: Generator of tabs, in the order they become ready
+        :raises TimeoutException: If tabs are still loading after the timeout
+        :raises NoSuchWindowException: If a tab was closed or blocked from opening
+        """
+
+        states = ('complete',) if ready == 'load' else ('interactive', 'complete')
+        deadline = active_deadline(self.driver)
+        budget = deadline.budget(timeout, 'tabs') if deadline is not None else timeout
+        expires = time.time() + budget
+
+        self.sync()
+
+        while self.pending():
+
+            ready_tabs = self._poll(states)
+
+            for tab in ready_tabs:
+
+                self.switch(self.resolve(tab))
+
+                tab.ready = True
+                tab.elapsed = time.time() - tab.opened
+                self.timeline.record('tab', tab.elapsed, started=tab.opened, category='navigation', url=tab.url)
+
+                yield tab
+
+                # The caller may have switched windows itself
+                self.sync()
+
+            if not ready_tabs and self.pending():
+
+                if time.time() >= expires:
+
+                    # The wait was cut short by the deadline rather than its own timeout
+                    if budget < timeout:
+                        raise DeadlineExceeded(deadline, 'tabs')
+
+                    raise TimeoutException('Tabs still loading after {}s: {}'.format(
+                        timeout, ', '.join([tab.url for tab in self.pending()])))
+
+                time.sleep(POLL_INTERVAL)
+
+    def close(self):
+        """Close every window opened since the tabs were, and return to the opener
+
+        :return:
+        """
+
+        for handle in self.driver.window_handles:
+
+            if handle not in self._before:
+                self.switch(handle)
+                self.driver.close()
+                self.current = None
+
+        for tab in self.tabs:
+            tab.handle = None
+
+        self.switch(self.opener)
+
+    def pending(self):
+        """Returns the tabs still loading
+
+        :return: Tabs not ready yet
+        :rtype: list
+        """
+
+        return [tab for tab in self.tabs if not tab.ready]
+
+    def _match(self, handle, names):
+        """Switch to a new window and give its handle to the tab it belongs to
+
+        :param str handle: Window handle
+        :param dict names: Tabs by window name
+        :return: True, if the window was matched to a tab
+        :rtype: bool
+        """
+
+        self.switch(handle)
+
+        try:
+            name = self.driver.execute_script('return window.name;')
+
+        except WebDriverException:
+            name = None
+
+        if name in names:
+            names[name].handle = handle
+            return True
+
+        # Some browsers clear the name when the tab navigates to another site, fall back to the url
+        matches = [item for item in self.tabs if item.handle is None and item.url == self.driver.current_url]
+
+        if len(matches) == 1:
+            matches[0].handle = handle
+            return True
+
+        return False
+
+    def resolve(self, tab):
+        """Returns a tab's window handle, found by switching to the new windows and reading their names
+
+        .. note:: The order of the window handles is not defined, matching on names never mixes two tabs up. Windows
+                  that lost both their name and url to a redirect are given to the remaining tabs once every tab has
+                  a window, in the order the driver lists them. That is exact when a single tab is left.
+
+        :param Tab tab: Tab opened by this set
+        :return: Window handle
+        :rtype: str
+        :raises NoSuchWindowException: If no window for the tab appears in time
+        """
+
+        expires = time.time() + HANDLE_TIMEOUT
+        names = dict([(item.name, item) for item in self.tabs])
+
+        while tab.handle is None:
+
+            # Opened windows may take a moment to be listed, windows not matched yet are checked again
+            unmatched = [handle for handle in self.driver.window_handles if handle not in self._known]
+
+            for handle in unmatched:
+
+                if self._match(handle, names):
+                    self._known.add(handle)
+
+                if tab.handle is not None:
+                    break
+
+            if tab.handle is None:
+
+                unmatched = [handle for handle in unmatched if handle not in self._known]
+                unresolved = [item for item in self.tabs if item.handle is None]
+
+                if unmatched and len(unmatched) == len(unresolved):
+
+                    for handle, item in zip(unmatched, unresolved):
+                        item.handle = handle
+                        self._known.add(handle)
+
+                    continue
+
+                if time.time() >= expires:
+                    raise NoSuchWindowException('No window was found for the tab \'{}\''.format(tab.url))
+
+                time.sleep(POLL_INTERVAL)
+
+        return tab.handle
+
+    def switch(self, handle):
+        """Switch the driver to a window, unless it is on it already
+
+        :param str handle: Window handle
+        :return: True, if the driver switched windows
+        :rtype: bool
+        """
+
+        if handle == self.current:
+            return False
+
+        self.driver.switch_to.window(handle)
+        self.current = handle
+        self.switches += 1
+
+        # A different window means a different document
+        get_runtime(self.driver).invalidate()
+
+        return True
+
+    def sync(self):
+        """Read the window the driver is on, in case it was switched outside of the set
+
+        :return: Current window handle
+        :rtype: str
+        """
+
+        try:
+            self.current = self.driver.current_window_handle
+
+        except NoSuchWindowException:
+            self.current = None
+
+        return self.current
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""sampyl.core.timing
+
+.. codeauthor:: John Lane <jlane@fanthreesixty.com>
+
+"""
+
+# pylint: disable=line-too-long
+import time
+import weakref
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+__all__ = ['Timeline', 'TimelineEntry', 'get_timeline']
+
+TimelineEntry = namedtuple('TimelineEntry', ['name', 'started', 'elapsed', 'details'])
+
+_TIMELINES = weakref.WeakKeyDictionary()
+
+
+class Timeline(object):
+    """The Timeline implementation
+
+    Records how long SAMpyL spends on each operation performed against a driver.
+
+    """
+
+    def __init__(self, maxlen=1000):
+
+        self.entries = deque(maxlen=maxlen if isinstance(maxlen, int) else 1000)
+
+    def __iter__(self):
+        return iter(list(self.entries))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """Remove all recorded entries
+
+        :return:
+        """
+
+        self.entries.clear()
+
+    @contextmanager
+    def measure(self, name, **details):
+        """Record the time spent inside the with block
+
+        :param str name: Operation name
+        :param details: Additional information to store with the entry
+        :return:
+        """
+
+        started = time.time()
+
+        try:
+            yield details
+
+        finally:
+            self.record(name, time.time() - started, started=started, **details)
+
+    def record(self, name, elapsed, started=None, **details):
+        """Record an operation
+
+        :param str name: Operation name
+        :param float elapsed: Seconds spent on the operation
+        :param float started: Epoch time the operation started
+        :param details: Additional information to store with the entry
+        :return: Recorded entry
+        :rtype: TimelineEntry
+        """
+
+        entry = TimelineEntry(str(name), started if started is not None else time.time() - elapsed,
+                              float(elapsed), details)
+        self.entries.append(entry)
+
+        return entry
+
+    def since(self, started):
+        """Returns entries recorded after an epoch time
+
+        :param float started: Epoch time
+        :return: List of entries
+        :rtype: list
+        """
+
+        return [entry for entry in self if entry.started >= started]
+
+    def summary(self):
+        """Returns the number of calls and total time per operation
+
+        :return: Dictionary of operation name to (count, total seconds)
+        :rtype: dict
+        """
+
+        summary = {}
+
+        for entry in self:
+
+            count, total = summary.get(entry.name, (0, 0.0))
+            summary[entry.name] = (count + 1, total + entry.elapsed)
+
+        return summary
+
+    def total(self, name=None):
+        """Returns the total time spent in seconds
+
+        :param str name: Only include entries with this operation name
+        :return: Total seconds
+        :rtype: float
+        """
+
+        return sum([entry.elapsed for entry in self if name is None or entry.name == name])
+
+
+def get_timeline(web_driver):
+    """Returns the timeline shared by every SAMpyL object using a driver
+
+    :param WebDriver web_driver: Selenium webdriver
+    :return: Driver timeline
+    :rtype: Timeline
+    """
+
+    timeline = _TIMELINES.get(web_driver)
+
+    if timeline is None:
+        timeline = _TIMELINES.setdefault(web_driver, Timeline())
+
+    return timeline
@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+"""sampyl.pool
+
+.. codeauthor:: John Lane <jlane@fanthreesixty.com>
+
+"""
+
+# pylint: disable=line-too-long
+import threading
+import time
+from contextlib import contextmanager
+from Queue import Queue, Empty
+from sampyl.app import App
+from sampyl.core.commands import get_queue
+from sampyl.core.runtime import DEFAULT_SCRIPT_TIMEOUT, get_runtime
+from sampyl.core.scheduler import MIN_INTERVAL, get_scheduler
+from sampyl.core.timing import get_timeline
+from selenium.common.exceptions import WebDriverException
+
+__all__ = ['SessionPool']
+
+# Clears the storage of the document the session is on, before it leaves for about:blank
+CLEAR_STORAGE_SCRIPT = "try{window.localStorage.clear();}catch(e){}try{window.sessionStorage.clear();}catch(e){}"
+
+# WebDriver's default page load timeout in seconds, restored between uses
+PAGE_LOAD_TIMEOUT = 300
+
+# Seconds between checks for failed launches while waiting for an idle session
+WAIT_INTERVAL = 0.1
+
+
+class SessionPool(object):
+    """The SessionPool implementation
+
+    An App factory backed by WebDriver sessions launched ahead of time. Released sessions are reset (extra windows,
+    cookies and storage of the current origin, timeouts, about:blank and SAMpyL's per-driver state) and reused until
+    they fail a health check or reach their maximum number of uses, at which point they are replaced in the
+    background.
+
+        **Example Use:**
+
+        .. code-block:: python
+
+            from selenium import webdriver
+            from sampyl.pool import SessionPool
+
+            pool = SessionPool(lambda: webdriver.Chrome('/path/to/chromedriver'), size=4,
+                               url='http://someurl.com/path')
+
+            with pool.session() as app:
+                app.navigate_to('/login')
+
+            # Number of sessions launched, resets, health check failures, ...
+            pool.metrics()
+
+            pool.close()
+
+    """
+
+    def __init__(self, factory, size=2, max_uses=50, url=None, health_check=True, prewarm=True, **kwargs):
+        """Pool of pre-launched sessions
+
+        :param func factory: Callable returning a new Selenium WebDriver
+        :param int size: Number of sessions kept in the pool
+        :param int max_uses: Uses after which a session is replaced, 0 to reuse sessions indefinitely
+        :param str url: Url passed to each App
+        :param bool health_check: True, to check a session responds before handing it out
+        :param bool prewarm: True, to launch every session up front
+        :param kwargs: Additional App arguments
+        :return:
+        """
+
+        if not hasattr(factory, '__call__'):
+            raise TypeError("'factory' MUST be a callable returning a selenium WebDriver")
+
+        self.factory = factory
+        self.size = size if isinstance(size, int) and size > 0 else 2
+        self.max_uses = max_uses if isinstance(max_uses, int) and max_uses > 0 else 0
+        self.url = url
+        self.health_check = health_check
+        self.app_kwargs = kwargs
+
+        self.counts = {'launched': 0, 'launch_failures': 0, 'acquired': 0, 'released': 0, 'resets': 0,
+                       'recycled': 0, 'unhealthy': 0}
+        self.timings = {'launch': 0.0, 'reset': 0.0, 'wait': 0.0}
+
+        self._idle = Queue()
+        self._uses = {}
+        self._windows = {}
+        self._errors = []
+        self._launching = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        if prewarm:
+            self.prewarm()
+
+    def _count(self, name, elapsed=None, timing=None):
+        """Update the pool metrics
+
+        :param str name: Counter name
+        :param float elapsed: Seconds to add to a timing
+        :param str timing: Timing name
+        :return:
+        """
+
+        with self._lock:
+
+            if name:
+                self.counts[name] += 1
+
+            if timing:
+                self.timings[timing] += elapsed
+
+    def _discard(self, web_driver):
+        """Quit a session and forget it
+
+        :param WebDriver web_driver: Selenium webdriver
+        :return:
+        """
+
+        with self._lock:
+            self._uses.pop(web_driver, None)
+            self._windows.pop(web_driver, None)
+
+        try:
+            web_driver.quit()
+
+        except WebDriverException:
+            pass
+
+    def _healthy(self, web_driver):
+        """Returns True, if the session responds
+
+        :param WebDriver web_driver: Selenium webdriver
+        :return: True, if the session is healthy
+        :rtype: bool
+        """
+
+        try:
+            return web_driver.execute_script('return 1;') == 1
+
+        except (WebDriverException, IOError):
+            return False
+
+    def _launch(self):
+        """Launch a session and add it to the idle sessions
+
+        .. note:: Launch errors are kept and raised by the next acquire, launches usually run in the background.
+
+        :return: True, if the session was launched
+        :rtype: bool
+        """
+
+        started = time.time()
+
+        web_driver = None
+
+        with self._lock:
+            self._launching += 1
+
+        try:
+
+            web_driver = self.factory()
+            window = web_driver.current_window_handle
+
+        except Exception as error:  # pylint: disable=broad-except
+
+            self._count('launch_failures')
+
+            if web_driver is not None:
+                self._discard(web_driver)
+
+            with self._lock:
+                self._launching -= 1
+                self._errors.append(error)
+
+            return False
+
+        self._count('launched', time.time() - started, 'launch')
+
+        with self._lock:
+
+            self._launching -= 1
+
+            if self._closed:
+                web_driver.quit()
+                return False
+
+            self._uses[web_driver] = 0
+            self._windows[web_driver] = window
+
+        self._idle.put(web_driver)
+
+        return True
+
+    def _replace(self):
+        """Launch a session in the background
+
+        :return:
+        """
+
+        thread = threading.Thread(target=self._launch)
+        thread.daemon = True
+        thread.start()
+
+    def acquire(self, timeout=None):
+        """Returns an App on a pooled session
+
+        :param float timeout: Seconds to wait for an idle session, None to wait indefinitely
+        :return: App
+        :rtype: App
+        :raises WebDriverException: If no healthy session becomes available in time
+        :raises Exception: The error of a failed launch, if any
+        """
+
+        started = time.time()
+
+        while True:
+
+            with self._lock:
+                error = self._errors.pop(0) if self._errors else None
+                launch = not self._closed and self._idle.empty() and len(self._uses) + self._launching < self.size
+
+            if error is not None:
+                raise error
+
+            # Nothing idle and nothing on its way (no prewarm, or failed launches)
+            if launch:
+                self._launch()
+                continue
+
+            remaining = None if timeout is None else timeout - (time.time() - started)
+
+            if remaining is not None and remaining <= 0:
+                raise WebDriverException('No pooled session became available within {}s'.format(timeout))
+
+            wait = WAIT_INTERVAL if remaining is None else min(remaining, WAIT_INTERVAL)
+
+            try:
+                web_driver = self._idle.get(timeout=wait)
+
+            except Empty:
+                continue
+
+            if not self.health_check or self._healthy(web_driver):
+                break
+
+            self._count('unhealthy')
+            self._discard(web_driver)
+            self._replace()
+
+        with self._lock:
+
+            self._uses[web_driver] = self._uses.get(web_driver, 0) + 1
+            self.counts['acquired'] += 1
+            self.timings['wait'] += time.time() - started
+
+        return App(web_driver, url=self.url, **self.app_kwargs)
+
+    def close(self):
+        """Quit every idle session, sessions still in use are quit when released
+
+        :return:
+        """
+
+        with self._lock:
+            self._closed = True
+
+        while True:
+
+            try:
+                self._discard(self._idle.get_nowait())
+
+            except Empty:
+                break
+
+    def metrics(self):
+        """Returns the pool metrics
+
+        :return: Counters, timings in seconds and the number of idle and in use sessions
+        :rtype: dict
+        """
+
+        with self._lock:
+
+            metrics = dict(self.counts)
+            metrics.update(dict([('{}_time'.format(name), value) for name, value in self.timings.items()]))
+            metrics['idle'] = self._idle.qsize()
+            metrics['in_use'] = len(self._uses) - metrics['idle']
+
+        return metrics
+
+    def prewarm(self):
+        """Launch sessions in parallel until the pool is full
+
+        :return: Number of sessions launched
+        :rtype: int
+        """
+
+        with self._lock:
+            missing = self.size - len(self._uses)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self._launch())) for _ in range(max(0, missing))]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        return len([result for result in results if result])
+
+    def release(self, app):
+        """Reset an App's session and return it to the pool
+
+        :param App app: App returned by acquire
+        :return:
+        """
+
+        web_driver = app.driver if isinstance(app, App) else app
+
+        with self._lock:
+            self.counts['released'] += 1
+            uses = self._uses.get(web_driver)
+            closed = self._closed
+
+        if uses is None:
+            return
+
+        if closed or (self.max_uses and uses >= self.max_uses):
+
+            self._discard(web_driver)
+
+            if not closed:
+                self._count('recycled')
+                self._replace()
+
+            return
+
+        if self.reset(web_driver):
+            self._idle.put(web_driver)
+
+        else:
+            self._count('unhealthy')
+            self._discard(web_driver)
+            self._replace()
+
+    def reset(self, web_driver):
+        """Clear a session's state: extra windows, cookies and storage of the current origin, timeouts, the page and
+        SAMpyL's per-driver state
+
+        .. note:: WebDriver only reaches the cookies and storage of the current document. Other origins the test
+                  visited keep theirs, tests sharing a pool should leave the session on the origin they stored state
+                  on, or use max_uses=1 when they span several origins.
+
+        :param WebDriver web_driver: Selenium webdriver
+        :return: True, if the session was reset
+        :rtype: bool
+        """
+
+        started = time.time()
+
+        try:
+
+            # Keep the window the session started with, or any other if it was closed
+            handles = web_driver.window_handles
+            keep = self._windows.get(web_driver)
+            keep = keep if keep in handles else handles[0]
+
+            for handle in handles:
+
+                if handle != keep:
+                    web_driver.switch_to.window(handle)
+                    web_driver.close()
+
+            web_driver.switch_to.window(keep)
+            self._windows[web_driver] = keep
+
+            if web_driver.current_url.startswith(('http://', 'https://')):
+                web_driver.execute_script(CLEAR_STORAGE_SCRIPT)
+                web_driver.delete_all_cookies()
+
+            web_driver.get('about:blank')
+
+            web_driver.set_script_timeout(DEFAULT_SCRIPT_TIMEOUT)
+            web_driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+            web_driver.implicitly_wait(0)
+
+        except (WebDriverException, IOError, IndexError):
+            return False
+
+        # Anything SAMpyL holds for the previous test
+        runtime = get_runtime(web_driver)
+        runtime.invalidate()
+        runtime.hooks = []
+        runtime.implicit_wait = 0
+        runtime.script_timeout = None
+        get_timeline(web_driver).clear()
+
+        # The next App serializes commands again if it is thread safe
+        queue = get_queue(web_driver)
+
+        if queue is not None:
+            queue.uninstall()
+
+        scheduler = get_scheduler(web_driver)
+        scheduler.interval = MIN_INTERVAL
+        scheduler.ticks = scheduler.probes = 0
+
+        self._count('resets', time.time() - started, 'reset')
+
+        return True
+
+    @contextmanager
+    def session(self, timeout=None):
+        """Use an App on a pooled session for the duration of the with block
+
+        :param float timeout: Seconds to wait for an idle session, None to wait indefinitely
+        :return:
+        """
+
+        app = self.acquire(timeout)
+
+        try:
+            yield app
+
+        finally:
+            self.release(app)
@@ -16,6 +16,7 @@ setup(
     download_url='https://github.com/jlane9/SAMpyL/tarball/%s' % __version__,
     keywords='testing selenium qa web automation',
     install_requires=['lxml', 'cssselect', 'PyYAML'],
+    extras_require={'numpy': ['numpy']},
     license=__license__,
     classifiers=['Development Status :: 3 - Alpha',
                  'Intended Audience :: Developers',
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Test doubles for a Selenium WebDriver, no browser required
+"""
+
+from selenium.common.exceptions import NoSuchElementException, NoSuchWindowException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+
+class FakeElement(WebElement):
+    """WebElement answering from a dict of attributes
+    """
+
+    def __init__(self, driver, id_, attrs=None, displayed=True, tag='div'):
+
+        WebElement.__init__(self, driver, id_)
+        self.attrs = attrs or {}
+        self.displayed = displayed
+        self.tag = tag
+
+    def click(self):
+
+        self._parent.calls.append(('click', self.id))
+        self.attrs['checked'] = not self.attrs.get('checked')
+
+    def get_attribute(self, name):
+        return self.attrs.get(name)
+
+    def is_displayed(self):
+        return self.displayed
+
+    def is_selected(self):
+        return bool(self.attrs.get('checked'))
+
+    @property
+    def tag_name(self):
+        return self.tag
+
+
+class FakeSwitchTo(object):
+    """Window switching of a FakeDriver
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+
+        self.driver.calls.append(('switch', handle))
+
+        if handle not in self.driver.handles:
+            raise NoSuchWindowException()
+
+        self.driver.handle = handle
+
+
+class FakeDriver(WebDriver):
+    """WebDriver recording every call
+
+    Runtime calls (window.__sampyl functions) are answered by ``functions``, a dict of callables taking the
+    function arguments. Other scripts are answered by ``scripts``, a callable taking the script and its arguments.
+    """
+
+    def __init__(self, url='about:blank'):
+
+        # WebDriver.__init__ starts a session, only set what the tested code reads
+        self.session_id = 'fake'
+        self.w3c = False
+        self.calls = []
+        self.elements = {}
+        self.functions = {}
+        self.scripts = None
+        self.url = url
+        self.handles = ['main']
+        self.handle = 'main'
+        self.capabilities = {}
+        self.cookies = []
+
+    @property
+    def current_url(self):
+        return self.url
+
+    @property
+    def current_window_handle(self):
+        return self.handle
+
+    @property
+    def window_handles(self):
+        return list(self.handles)
+
+    @property
+    def switch_to(self):
+        return FakeSwitchTo(self)
+
+    def add_cookie(self, cookie_dict):
+
+        self.calls.append(('add_cookie', cookie_dict.get('name')))
+        self.cookies.append(dict(cookie_dict))
+
+    def close(self):
+
+        self.calls.append(('close', self.handle))
+        self.handles.remove(self.handle)
+
+    def _answer(self, script, args):
+
+        if len(args) == 2 and isinstance(args[0], basestring) and args[0] in self.functions:
+            return self.functions[args[0]](*args[1])
+
+        return self.scripts(script, args) if self.scripts else None
+
+    def delete_all_cookies(self):
+
+        self.calls.append(('delete_all_cookies',))
+        self.cookies = []
+
+    def execute_script(self, script, *args):
+
+        self.calls.append(('execute_script', args))
+        return self._answer(script, args)
+
+    def execute_async_script(self, script, *args):
+
+        self.calls.append(('execute_async_script', args))
+        return self._answer(script, args)
+
+    def find_element(self, by='id', value=None):
+
+        self.calls.append(('find_element', by, value))
+
+        if (by, value) not in self.elements:
+            raise NoSuchElementException()
+
+        return self.elements[(by, value)]
+
+    def find_elements(self, by='id', value=None):
+
+        self.calls.append(('find_elements', by, value))
+        return [self.elements[(by, value)]] if (by, value) in self.elements else []
+
+    def get(self, url):
+
+        self.calls.append(('get', url))
+        self.url = url
+
+    def get_cookies(self):
+        return [dict(cookie) for cookie in self.cookies]
+
+    def implicitly_wait(self, time_to_wait):
+        self.calls.append(('implicitly_wait', time_to_wait))
+
+    def set_script_timeout(self, time_to_wait):
+        self.calls.append(('set_script_timeout', time_to_wait))
+
+    def quit(self):
+        self.calls.append(('quit',))
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""A local stand-in for a WebDriver server, speaking the JSON wire protocol over persistent connections
+"""
+
+import itertools
+import json
+import socket
+import threading
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers WebDriver commands from the server's state
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    # Buffer the response, headers and body are flushed together once the request is handled
+    wbufsize = -1
+
+    def setup(self):
+
+        BaseHTTPRequestHandler.setup(self)
+
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.sockets.append(self.connection)
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, session_id, value, status=0):
+
+        body = json.dumps({'sessionId': session_id, 'status': status, 'value': value})
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method):
+
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+        parts = self.path.split('/session', 1)[-1].strip('/').split('/')
+
+        with self.server.lock:
+            self.server.requests.append((method, self.path, body))
+
+        if method == 'POST' and parts == ['']:
+            return self._reply(self.server.new_session(), {'browserName': 'stub'})
+
+        session_id, command = parts[0], '/'.join(parts[1:])
+        session = self.server.sessions.get(session_id)
+
+        # The command was received, the connection is lost before the response
+        if command in self.server.hang_up:
+            self.close_connection = 1
+            return
+
+        if session is None:
+            return self._reply(session_id, 'No such session', status=6)
+
+        return self._reply(session_id, self.server.answer(session, method, command, body))
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    """WebDriver stand-in
+
+    Sessions hold a url, cookies, windows, timeouts and the urls cookies were deleted on. Scripts are answered by
+    ``script_handler``, a callable taking the session, the script and its arguments. Commands in ``hang_up`` are
+    received but never answered.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StubHandler)
+
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.sockets = []
+        self.requests = []
+        self.sessions = {}
+        self.script_handler = None
+        self.hang_up = set()
+
+        self._ids = itertools.count(1)
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,))
+        self._thread.daemon = True
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d/wd/hub' % self.server_port
+
+    def answer(self, session, method, command, body):
+        """Returns the value of a command
+
+        :param dict session: Session state
+        :param str method: HTTP method
+        :param str command: Command path after the session id
+        :param dict body: Command parameters
+        :return: Command value
+        """
+
+        if command == 'url':
+
+            if method == 'POST':
+                session['url'] = body['url']
+                return None
+
+            return session['url']
+
+        if command == 'cookie':
+
+            if method == 'DELETE':
+                session['cleared'].append(session['url'])
+                session['cookies'] = []
+                return None
+
+            if method == 'POST':
+                session['cookies'].append(body['cookie'])
+                return None
+
+            return session['cookies']
+
+        if command == 'window_handles':
+            return list(session['windows'])
+
+        if command == 'window_handle':
+            return session['window']
+
+        if command == 'window' and method == 'POST':
+            session['window'] = body.get('name') or body.get('handle')
+            return None
+
+        if command == 'window' and method == 'DELETE':
+            session['windows'].remove(session['window'])
+            return list(session['windows'])
+
+        if command.startswith('timeouts'):
+            session['timeouts'][body.get('type') or command.split('/')[-1]] = body.get('ms')
+            return None
+
+        if command.startswith('execute'):
+            handler = self.script_handler
+            return handler(session, body.get('script'), body.get('args')) if handler else None
+
+        return None
+
+    def drop(self):
+        """Close every open connection, as a proxy timing out idle connections would
+
+        :return:
+        """
+
+        with self.lock:
+            sockets, self.sockets = self.sockets, []
+
+        for sock in sockets:
+
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+
+            except socket.error:
+                pass
+
+    def new_session(self):
+        """Create a session
+
+        :return: Session id
+        :rtype: str
+        """
+
+        session_id = 'session-%d' % next(self._ids)
+
+        self.sessions[session_id] = {'id': session_id, 'url': 'about:blank', 'cookies': [], 'windows': ['main'],
+                                     'window': 'main', 'timeouts': {}, 'cleared': []}
+
+        return session_id
+
+    def start(self):
+        """Serve requests in a background thread
+
+        :return: Server
+        :rtype: StubServer
+        """
+
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        """Stop serving and close every connection
+
+        :return:
+        """
+
+        self.shutdown()
+        self.drop()
+        self.server_close()
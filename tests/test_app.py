@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.app
+"""
+
+import threading
+import time
+import unittest
+from fakes import FakeDriver, FakeElement
+from sampyl.app import App, Node, _instrument
+from sampyl.core.element import ElementCollection
+
+
+class NodeTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.link = FakeElement(self.driver, 'link-1', attrs={'href': 'http://site.test/next', 'id': 'next'})
+        self.elements = []
+        self.type = [None, 0]
+
+        self.driver.functions.update({
+            'type': lambda attr, type_attr, identifier: self.type,
+            'exists': lambda chain: bool(self.elements),
+            'all': lambda attr, identifier: self.elements,
+            'attribute': lambda chain, name: [bool(self.elements), self.elements[0].get_attribute(name)
+                                              if self.elements else None],
+        })
+
+        self.node = Node(self.driver, 'next')
+
+    def test_dom_attributes(self):
+
+        self.type, self.elements = ['link', 1], [self.link]
+
+        self.assertEqual(self.node.href, 'http://site.test/next')
+        self.assertEqual(self.node.id, 'next')
+
+    def test_missing_element_is_described_again(self):
+
+        self.assertEqual(self.node.this.__class__.__name__, 'Text')
+
+        self.type, self.elements = ['link', 2], [self.link, self.link]
+
+        self.assertIsInstance(self.node.this, ElementCollection)
+
+    def test_duplicates_resolve_to_a_collection(self):
+
+        self.type, self.elements = ['button', 2], [self.link, self.link]
+        self.driver.functions['collect'] = lambda chain, filters, operation, argument: [u'Next', u'Next']
+
+        self.assertIsInstance(self.node.this, ElementCollection)
+        self.assertEqual(self.node.texts(), ['Next', 'Next'])
+
+    def test_structure_method_on_a_collection_raises(self):
+
+        self.type, self.elements = ['button', 2], [self.link, self.link]
+        self.driver.functions['collect'] = lambda chain, filters, operation, argument: 2
+
+        with self.assertRaises(AttributeError) as context:
+            self.node.click()
+
+        self.assertIn('matches 2 elements, click() needs a single element', str(context.exception))
+
+        # DOM attributes are still read from the first match
+        self.assertEqual(self.node.href, 'http://site.test/next')
+
+    def test_structure_cached_within_generation(self):
+
+        self.type = ['link', 1]
+        this = self.node.this
+        self.type = ['button', 1]
+
+        self.assertIs(self.node.this, this)
+
+        App(self.driver).runtime.invalidate()
+
+        self.assertIsNot(self.node.this, this)
+
+    def test_threads_describe_once(self):
+
+        described = []
+
+        def describe(attr, type_attr, identifier):
+            described.append(identifier)
+            time.sleep(0.05)
+            return ['link', 1]
+
+        self.driver.functions['type'] = describe
+        found = []
+        threads = [threading.Thread(target=lambda: found.append(self.node.this)) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(described, ['next'])
+        self.assertEqual(len(set(found)), 1)
+
+
+class NavigateTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.app = App(self.driver, 'http://site.test')
+        self.app.use_client_routing()
+        self.driver.url = 'http://site.test/a'
+        self.route = ['ok', 0.1]
+        self.driver.functions['route'] = lambda url, script, settle, timeout: self.route
+
+    def test_same_url_is_skipped(self):
+
+        del self.driver.calls[:]
+        self.app.navigate_to('/a')
+
+        self.assertEqual(self.driver.calls, [])
+
+    def test_client_route(self):
+
+        generation = self.app.runtime.generation
+        self.app.navigate_to('/b')
+
+        self.assertNotIn(('get', 'http://site.test/b'), self.driver.calls)
+        self.assertEqual(self.app.runtime.generation, generation + 1)
+
+    def test_timeout_falls_back_to_load(self):
+
+        self.route = ['timeout', 30]
+        self.app.navigate_to('/b')
+
+        self.assertEqual(self.driver.calls[-1], ('get', 'http://site.test/b'))
+
+    def test_failed_route_falls_back_to_load(self):
+
+        self.route = ['failed', 0]
+        self.app.navigate_to('/b')
+
+        self.assertEqual(self.driver.calls[-1], ('get', 'http://site.test/b'))
+
+
+class GetTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.driver.scripts = lambda script, args: [False, 'complete', [0.1, 0.2, 0.3]]
+        self.states = []
+        self.driver.functions.update({
+            'probe': lambda probes: [self.driver.functions[name](*args) for name, args in probes],
+            'state': lambda attr, identifier, partial: self.states.append((identifier, partial)) or 2,
+        })
+        self.app = App(self.driver)
+
+    def test_plain_load(self):
+
+        generation = self.app.runtime.generation
+        self.app.runtime.injected = True
+        self.app.get('http://site.test/a')
+
+        self.assertEqual(self.driver.calls, [('get', 'http://site.test/a')])
+        self.assertFalse(self.app.runtime.injected)
+        self.assertEqual(self.app.runtime.generation, generation + 1)
+
+    def test_identifiers_matched_exactly(self):
+
+        self.assertTrue(self.app.get('http://site.test/a', ready=['reports', Node(self.driver, 'filters')]))
+        self.assertEqual(self.states[-2:], [('reports', False), ('filters', False)])
+
+    def test_float_timeout_passed_through(self):
+
+        self.app.get('http://site.test/a', ready='dom', timeout=2.5)
+        waits = [entry for entry in self.app.timeline if entry.name == 'wait']
+        entry = [entry for entry in self.app.timeline if entry.name == 'get'][0]
+
+        self.assertEqual(waits[0].details['timeout'], 2.5)
+        self.assertEqual(entry.details['ttfb'], 0.1)
+        self.assertTrue(entry.details['ready_met'])
+
+    def test_predicate_gets_remaining_seconds(self):
+
+        seen = []
+        self.app.get('http://site.test/a', ready=lambda app: seen.append(True) or True, timeout=0.5)
+        wait = [entry for entry in self.app.timeline if entry.name == 'wait'][1]
+
+        self.assertEqual(seen, [True])
+        self.assertTrue(0.1 <= wait.details['timeout'] <= 0.5)
+
+
+
+class WaitUntilIdleTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.idle = []
+        self.instrumented = 0
+        self.status = 'ok'
+        self.driver.functions.update({'idle': self.wait, 'instrument': self.instrument})
+        self.app = App(self.driver)
+
+    def wait(self, quiet, max_timer, timeout):
+
+        self.idle.append((quiet, max_timer, timeout))
+
+        return [self.status, 0.2, 0]
+
+    def instrument(self):
+
+        self.instrumented += 1
+
+        return True
+
+    def test_instruments_then_waits(self):
+
+        self.assertTrue(self.app.wait_until_idle(timeout=5, quiet=0.2, max_timer=2))
+
+        self.assertIn(_instrument, self.app.runtime.hooks)
+        self.assertEqual(self.instrumented, 1)
+        self.assertEqual(self.idle, [(200, 2000, 5000)])
+
+        # The page was instrumented before the wait started
+        names = [call[1][0] for call in self.driver.calls if call[1]]
+        self.assertEqual(names, ['instrument', 'idle'])
+
+    def test_hook_installed_once(self):
+
+        self.app.wait_until_idle()
+        self.app.wait_until_idle()
+
+        self.assertEqual(self.app.runtime.hooks.count(_instrument), 1)
+        self.assertEqual(self.instrumented, 1)
+
+    def test_hook_kept_across_get(self):
+
+        self.app.wait_until_idle()
+        self.app.get('http://site.test/next')
+
+        # The new document is instrumented as soon as it is loaded
+        self.assertIn(_instrument, self.app.runtime.hooks)
+        self.assertEqual(self.instrumented, 2)
+
+    def test_timeout(self):
+
+        self.status = 'timeout'
+
+        self.assertFalse(self.app.wait_until_idle(timeout=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
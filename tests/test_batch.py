@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.batch
+"""
+
+import unittest
+from fakes import FakeDriver
+from sampyl.app import App
+from sampyl.core.batch import BatchStep
+from sampyl.core.structures import Button, InputText
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.keys import Keys
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.app = App(self.driver)
+        self.payloads = []
+        self.answers = None
+        self.driver.functions['batch'] = self.batch
+
+        self.submit = Button(self.driver, 'id', 'submit')
+        self.user = InputText(self.driver, 'id', 'user')
+
+    def batch(self, steps):
+
+        self.payloads.append(steps)
+
+        if self.answers:
+            return self.answers.pop(0)
+
+        return [['ok', True] for _ in steps]
+
+    def test_steps_run_in_one_script(self):
+
+        with self.app.batch() as batch:
+
+            step = self.user.input('jane')
+            self.submit.click()
+            self.submit.click()
+
+            self.assertIsInstance(step, BatchStep)
+
+        self.assertEqual(batch.scripts, 1)
+        self.assertEqual([payload[1] for payload in self.payloads[0]], ['input', 'click', 'click'])
+        self.assertEqual(self.payloads[0][0][2], [u'jane', False])
+        self.assertEqual(batch.results(), [True, True, True])
+
+    def test_native_step_splits_the_script(self):
+
+        with self.app.batch() as batch:
+            self.submit.click()
+            native = self.user.input(Keys.ENTER)
+            self.submit.click()
+
+        # The native step runs through the regular implementation, between two scripts
+        self.assertTrue(native.native)
+        self.assertEqual(batch.scripts, 2)
+        self.assertEqual(len(self.payloads), 2)
+
+    def test_step_found_native_by_the_script_runs_natively(self):
+
+        self.answers = [[['ok', True], ['native', None]], [['ok', True]]]
+
+        with self.app.batch() as batch:
+            self.submit.click()
+            second = self.submit.click()
+            self.submit.click()
+
+        self.assertTrue(second.native)
+        self.assertIn(second.status, ('native', 'error'))
+        self.assertEqual(batch.scripts, 2)
+
+    def test_missing_results_raise(self):
+
+        # The page unloaded during the first script, the second segment never runs
+        self.answers = [None]
+
+        with self.assertRaises(WebDriverException) as context:
+
+            with self.app.batch():
+                first = self.submit.click()
+                second = self.user.input('jane')
+                native = self.user.input(Keys.ENTER)
+
+        self.assertIn('click, input', str(context.exception))
+        self.assertEqual((first.status, second.status, native.status), ('error', 'error', 'cancelled'))
+        self.assertIs(first.error, context.exception)
+
+    def test_short_results_raise(self):
+
+        self.answers = [[['ok', True]]]
+
+        with self.assertRaises(WebDriverException):
+
+            with self.app.batch():
+                first = self.submit.click()
+                second = self.submit.click()
+
+        self.assertEqual((first.status, second.status), ('ok', 'error'))
+
+    def test_cancelled_on_error(self):
+
+        try:
+
+            with self.app.batch() as batch:
+                step = self.submit.click()
+                raise ValueError()
+
+        except ValueError:
+            pass
+
+        self.assertEqual(step.status, 'cancelled')
+        self.assertEqual(batch.scripts, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.commands
+"""
+
+import gc
+import threading
+import time
+import unittest
+import weakref
+from fakes import FakeDriver
+from stub_server import StubServer
+from sampyl.core.commands import CommandQueue, _Read, get_queue, serialize
+from sampyl.core.runtime import get_runtime
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver import Remote
+
+
+class CommandQueueTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.server = StubServer().start()
+        self.server.script_handler = self.answer
+        self.scripts = 0
+        self.driver = Remote(command_executor=self.server.url, desired_capabilities={'browserName': 'stub'})
+        self.queue = serialize(self.driver)
+        self.runtime = get_runtime(self.driver)
+
+    def tearDown(self):
+
+        self.driver.quit()
+        self.server.stop()
+
+    def answer(self, session, script, args):
+
+        self.scripts += 1
+
+        # Leave time for other threads to queue their reads
+        time.sleep(0.01)
+
+        name, arguments = args
+
+        if name == 'probe':
+            return [arguments[0][i][1][0] for i in range(len(arguments[0]))]
+
+        return arguments[0]
+
+    def test_sequential_reads_not_merged(self):
+
+        self.assertEqual([self.runtime.call('value', i) for i in range(5)], range(5))
+        self.assertEqual(self.scripts, 5)
+        self.assertEqual(self.queue.merged, 0)
+        self.assertEqual(self.queue.commands, 5)
+
+    def test_concurrent_reads_merged(self):
+
+        results = {}
+
+        def read(thread):
+            results[thread] = [self.runtime.call('value', thread * 10 + i) for i in range(5)]
+
+        threads = [threading.Thread(target=read, args=(thread,)) for thread in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        # Every read answered with its own result, in fewer scripts than reads
+        self.assertEqual(results, dict([(thread, [thread * 10 + i for i in range(5)]) for thread in range(8)]))
+        self.assertEqual(self.scripts + self.queue.merged, 40)
+        self.assertLess(self.scripts, 40)
+
+    def test_writes_not_merged(self):
+
+        threads = [threading.Thread(target=self.runtime.call, args=('scroll', i)) for i in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.scripts, 4)
+        self.assertEqual(self.queue.merged, 0)
+
+    def test_runtime_shares_the_queue_lock(self):
+
+        # Injection state changes while holding the session
+        self.assertIs(self.runtime.lock, self.queue.lock)
+
+    def test_uninstalled_on_quit(self):
+
+        self.driver.quit()
+
+        self.assertIsNone(get_queue(self.driver))
+        self.assertNotIn('execute', self.driver.__dict__)
+
+
+class DrainTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.queue = CommandQueue(self.driver)
+        self.runtime = get_runtime(self.driver)
+
+    def test_merged_error_completes_every_read(self):
+
+        def probe(probes):
+            raise WebDriverException('session lost')
+
+        self.driver.functions['probe'] = probe
+
+        # A read queued by another thread, carried by this thread's script
+        other = _Read('value', [1])
+        self.queue._pending.append(other)
+
+        self.assertRaises(WebDriverException, self.queue.read, self.runtime, 'value', (2,))
+        self.assertTrue(other.done)
+        self.assertIsInstance(other.error, WebDriverException)
+        self.assertEqual(self.queue._pending, [])
+
+    def test_short_result_completes_every_read(self):
+
+        self.driver.functions['probe'] = lambda probes: None
+
+        other = _Read('value', [1])
+        self.queue._pending.append(other)
+
+        self.assertIsNone(self.queue.read(self.runtime, 'value', (2,)))
+        self.assertTrue(other.done)
+
+    def test_driver_collected(self):
+
+        driver = FakeDriver()
+        queue = serialize(driver)
+        reference = weakref.ref(driver)
+
+        del driver
+        gc.collect()
+
+        self.assertIsNone(reference())
+        self.assertIsNone(queue.driver)
+
+
+if __name__ == '__main__':
+    unittest.main()
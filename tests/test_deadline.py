@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.deadline
+"""
+
+import threading
+import time
+import unittest
+from fakes import FakeDriver
+from sampyl.app import App
+from sampyl.core.deadline import Deadline, DeadlineExceeded, active_deadline
+from sampyl.core.timing import get_timeline
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.timeline = get_timeline(self.driver)
+
+    def test_active_on_the_current_thread_only(self):
+
+        seen = []
+
+        with Deadline(self.driver, 5) as deadline:
+
+            thread = threading.Thread(target=lambda: seen.append(active_deadline(self.driver)))
+            thread.start()
+            thread.join()
+
+            self.assertIs(active_deadline(self.driver), deadline)
+
+        self.assertEqual(seen, [None])
+        self.assertIsNone(active_deadline(self.driver))
+
+    def test_nested_deadline_never_extends(self):
+
+        with Deadline(self.driver, 1) as outer:
+
+            with Deadline(self.driver, 10) as inner:
+                self.assertEqual(inner.expires, outer.expires)
+                self.assertIs(active_deadline(self.driver), inner)
+
+            self.assertIs(active_deadline(self.driver), outer)
+
+    def test_budget(self):
+
+        with Deadline(self.driver, 2) as deadline:
+            self.assertEqual(deadline.budget(0.5), 0.5)
+            self.assertTrue(1 < deadline.budget(30) <= 2)
+
+    def test_exceeded_names_the_consumers(self):
+
+        with self.assertRaises(DeadlineExceeded) as context:
+
+            with Deadline(self.driver, 0.05) as deadline:
+
+                self.timeline.record('wait', 0.04, started=deadline.started)
+                self.timeline.record('click', 0.01, started=deadline.started)
+                time.sleep(0.06)
+                deadline.check('expand')
+
+        message = str(context.exception)
+
+        self.assertIn('during expand', message)
+        self.assertLess(message.index('wait'), message.index('click'))
+        self.assertTrue(list(self.timeline)[-1].details['exceeded'])
+
+    def test_waits_cut_short(self):
+
+        app = App(self.driver)
+        self.driver.functions['probe'] = lambda probes: [0 for _ in probes]
+        started = time.time()
+
+        with self.assertRaises(DeadlineExceeded):
+
+            with app.deadline(0.3):
+                app.wait_until_present('results', timeout=30)
+
+        self.assertLess(time.time() - started, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
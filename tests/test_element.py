@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.element
+"""
+
+import unittest
+from fakes import FakeDriver, FakeElement
+from sampyl.core.element import IDENTIFIER, Element, ElementCollection, css_string, relative_xpath
+from sampyl.core.structures import Dropdown
+
+
+class ScopedElement(FakeElement):
+
+    def __init__(self, driver, id_):
+
+        FakeElement.__init__(self, driver, id_)
+        self.searches = []
+
+    def find_elements(self, by='id', value=None):
+
+        self.searches.append((by, value))
+        return []
+
+
+class RelativeXpathTest(unittest.TestCase):
+
+    def test_every_branch(self):
+        self.assertEqual(relative_xpath('/a | //b'), './a|.//b')
+
+    def test_grouped_branch(self):
+        self.assertEqual(relative_xpath('(//li)[1]'), '(.//li)[1]')
+
+    def test_relative_branches_kept(self):
+        self.assertEqual(relative_xpath('./a|following-sibling::b'), './a|following-sibling::b')
+
+    def test_unions_in_predicates_and_strings_kept(self):
+        self.assertEqual(relative_xpath('/a[@x="1|/2" or (@y|@z)]'), './a[@x="1|/2" or (@y|@z)]')
+
+
+class FindElementsTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.scope = ScopedElement(self.driver, 'scope')
+        self.driver.elements[('id', 'root')] = self.scope
+        self.root = Element(self.driver, 'id', 'root')
+
+    def test_identifier_escaped(self):
+
+        Element(self.driver, IDENTIFIER, 'say "hi" \\o/', within=self.root).find_elements()
+
+        self.assertEqual(self.scope.searches, [('css selector', '[data-qa-id="say \\"hi\\" \\\\o/"]')])
+
+    def test_dropdown_container_within_root(self):
+
+        dropdown = Dropdown(self.driver, 'id', 'root')
+        dropdown._container.find_elements()
+
+        self.assertIs(dropdown._container.within, dropdown)
+        self.assertEqual([branch[:2] for branch in self.scope.searches[0][1].split('|')], ['./', './'])
+
+    def test_css_string(self):
+        self.assertEqual(css_string('a"b\\c\nd'), '"a\\"b\\\\c\\a d"')
+
+
+
+class AccessorTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.attrs = {'href': 'http://site.test/next', 'class': 'nav', 'data-qa-id': 'next'}
+        self.driver.functions.update({
+            'attribute': lambda chain, name: [True, self.attrs.get(name)] if self.attrs is not None else [False, None],
+            'css': lambda chain, prop: 'block' if self.attrs is not None else None,
+            'tag': lambda chain: 'a' if self.attrs is not None else None,
+        })
+        self.element = Element(self.driver, 'id', 'next')
+
+    def native(self):
+        return [call for call in self.driver.calls if call[0] != 'execute_script']
+
+    def test_read_in_one_call(self):
+
+        self.assertEqual(self.element.href, 'http://site.test/next')
+        self.assertEqual(self.element.class_, 'nav')
+        self.assertEqual(self.element.data_qa_id, 'next')
+        self.assertEqual(self.element.css_property('display'), 'block')
+        self.assertEqual(self.element.tag_name, 'a')
+
+        # One script per read, nothing located through the driver
+        self.assertEqual(len(self.driver.calls), 5)
+        self.assertEqual(self.native(), [])
+
+    def test_missing_element(self):
+
+        self.attrs = None
+
+        self.assertEqual(self.element.href, '')
+        self.assertEqual(self.element.tag_name, '')
+        self.assertEqual(str(self.element), '')
+        self.assertEqual(len(self.driver.calls), 3)
+        self.assertEqual(self.native(), [])
+
+    def test_wait_implicitly(self):
+
+        self.assertTrue(self.element.wait_implicitly(5))
+
+        self.assertEqual(self.element.runtime.implicit_wait, 5)
+        self.assertEqual(self.driver.calls, [('implicitly_wait', 0)])
+        self.assertFalse(self.element.wait_implicitly('5'))
+
+    def test_acquire_waits_up_to_the_implicit_wait(self):
+
+        self.element.wait_implicitly(1)
+        link = FakeElement(self.driver, 'link-1')
+        self.driver.functions['probe'] = lambda probes: [self.driver.elements.setdefault(('id', 'next'), link) and True
+                                                         for _ in probes]
+
+        self.assertIs(self.element._acquire(), link)
+
+    def test_acquire_does_not_wait_without_implicit_wait(self):
+
+        self.driver.functions['probe'] = lambda probes: self.fail('waited')
+
+        self.assertIsNone(self.element._acquire())
+
+
+
+class ElementCollectionTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.members = [
+            {'text': u'Home', 'href': '/', 'visible': True},
+            {'text': u'Reports \u2192', 'href': '/reports', 'visible': True},
+            {'text': u'Admin', 'href': None, 'visible': False},
+        ]
+        self.collects = []
+        self.driver.functions['collect'] = self.collect
+        self.links = ElementCollection(self.driver, 'css selector', 'nav a')
+
+    def collect(self, chain, filters, operation, argument):
+        """Answers like the runtime's collect function, over member dicts
+        """
+
+        self.collects.append((chain, filters, operation, argument))
+        members = [member for member in self.members if self.keep(member, filters)]
+
+        if operation == 'count':
+            return len(members)
+
+        if operation == 'elements':
+            return [FakeElement(self.driver, member['text']) for member in members]
+
+        if operation == 'click':
+            return len(members)
+
+        key = {'texts': 'text', 'attributes': argument, 'visible': 'visible'}[operation]
+
+        return [member.get(key) for member in members]
+
+    @staticmethod
+    def keep(member, filters):
+
+        for item in filters:
+
+            if item[0] == 'visible' and member['visible'] != item[1]:
+                return False
+
+            if item[0] == 'contains' and item[1] not in member['text']:
+                return False
+
+            if item[0] == 'attribute' and member.get(item[1]) is None:
+                return False
+
+        return True
+
+    def test_reads(self):
+
+        self.assertEqual(len(self.links), 3)
+        self.assertEqual(self.links.texts(), ['Home', 'Reports ', 'Admin'])
+        self.assertEqual(self.links.attributes('href'), ['/', '/reports', None])
+        self.assertEqual(self.links.visible(), [True, True, False])
+
+        # One script per operation, over the collection's locator
+        self.assertEqual([(collect[0], collect[2]) for collect in self.collects],
+                         [([['css selector', 'nav a']], operation) for operation in
+                          ('count', 'texts', 'attributes', 'visible')])
+
+    def test_filter(self):
+
+        shown = self.links.filter(visible=True)
+        linked = shown.filter(contains='Rep', attribute='href')
+
+        self.assertIsNot(shown, self.links)
+        self.assertEqual(self.links.filters, [])
+        self.assertEqual(linked.filters, [['visible', True], ['contains', 'Rep'], ['attribute', 'href', None]])
+        self.assertEqual(shown.texts(), ['Home', 'Reports '])
+        self.assertEqual(linked.texts(), ['Reports '])
+
+    def test_click_all(self):
+
+        self.assertEqual(self.links.filter(visible=True).click_all(), 2)
+        self.assertEqual(self.collects[-1][1:], ([['visible', True]], 'click', None))
+
+    def test_members(self):
+
+        members = list(self.links)
+
+        self.assertEqual(len(members), 3)
+        self.assertEqual(members[1].search_term[0], 'element')
+        self.assertEqual(self.links[2].search_term[1].id, 'Admin')
+
+
+if __name__ == '__main__':
+    unittest.main()
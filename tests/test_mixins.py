@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.mixins
+"""
+
+import unittest
+from fakes import FakeDriver, FakeElement
+from sampyl.core.mixins import InteractionError
+from sampyl.core.structures import InputCheckbox
+
+
+class SelectiveMixinTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.element = FakeElement(self.driver, 'remember', tag='input')
+        self.pointer = ['ok', self.element, None]
+
+        self.driver.elements[('id', 'remember')] = self.element
+        self.driver.functions.update({
+            'exists': lambda chain: True,
+            'pointer': lambda chain, enabled: self.pointer,
+        })
+        self.checkbox = InputCheckbox(self.driver, 'id', 'remember')
+
+    def clicks(self):
+        return [call for call in self.driver.calls if call[0] == 'click']
+
+    def test_select(self):
+
+        self.assertTrue(self.checkbox.select())
+        self.assertTrue(self.checkbox.selected())
+
+        # Already selected, nothing to click
+        self.assertTrue(self.checkbox.select())
+        self.assertEqual(len(self.clicks()), 1)
+
+    def test_deselect(self):
+
+        self.element.attrs['checked'] = True
+
+        self.assertTrue(self.checkbox.deselect())
+        self.assertFalse(self.checkbox.selected())
+
+    def test_failed_click_raises(self):
+
+        self.pointer = ['obscured', None, 'div class="modal"']
+
+        with self.assertRaises(InteractionError) as context:
+            self.checkbox.select()
+
+        self.assertEqual(context.exception.reason, 'obscured')
+        self.assertEqual(self.clicks(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
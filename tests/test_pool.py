@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.pool
+"""
+
+import unittest
+from stub_server import StubServer
+from sampyl.app import App
+from sampyl.core.commands import get_queue
+from sampyl.core.scheduler import MAX_INTERVAL, MIN_INTERVAL, get_scheduler
+from sampyl.pool import SessionPool
+from selenium.webdriver import Remote
+
+
+class SessionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.server = StubServer().start()
+        self.server.script_handler = lambda session, script, args: 1 if script == 'return 1;' else None
+        self.pool = SessionPool(self.factory, size=1, max_uses=3)
+
+    def tearDown(self):
+
+        self.pool.close()
+        self.server.stop()
+
+    def factory(self):
+        return Remote(command_executor=self.server.url, desired_capabilities={'browserName': 'stub'})
+
+    def session(self, app):
+        return self.server.sessions[app.driver.session_id]
+
+    def test_reset(self):
+
+        app = self.pool.acquire(timeout=5)
+        session = self.session(app)
+
+        app.driver.get('http://one.test/login')
+        app.driver.get('https://two.test/account')
+        app.driver.set_script_timeout(90)
+        app.driver.implicitly_wait(5)
+        session['windows'].append('popup')
+        del self.server.requests[:]
+
+        self.pool.release(app)
+
+        self.assertEqual(session['windows'], ['main'])
+        self.assertEqual(session['window'], 'main')
+        self.assertEqual(session['cleared'], ['https://two.test/account'])
+        self.assertEqual(session['url'], 'about:blank')
+        self.assertEqual(session['timeouts'], {'async_script': 30000, 'implicit_wait': 0, 'page load': 300000})
+
+        # Only about:blank is loaded, visited origins are not loaded again
+        loads = [body['url'] for method, path, body in self.server.requests
+                 if method == 'POST' and path.endswith('/url')]
+        self.assertEqual(loads, ['about:blank'])
+
+        # Nothing to clear on about:blank
+        del session['cleared'][:]
+        self.pool.release(self.pool.acquire(timeout=5))
+
+        self.assertEqual(session['cleared'], [])
+        self.assertEqual(self.pool.metrics()['resets'], 2)
+
+    def test_reset_clears_per_driver_state(self):
+
+        app = self.pool.acquire(timeout=5)
+        app.serialize_commands()
+        scheduler = get_scheduler(app.driver)
+        scheduler.interval, scheduler.ticks = MAX_INTERVAL, 7
+
+        self.pool.release(app)
+
+        self.assertIsNone(get_queue(app.driver))
+        self.assertNotIn('execute', app.driver.__dict__)
+        self.assertEqual((scheduler.interval, scheduler.ticks), (MIN_INTERVAL, 0))
+
+    def test_recycled_after_max_uses(self):
+
+        drivers = []
+
+        for _ in range(4):
+            app = self.pool.acquire(timeout=5)
+            drivers.append(app.driver)
+            self.pool.release(app)
+
+        self.assertIs(drivers[0], drivers[2])
+        self.assertIsNot(drivers[2], drivers[3])
+        self.assertEqual(self.pool.metrics()['recycled'], 1)
+
+    def test_launch_error_raised_on_acquire(self):
+
+        def factory():
+            raise ValueError('No browser')
+
+        pool = SessionPool(factory, size=1)
+
+        self.assertEqual(pool.metrics()['launch_failures'], 1)
+        self.assertRaises(ValueError, pool.acquire, 1)
+
+    def test_launched_on_acquire_without_prewarm(self):
+
+        pool = SessionPool(self.factory, size=1, prewarm=False)
+        app = pool.acquire(timeout=5)
+
+        self.assertIsInstance(app, App)
+        self.assertEqual(pool.metrics()['launched'], 1)
+
+        pool.release(app)
+        pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.remote
+"""
+
+import httplib
+import socket
+import unittest
+from stub_server import StubServer
+from sampyl.core.remote import PooledRemoteConnection
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver import Remote
+
+
+class PooledRemoteConnectionTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.server = StubServer().start()
+        self.executor = PooledRemoteConnection(self.server.url, pool_size=2, resolve_ip=False)
+        self.driver = Remote(command_executor=self.executor, desired_capabilities={'browserName': 'stub'})
+
+    def tearDown(self):
+
+        self.executor.close()
+        self.server.stop()
+
+    def test_connection_reused(self):
+
+        for i in range(20):
+            self.driver.get('http://site.test/%d' % i)
+
+        self.assertEqual(self.driver.current_url, 'http://site.test/19')
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.executor.created, 1)
+
+    def test_reconnect_after_dropped_connection(self):
+
+        self.driver.get('http://site.test/a')
+        self.server.drop()
+        self.driver.get('http://site.test/b')
+
+        self.assertEqual(self.driver.current_url, 'http://site.test/b')
+        self.assertEqual(self.server.connections, 2)
+        self.assertEqual(self.executor.created, 1)
+
+    def test_command_lost_after_sending_not_sent_again(self):
+
+        self.driver.get('http://site.test/a')
+        self.server.hang_up.add('url')
+        del self.server.requests[:]
+
+        self.assertRaises((httplib.HTTPException, socket.error), self.driver.get, 'http://site.test/b')
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_busy_pool_raises(self):
+
+        executor = PooledRemoteConnection(self.server.url, pool_size=1, timeout=0.2, resolve_ip=False)
+        connection = executor._acquire()[0]
+        self.addCleanup(connection.close)
+
+        self.assertRaises(WebDriverException, executor._acquire)
+
+    def test_commands_timed(self):
+
+        self.driver.get('http://site.test/a')
+
+        self.assertIn('get', [entry.name for entry in self.executor.timeline])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.runtime and the scripts built on it
+"""
+
+import gc
+import json
+import subprocess
+import unittest
+import weakref
+from distutils.spawn import find_executable
+from fakes import FakeDriver
+from sampyl.core.mixins import ToggleMixin
+from sampyl.core.runtime import DEFAULT_SCRIPT_TIMEOUT, NOT_INJECTED, RUNTIME_SCRIPT, SCRIPT_TIMEOUT_MARGIN, \
+    get_runtime
+from selenium.common.exceptions import TimeoutException
+
+
+class CallAsyncTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.runtime = get_runtime(self.driver)
+
+    def timeouts(self):
+        return [call[1] for call in self.driver.calls if call[0] == 'set_script_timeout']
+
+    def test_short_call_keeps_timeout(self):
+
+        self.driver.functions['idle'] = lambda timeout: 'ok'
+
+        self.assertEqual(self.runtime.call_async('idle', 10), 'ok')
+        self.assertEqual(self.timeouts(), [])
+
+    def test_long_call_restores_timeout(self):
+
+        self.driver.functions['idle'] = lambda timeout: 'ok'
+        self.runtime.call_async('idle', 60)
+
+        self.assertEqual(self.timeouts(), [60 + SCRIPT_TIMEOUT_MARGIN, DEFAULT_SCRIPT_TIMEOUT])
+
+    def test_timeout_restored_after_error(self):
+
+        def idle(timeout):
+            raise TimeoutException()
+
+        self.driver.functions['idle'] = idle
+        self.runtime.script_timeout = 45
+
+        self.assertRaises(TimeoutException, self.runtime.call_async, 'idle', 60)
+        self.assertEqual(self.timeouts(), [60 + SCRIPT_TIMEOUT_MARGIN, 45])
+
+
+class InjectionTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.runtime = get_runtime(self.driver)
+        self.driver.functions.update({
+            'exists': lambda chain: True,
+            'quiet': lambda enable: [0, 0.0],
+        })
+
+    def test_injected_with_first_call(self):
+
+        self.assertTrue(self.runtime.call('exists', [['id', 'a']]))
+        self.assertEqual(len(self.driver.calls), 1)
+        self.assertTrue(self.runtime.injected)
+
+    def test_hooks_run_before_the_call(self):
+
+        self.runtime.hooks.append(lambda runtime: runtime.call('quiet', True))
+        self.runtime.call('exists', [['id', 'a']])
+
+        self.assertEqual([call[1][:1] for call in self.driver.calls], [(), ('quiet',), ('exists',)])
+
+    def test_hooks_run_again_on_new_document(self):
+
+        self.runtime.hooks.append(lambda runtime: runtime.call('quiet', True))
+        self.runtime.call('exists', [['id', 'a']])
+        del self.driver.calls[:]
+
+        # The document was replaced, the library is missing
+        answer = self.driver.functions['exists']
+        self.driver.functions['exists'] = lambda chain: self.driver.functions.update(exists=answer) or NOT_INJECTED
+
+        self.assertTrue(self.runtime.call('exists', [['id', 'a']]))
+        self.assertEqual([call[1][:1] for call in self.driver.calls], [('exists',), (), ('quiet',), ('exists',)])
+
+
+class RegistryTest(unittest.TestCase):
+
+    def test_driver_collected(self):
+
+        driver = FakeDriver()
+        driver.functions['exists'] = lambda chain: True
+        runtime = get_runtime(driver)
+        runtime.call('exists', [['id', 'a']])
+        reference = weakref.ref(driver)
+
+        del driver
+        gc.collect()
+
+        self.assertIsNone(reference())
+        self.assertIsNone(runtime.driver)
+
+
+# A document of elements holding attributes and children, enough for the identifier index. The observer callbacks
+# are called by mutate() with mutation records, querySelectorAll calls on the document are counted.
+DOCUMENT_SCRIPT = """
+var scans = 0, observers = [];
+function El(attrs, children) {
+    this.attrs = attrs || {};
+    this.children = children || [];
+    for (var i = 0; i < this.children.length; i++) { this.children[i].parentNode = this; }
+}
+El.prototype.nodeType = 1;
+El.prototype.getAttribute = function (name) { return name in this.attrs ? this.attrs[name] : null; };
+El.prototype.hasAttribute = function (name) { return name in this.attrs; };
+El.prototype.querySelectorAll = function (selector) {
+    var name = selector.slice(1, -1), found = [];
+    (function walk(el) {
+        for (var i = 0; i < el.children.length; i++) {
+            if (el.children[i].hasAttribute(name)) { found.push(el.children[i]); }
+            walk(el.children[i]);
+        }
+    })(this);
+    return found;
+};
+El.prototype.querySelector = function (selector) { return this.querySelectorAll(selector)[0] || null; };
+El.prototype.contains = function (el) {
+    for (; el; el = el.parentNode) { if (el === this) { return true; } }
+    return false;
+};
+El.prototype.append = function (el) { el.parentNode = this; this.children.push(el); };
+El.prototype.remove = function (el) { el.parentNode = null; this.children.splice(this.children.indexOf(el), 1); };
+var root = new El({}, []);
+global.window = global;
+global.document = {documentElement: root,
+                   querySelectorAll: function (selector) { scans++; return root.querySelectorAll(selector); }};
+global.MutationObserver = function (callback) { observers.push(callback); };
+MutationObserver.prototype.observe = function () {};
+function mutate(record) {
+    record.addedNodes = record.addedNodes || [];
+    record.removedNodes = record.removedNodes || [];
+    for (var i = 0; i < observers.length; i++) { observers[i]([record]); }
+}
+function find(id) { var el = window.__sampyl.call('find', ['data-qa-id', id]); return el && el.attrs['data-qa-id']; }
+"""
+
+
+@unittest.skipUnless(find_executable('node'), 'node is required to run the helper library')
+class IdentifierIndexTest(unittest.TestCase):
+
+    def run_script(self, script):
+        """Returns what a script run in node after the helper library prints, parsed as JSON
+
+        :param str script: JavaScript
+        :return: Printed value
+        """
+
+        source = DOCUMENT_SCRIPT + RUNTIME_SCRIPT + script
+        process = subprocess.Popen(['node', '-'], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE)
+        out, err = process.communicate(source)
+
+        self.assertEqual(process.returncode, 0, err)
+
+        return json.loads(out)
+
+    def test_lookup_uses_the_index(self):
+
+        result = self.run_script("""
+            root.append(new El({'data-qa-id': 'a'}));
+            root.append(new El({}, [new El({'data-qa-id': 'b'})]));
+            console.log(JSON.stringify([find('a'), find('b'), find('c'), scans]));
+        """)
+
+        self.assertEqual(result, ['a', 'b', None, 1])
+
+    def test_unrelated_mutations_keep_the_index(self):
+
+        result = self.run_script("""
+            root.append(new El({'data-qa-id': 'a'}));
+            find('a');
+            var plain = new El({}, [new El({'class': 'row'})]);
+            root.append(plain);
+            mutate({type: 'childList', addedNodes: [plain]});
+            root.remove(plain);
+            mutate({type: 'childList', removedNodes: [plain]});
+            console.log(JSON.stringify([find('a'), scans]));
+        """)
+
+        self.assertEqual(result, ['a', 1])
+
+    def test_identified_mutations_drop_the_index(self):
+
+        result = self.run_script("""
+            var a = new El({'data-qa-id': 'a'});
+            root.append(a);
+            find('a');
+            var wrapper = new El({}, [new El({'data-qa-id': 'b'})]);
+            root.append(wrapper);
+            mutate({type: 'childList', addedNodes: [wrapper]});
+            var added = [find('b'), scans];
+            root.remove(wrapper);
+            mutate({type: 'childList', removedNodes: [wrapper]});
+            var removed = [find('b'), scans];
+            a.attrs['data-qa-id'] = 'c';
+            mutate({type: 'attributes', attributeName: 'data-qa-id', target: a});
+            console.log(JSON.stringify([added, removed, [find('c'), scans]]));
+        """)
+
+        self.assertEqual(result, [['b', 2], [None, 3], ['c', 4]])
+
+
+class StubToggle(object):
+
+    def __init__(self, calls, chain):
+
+        self.calls = calls
+        self.chain = chain
+
+    def click(self):
+        self.calls.append(('click', self.chain))
+
+    def hover(self):
+        self.calls.append(('hover', self.chain))
+
+    def locator(self):
+        return [['css', self.chain]]
+
+
+class Toggle(ToggleMixin):
+
+    def __init__(self, driver):
+
+        self.driver = driver
+        self._toggle = StubToggle(driver.calls, '.toggle')
+        self._container = StubToggle(driver.calls, '.menu')
+
+    @property
+    def runtime(self):
+        return get_runtime(self.driver)
+
+
+class ToggleMixinTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.visible = False
+        self.waits = []
+        self.driver.functions.update({
+            'visible': lambda chain: self.visible,
+            'transition': lambda chain, show, timeout: self.waits.append((chain, show)) or ['ok', True],
+        })
+        self.toggle = Toggle(self.driver)
+
+    def test_native_click_then_wait(self):
+
+        self.assertTrue(self.toggle.expand())
+        self.assertIn(('click', '.toggle'), self.driver.calls)
+        self.assertEqual(self.waits, [([['css', '.menu']], True)])
+
+    def test_hover(self):
+
+        self.toggle.expand(hover=True)
+
+        self.assertIn(('hover', '.toggle'), self.driver.calls)
+        self.assertNotIn(('click', '.toggle'), self.driver.calls)
+
+    def test_already_shown_only_waits(self):
+
+        self.visible = True
+        self.toggle.expand()
+
+        self.assertNotIn(('click', '.toggle'), self.driver.calls)
+        self.assertEqual(len(self.waits), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
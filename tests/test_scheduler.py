@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.scheduler
+"""
+
+import gc
+import threading
+import time
+import unittest
+import weakref
+from fakes import FakeDriver
+from sampyl.core.scheduler import MAX_INTERVAL, MIN_INTERVAL, WaitScheduler, get_scheduler
+from selenium.common.exceptions import StaleElementReferenceException
+
+
+class WaitSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.ready = set()
+        self.scripts = 0
+        self.stale = False
+        self.driver.functions.update({
+            'probe': self.probe,
+            'exists': lambda name: name in self.ready,
+        })
+        self.scheduler = WaitScheduler(self.driver)
+
+    def probe(self, probes):
+
+        self.scripts += 1
+
+        if self.stale:
+            raise StaleElementReferenceException()
+
+        return [self.driver.functions[name](*args) for name, args in probes]
+
+    def test_wait(self):
+
+        threading.Timer(0.2, lambda: self.ready.add('a')).start()
+
+        self.assertTrue(self.scheduler.wait(['exists', ['a']], bool, 2))
+        self.assertFalse(self.scheduler.wait(['exists', ['b']], bool, 0.2))
+
+    def test_concurrent_waits_share_scripts(self):
+
+        results = []
+        threads = [threading.Thread(target=lambda name: results.append(self.scheduler.wait(['exists', [name]], bool, 2)),
+                                    args=(name,)) for name in 'abcdef']
+
+        for thread in threads:
+            thread.start()
+
+        time.sleep(0.3)
+        self.ready.update('abcdef')
+
+        for thread in threads:
+            thread.join()
+
+        # Six waits, evaluated together: fewer scripts than probes
+        self.assertEqual(results, [True] * 6)
+        self.assertEqual(self.scripts, self.scheduler.ticks)
+        self.assertGreater(self.scheduler.probes, 3 * self.scheduler.ticks)
+
+    def test_interval_backs_off(self):
+
+        self.scheduler.wait(['exists', ['a']], bool, 1.5)
+
+        self.assertEqual(self.scheduler.interval, MAX_INTERVAL)
+
+        self.ready.add('a')
+        self.scheduler.wait(['exists', ['a']], bool, 1)
+
+        self.assertEqual(self.scheduler.interval, MIN_INTERVAL)
+
+    def test_stale_probes_evaluated_one_by_one(self):
+
+        self.stale = True
+        self.ready.add('a')
+
+        self.assertTrue(self.scheduler.wait(['exists', ['a']], bool, 1))
+
+    def test_driver_collected(self):
+
+        driver = FakeDriver()
+        driver.functions['probe'] = lambda probes: [True for _ in probes]
+        scheduler = get_scheduler(driver)
+        scheduler.wait(['exists', ['a']], bool, 1)
+        reference = weakref.ref(driver)
+
+        del driver
+        gc.collect()
+
+        self.assertIsNone(reference())
+        self.assertIsNone(scheduler.driver)
+
+
+if __name__ == '__main__':
+    unittest.main()
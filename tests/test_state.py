@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.state
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import warnings
+from fakes import FakeDriver
+from sampyl.core.state import READ_STORAGE_SCRIPT, WRITE_STORAGE_SCRIPT, load_state, restore_state, save_state
+from selenium.common.exceptions import WebDriverException
+
+ORIGIN = 'https://site.test'
+
+
+class StatefulDriver(FakeDriver):
+    """FakeDriver keeping storage, rejecting the cookies named in ``rejected``
+    """
+
+    def __init__(self, url=ORIGIN + '/home'):
+
+        FakeDriver.__init__(self, url)
+        self.storage = [{}, {}]
+        self.rejected = set()
+        self.scripts = self.storage_script
+
+    def add_cookie(self, cookie_dict):
+
+        if cookie_dict.get('name') in self.rejected:
+            raise WebDriverException('Unable to set cookie')
+
+        FakeDriver.add_cookie(self, cookie_dict)
+
+    def storage_script(self, script, args):
+
+        if script == READ_STORAGE_SCRIPT:
+            return [dict(self.storage[0]), dict(self.storage[1])]
+
+        if script == WRITE_STORAGE_SCRIPT:
+            self.storage = [dict(args[0]), dict(args[1])]
+            return len(args[0]) + len(args[1])
+
+
+class StateTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'state.json')
+
+        self.driver = StatefulDriver()
+        self.driver.cookies = [{'name': 'sid', 'value': 'abc', 'domain': '.site.test'},
+                               {'name': 'csrf', 'value': 'xyz'}]
+        self.driver.storage = [{'token': 't1'}, {'tab': '2'}]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+
+        save_state(self.driver, self.path, ORIGIN, role='admin')
+
+        driver = StatefulDriver('about:blank')
+
+        self.assertTrue(restore_state(driver, self.path, ORIGIN, role='admin'))
+        self.assertEqual(driver.calls[0], ('get', ORIGIN))
+        self.assertEqual(driver.get_cookies(), self.driver.get_cookies())
+        self.assertEqual(driver.storage, [{'token': 't1'}, {'tab': '2'}])
+
+    def test_expired_or_other_origin(self):
+
+        save_state(self.driver, self.path, ORIGIN, ttl=-1)
+
+        self.assertIsNone(load_state(self.path, ORIGIN))
+
+        save_state(self.driver, self.path, ORIGIN)
+
+        self.assertIsNone(load_state(self.path, 'https://other.test'))
+        self.assertFalse(restore_state(StatefulDriver(), self.path, 'https://other.test'))
+
+    def test_rejected_cookie_leaves_no_partial_state(self):
+
+        save_state(self.driver, self.path, ORIGIN)
+
+        driver = StatefulDriver()
+        driver.rejected.add('csrf')
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertFalse(restore_state(driver, self.path, ORIGIN))
+
+        self.assertEqual(driver.cookies, [])
+        self.assertEqual(driver.storage, [{}, {}])
+        self.assertIn('csrf', str(caught[0].message))
+
+    def test_concurrent_saves_keep_every_role(self):
+
+        def save(role):
+
+            for _ in range(10):
+                save_state(StatefulDriver(), self.path, ORIGIN, role=role)
+
+        threads = [threading.Thread(target=save, args=('role-%d' % i,)) for i in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        with open(self.path) as state_file:
+            self.assertEqual(sorted(json.load(state_file)), sorted(['role-%d' % i for i in range(8)]))
+
+        self.assertEqual([name for name in os.listdir(self.directory) if name.endswith('.tmp')], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
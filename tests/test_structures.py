@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.structures
+"""
+
+import math
+import unittest
+from fakes import FakeDriver
+from sampyl.core.structures import Dropdown, Form, InputCheckbox, InputRadio, InputText, Select, TableData, \
+    VirtualList, to_number
+from selenium.common.exceptions import TimeoutException
+
+
+class VirtualListTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.reads = []
+        self.advances = 0
+
+        self.driver.functions.update({
+            'window': self.window,
+            'advance': self.advance,
+        })
+
+        self.list = VirtualList(self.driver, 'css selector', '#list')
+
+    def window(self, chain, rows, next_selector, paginate, previous):
+
+        data = self.reads.pop(0) if len(self.reads) > 1 else self.reads[0]
+        keys = [key for key, values in data]
+        changed = previous is None or bool(set(keys) - set(previous))
+
+        return [data, changed, keys[-1] == 'k4']
+
+    def advance(self, chain, next_selector, paginate):
+
+        self.advances += 1
+        self.reads = [[['k3', ['c']]], [['k3', ['c']], ['k4', ['d']]]]
+
+        return True
+
+    def test_window_read_once_settled(self):
+
+        # The first window is still rendering its second row
+        self.reads = [[['k1', ['a']]], [['k1', ['a']], ['k2', ['b']]]]
+
+        chunks = list(self.list.chunks(settle=0.05))
+
+        self.assertEqual(chunks, [[['a'], ['b']], [['c'], ['d']]])
+        self.assertEqual(self.advances, 1)
+
+    def test_timeout_raises(self):
+
+        # Advancing renders nothing new and the end is never reached
+        self.advance = lambda *args: True
+        self.driver.functions['advance'] = self.advance
+        self.reads = [[['k1', ['a']]]]
+
+        chunks = self.list.chunks(timeout=1, settle=0)
+
+        self.assertEqual(next(chunks), [['a']])
+        self.assertRaises(TimeoutException, next, chunks)
+
+
+class FormTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.names = []
+        self.controls = [
+            [u'user', u'input', u'text', u'jane', None, None, False, True, 1],
+            [u'role', u'select', u'select-one', u'2', None, [[u'1', u'User'], [u'2', u'Admin']], False, False, 1],
+            [u'plan', u'input', u'radio', u'free', False, None, False, False, 1],
+            [u'plan', u'input', u'radio', u'paid', True, None, False, False, 2],
+        ]
+        self.driver.functions['fields'] = self.fields
+        self.form = Form(self.driver, 'css selector', 'form')
+
+    def fields(self, chain, name):
+
+        self.names.append(name)
+        return [control for control in self.controls if name is None or control[0] == name]
+
+    def test_get_field_reads_only_the_field(self):
+
+        field = self.form.get_field('role')
+
+        self.assertIsInstance(field, Select)
+        self.assertEqual(self.names, ['role'])
+
+    def test_fields_located_by_name_and_position(self):
+
+        first, second = self.form.get_field('plan')
+
+        self.assertIsInstance(second, InputRadio)
+        self.assertIs(second.within, self.form)
+        self.assertEqual(first.search_term[1], '/descendant::*[(self::input or self::select or self::textarea) and '
+                                               '@name="plan"]')
+        self.assertEqual(second.search_term[1], '({})[2]'.format(first.search_term[1]))
+
+    def test_values(self):
+        self.assertEqual(self.form.values(), {'user': 'jane', 'role': '2', 'plan': 'paid'})
+
+
+class TableDataTest(unittest.TestCase):
+
+    def setUp(self):
+        self.table = TableData([u'name', u'qty'], [[u'apples', u'pears', u'plums'], [u'5 items', u'1.2e3', u'(3)']])
+
+    def test_to_number(self):
+
+        self.assertEqual([to_number(value) for value in ['5 items', '1.5E+2 kg', '$1,234.50', '(12)', '7e', '-$5',
+                                                          '45%']],
+                         [5.0, 150.0, 1234.5, -12.0, 7.0, -5.0, 45.0])
+
+        for value in ['n/a', 'Page 3 of 10', '12-15', '1,2']:
+            self.assertTrue(math.isnan(to_number(value)), value)
+
+    def test_column_numeric(self):
+        self.assertEqual(self.table.column('qty', numeric=True), [5.0, 1200.0, -3.0])
+
+    def test_where(self):
+
+        rows = self.table.where('qty', lambda cell: to_number(cell) > 0)
+
+        self.assertEqual(rows.rows(), [['apples', '5 items'], ['pears', '1.2e3']])
+        self.assertEqual(self.table.where('name', 'plums').rows(), [['plums', '(3)']])
+
+
+
+class LabelTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.labels = {'accept': u'  I accept the terms\u00a0 ', 'email': u'E-mail'}
+        self.calls = []
+        self.driver.functions['label'] = self.label
+
+    def label(self, chain):
+
+        self.calls.append(chain)
+
+        return self.labels.get(chain[-1][1])
+
+    def test_checkbox_label(self):
+
+        self.assertEqual(InputCheckbox(self.driver, 'id', 'accept').label, 'I accept the terms')
+        self.assertEqual(self.calls, [[['id', 'accept']]])
+
+    def test_text_label(self):
+
+        self.assertEqual(InputText(self.driver, 'id', 'email').label, 'E-mail')
+        self.assertEqual(len(self.driver.calls), 1)
+
+    def test_missing_label(self):
+
+        self.assertEqual(InputText(self.driver, 'id', 'phone').label, '')
+        self.assertEqual(InputCheckbox(self.driver, 'id', 'phone').label, '')
+
+
+class DropdownTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.driver = FakeDriver()
+        self.menu = [u'HTML', u'CSS', u'Caf\u00e9']
+        self.picked = []
+        self.driver.functions.update({
+            'items': lambda chain: list(self.menu) if chain == [['id', 'menu']] else None,
+            'pick': self.pick,
+        })
+        self.dropdown = Dropdown(self.driver, 'id', 'menu')
+
+    def pick(self, chain, text):
+
+        if chain == [['id', 'menu']] and text in self.menu:
+            self.picked.append(text)
+            return True
+
+        return False
+
+    def test_items(self):
+
+        self.assertEqual(self.dropdown.items(), ['HTML', 'CSS', 'Caf'])
+        self.assertEqual(Dropdown(self.driver, 'id', 'missing').items(), [])
+        self.assertEqual(len(self.driver.calls), 2)
+
+    def test_pick(self):
+
+        self.assertTrue(self.dropdown.pick('CSS'))
+        self.assertFalse(self.dropdown.pick('Java'))
+        self.assertFalse(Dropdown(self.driver, 'id', 'missing').pick('CSS'))
+
+        # Picked through the DOM, without expanding the menu first
+        self.assertEqual(self.picked, ['CSS'])
+        self.assertEqual(len(self.driver.calls), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.tabs
+"""
+
+import unittest
+from fakes import FakeDriver
+from sampyl.core import tabs
+from sampyl.core.tabs import TabSet
+from selenium.common.exceptions import NoSuchWindowException
+
+POLL_INTERVAL, HANDLE_TIMEOUT = tabs.POLL_INTERVAL, tabs.HANDLE_TIMEOUT
+
+
+class TabSetTest(unittest.TestCase):
+
+    def setUp(self):
+
+        tabs.POLL_INTERVAL = 0
+        self.driver = FakeDriver('http://site.test/')
+        self.driver.scripts = self.script
+        self.names = {}
+        self.states = []
+
+    def tearDown(self):
+
+        tabs.POLL_INTERVAL = POLL_INTERVAL
+        tabs.HANDLE_TIMEOUT = HANDLE_TIMEOUT
+
+    def script(self, script, args):
+
+        if script == tabs.OPEN_SCRIPT:
+
+            # Handles listed in the reverse order of the windows
+            for i, (url, name) in enumerate(args[0]):
+                self.driver.handles.insert(1, 'w%d' % i)
+                self.names['w%d' % i] = name
+
+            self.states = ['loading'] * len(args[0])
+
+            return 0
+
+        if script == tabs.POLL_SCRIPT:
+            return self.states
+
+        if script == 'return window.name;':
+            return self.names.get(self.driver.handle)
+
+        if script == 'return document.readyState;':
+            return 'complete'
+
+        return None
+
+    def test_handles_matched_by_name(self):
+
+        tab_set = TabSet(self.driver, ['http://site.test/1', 'http://site.test/2', 'http://site.test/3'])
+        self.states = ['complete', 'loading', 'complete']
+
+        results = tab_set.as_completed()
+        seen = []
+
+        for _ in range(2):
+
+            tab = next(results)
+            seen.append((tab.url, self.driver.handle))
+
+            if len(seen) == 1:
+                self.states[1] = 'complete'
+
+        tab = next(results)
+        seen.append((tab.url, self.driver.handle))
+
+        self.assertEqual(sorted(seen), [('http://site.test/1', 'w0'), ('http://site.test/2', 'w1'),
+                                        ('http://site.test/3', 'w2')])
+
+    def test_switch_skipped_on_current_window(self):
+
+        tab_set = TabSet(self.driver, ['http://site.test/1'])
+
+        self.assertFalse(tab_set.switch('main'))
+        self.assertTrue(tab_set.switch('w0'))
+        self.assertFalse(tab_set.switch('w0'))
+
+    def test_outside_switch_is_noticed(self):
+
+        tab_set = TabSet(self.driver, ['http://site.test/1', 'http://site.test/2'])
+        self.states = ['complete', 'loading']
+
+        results = tab_set.as_completed()
+        first = next(results)
+
+        # The caller goes back to the opener, resuming the generator reads the window the driver is on
+        self.driver.switch_to.window('main')
+        self.states[1] = 'complete'
+        next(results)
+        tab_set.switch(first.handle)
+
+        self.assertEqual(tab_set.current, first.handle)
+        self.assertEqual(self.driver.handle, first.handle)
+
+        self.driver.switch_to.window('main')
+        tab_set.sync()
+
+        self.assertTrue(tab_set.switch(first.handle))
+        self.assertEqual(self.driver.handle, first.handle)
+
+    def test_closed_tab_raises(self):
+
+        tab_set = TabSet(self.driver, ['http://site.test/1'])
+        self.states = ['closed']
+
+        self.assertRaises(NoSuchWindowException, next, tab_set.as_completed())
+
+    def test_missing_window_raises(self):
+
+        tabs.HANDLE_TIMEOUT = 0
+        tab_set = TabSet(self.driver, ['http://site.test/1'])
+        self.driver.handles.remove('w0')
+        self.states = ['complete']
+
+        self.assertRaises(NoSuchWindowException, next, tab_set.as_completed())
+
+    def test_unnamed_window_checked_again(self):
+
+        tab_set = TabSet(self.driver, ['http://site.test/1', 'http://site.test/2'])
+        name = self.names.pop('w0')
+
+        # The window's name cannot be read yet, w0 stays unmatched on the first pass
+        self.driver.handles.append('popup')
+        self.names['popup'] = 'unrelated'
+        reads = []
+
+        def read(script, args):
+
+            reads.append(self.driver.handle)
+
+            if self.driver.handle == 'w0' and reads.count('w0') > 1:
+                self.names['w0'] = name
+
+            return self.script(script, args)
+
+        self.driver.scripts = read
+
+        self.assertEqual(tab_set.resolve(tab_set.tabs[0]), 'w0')
+        self.assertGreater(reads.count('w0'), 1)
+
+    def test_redirected_window_matched_to_the_remaining_tab(self):
+
+        tab_set = TabSet(self.driver, ['http://site.test/1', 'http://site.test/2'])
+
+        # A cross-origin redirect cleared the name, the url differs from the one requested
+        del self.names['w1']
+        self.states = ['complete', None]
+
+        results = [tab.url for tab in tab_set.as_completed()]
+
+        self.assertEqual(sorted(results), ['http://site.test/1', 'http://site.test/2'])
+        self.assertEqual(tab_set.tabs[1].handle, 'w1')
+
+    def test_close(self):
+
+        with TabSet(self.driver, ['http://site.test/1', 'http://site.test/2']):
+            pass
+
+        self.assertEqual(self.driver.handles, ['main'])
+        self.assertEqual(self.driver.handle, 'main')
+
+
+if __name__ == '__main__':
+    unittest.main()
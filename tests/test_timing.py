@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Tests for sampyl.core.timing
+"""
+
+import time
+import unittest
+from fakes import FakeDriver
+from sampyl.core.timing import Timeline, get_timeline
+
+
+class TimelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.timeline = Timeline(maxlen=3)
+
+    def test_measure(self):
+
+        with self.timeline.measure('wait', category='wait') as details:
+            time.sleep(0.02)
+            details['met'] = True
+
+        entry = list(self.timeline)[0]
+
+        self.assertEqual(entry.name, 'wait')
+        self.assertGreaterEqual(entry.elapsed, 0.02)
+        self.assertEqual(entry.details, {'category': 'wait', 'met': True})
+
+    def test_measure_records_on_error(self):
+
+        try:
+
+            with self.timeline.measure('click'):
+                raise ValueError()
+
+        except ValueError:
+            pass
+
+        self.assertEqual(len(self.timeline), 1)
+
+    def test_bounded(self):
+
+        for i in range(5):
+            self.timeline.record('command', 0.1, started=i)
+
+        self.assertEqual([entry.started for entry in self.timeline], [2, 3, 4])
+
+    def test_summary_and_since(self):
+
+        self.timeline.record('command', 0.1, started=10)
+        self.timeline.record('command', 0.2, started=20)
+        self.timeline.record('wait', 0.5, started=30)
+
+        self.assertEqual(self.timeline.summary()['command'][0], 2)
+        self.assertAlmostEqual(self.timeline.total('command'), 0.3)
+        self.assertAlmostEqual(self.timeline.total(), 0.8)
+        self.assertEqual([entry.name for entry in self.timeline.since(20)], ['command', 'wait'])
+
+    def test_shared_per_driver(self):
+
+        driver = FakeDriver()
+
+        self.assertIs(get_timeline(driver), get_timeline(driver))
+        self.assertIsNot(get_timeline(driver), get_timeline(FakeDriver()))
+
+
+if __name__ == '__main__':
+    unittest.main()